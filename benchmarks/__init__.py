@@ -0,0 +1,4 @@
+#!/usr/bin/env python3
+"""
+Rendering benchmarks; run with `python -m benchmarks.run`
+"""
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Synthetic, deterministic fixtures for the rendering benchmarks
+
+Everything is generated from a seeded RNG, so a baseline saved on one run is
+comparable with the next.
+"""
+
+import random
+from typing import Any, Dict, List
+
+_WORDS = (
+    "fast simple tiny modern async terminal parser client library framework "
+    "toolkit plugin server static typed minimal cross-platform command-line "
+    "engine renderer cache index search graph stream batch python rust go "
+    "for with and the a of to in written zero-copy embeddable extensible"
+).split()
+
+_LANGUAGES = ["Python", "Rust", "Go", "TypeScript", "C", "C++", "Java", "Ruby", None]
+
+_EMOJI = "🚀✨🔥📦⚡🐍🦀"
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(words))
+
+def repo_search_results(count: int, seed: int = 1) -> List[Dict[str, Any]]:
+    """Repositories shaped like `search_repositories` results."""
+    rng = random.Random(seed)
+    repos = []
+    for i in range(count):
+        owner = f"{rng.choice(_WORDS)}-{i % 997}"
+        name = f"{rng.choice(_WORDS)}-{rng.choice(_WORDS)}-{i}"
+        description = _sentence(rng, rng.randint(0, 40))
+        if i % 13 == 0:
+            # Wide characters change cell widths and truncation
+            description = f"{_EMOJI[i % len(_EMOJI)]} {description} 日本語の説明"
+        repos.append({
+            "fullName": f"{owner}/{name}",
+            "description": description or None,
+            "stargazersCount": rng.randint(0, 250_000),
+            "forksCount": rng.randint(0, 50_000),
+            "updatedAt": f"20{rng.randint(10, 24):02d}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T12:00:00Z",
+            "url": f"https://github.com/{owner}/{name}",
+            "language": rng.choice(_LANGUAGES),
+        })
+    return repos
+
+def readme_text(size: int, seed: int = 2) -> str:
+    """A Markdown README of roughly `size` characters.
+
+    Mixes headings, paragraphs, lists, fenced code, wide tables and long
+    unbroken lines, the constructs that are expensive to lay out.
+    """
+    rng = random.Random(seed)
+    parts: List[str] = ["# Project\n", _sentence(rng, 60) + "\n"]
+    length = sum(len(part) for part in parts)
+    section = 0
+    while length < size:
+        section += 1
+        kind = section % 5
+        if kind == 0:
+            block = f"## Section {section}\n\n" + "\n\n".join(
+                _sentence(rng, rng.randint(20, 120)) for _ in range(3)
+            ) + "\n"
+        elif kind == 1:
+            block = "\n".join(f"- {_sentence(rng, rng.randint(3, 15))}" for _ in range(12)) + "\n"
+        elif kind == 2:
+            block = "```python\n" + "\n".join(
+                f"def {rng.choice(_WORDS).replace('-', '_')}_{n}(x):\n    return x + {n}"
+                for n in range(10)
+            ) + "\n```\n"
+        elif kind == 3:
+            columns = rng.randint(3, 9)
+            header = "| " + " | ".join(f"Column {c}" for c in range(columns)) + " |"
+            rule = "|" + "---|" * columns
+            rows = [
+                "| " + " | ".join(_sentence(rng, rng.randint(1, 4)) for _ in range(columns)) + " |"
+                for _ in range(15)
+            ]
+            block = "\n".join([header, rule] + rows) + "\n"
+        else:
+            # A single very long line (badges, minified HTML, URLs)
+            block = " ".join(
+                f"[![badge{n}](https://img.shields.io/badge/{rng.choice(_WORDS)}-{n}-green)](https://example.com/{n})"
+                for n in range(40)
+            ) + "\n"
+        parts.append(block)
+        length += len(block) + 1
+    return "\n".join(parts)[:size]
+
+def repo_details(readme_size: int, seed: int = 3) -> Dict[str, Any]:
+    """Repository details shaped like `get_repository` results."""
+    return {
+        "nameWithOwner": "bench/huge-readme",
+        "description": "A repository with a very large README",
+        "stargazerCount": 12345,
+        "forkCount": 678,
+        "updatedAt": "2024-01-01T00:00:00Z",
+        "url": "https://github.com/bench/huge-readme",
+        "primaryLanguage": {"name": "Python"},
+        "readme": {"text": readme_text(readme_size, seed)},
+    }
+
+def repo_tree_payload(files: int = 40, per_directory: int = 25) -> Dict[str, Any]:
+    """A recursive git/trees response with `files` files in nested directories."""
+    tree = []
+    for d in range(max(1, files // per_directory)):
+        directory = f"pkg{d % 50}/mod{d}"
+        if d < 50:
+            tree.append({"path": f"pkg{d}", "type": "tree", "mode": "040000", "sha": f"{d:040x}"})
+        tree.append({"path": directory, "type": "tree", "mode": "040000", "sha": f"{d:040x}"})
+        for f in range(per_directory):
+            tree.append({"path": f"{directory}/file{f}.py", "type": "blob", "mode": "100644",
+                         "sha": f"{f:040x}", "size": 100 * f})
+    return {"sha": "0" * 40, "truncated": False, "tree": tree}
+
+def _pathological_fragment(rng: random.Random, i: int) -> str:
+    """A code fragment with the whitespace real search hits contain."""
+    kind = i % 6
+    code = f"def handler_{i}(request): return {rng.choice(_WORDS)!r}"
+    if kind == 0:
+        return "\t\t\t" + code + " " * 500 + "\n" * 50
+    if kind == 1:
+        return "\r\n".join(["    " * depth + code for depth in range(30)])
+    if kind == 2:
+        # Minified source: one enormous line
+        return ";".join(f"var a{n}={n}" for n in range(2000))
+    if kind == 3:
+        return "  ​　".join(code.split(" ")) + "​" * 100
+    if kind == 4:
+        return ("\n \t \n" * 200) + code
+    return code + "\n" + "# " + "日本語 " * 200
+
+def code_search_results(count: int, seed: int = 4) -> List[Dict[str, Any]]:
+    """Code hits shaped like `search_code` results, with hostile fragments."""
+    rng = random.Random(seed)
+    results = []
+    for i in range(count):
+        depth = rng.randint(0, 12)
+        path = "/".join(f"{rng.choice(_WORDS)}{n}" for n in range(depth)) + f"/module_{i}.py"
+        results.append({
+            "repository": {"nameWithOwner": f"{rng.choice(_WORDS)}/{rng.choice(_WORDS)}-{i % 50}"},
+            "path": path.lstrip("/"),
+            "textMatches": [{"fragment": _pathological_fragment(rng, i)}],
+        })
+    return results
+
+def topic_names(count: int, seed: int = 5) -> List[str]:
+    """Distinct topic-like names ("fast-parser-12"), for catalog indexes."""
+    rng = random.Random(seed)
+    return [f"{rng.choice(_WORDS)}-{rng.choice(_WORDS)}-{i}" for i in range(count)]
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the formatting and rendering hot paths
+
+Each case builds its renderable from a synthetic fixture and renders it
+through a Rich console at several terminal widths. Wall time, peak traced
+memory and the memory retained by the result are recorded per case, size and
+width. Results can be saved as a JSON baseline and later runs compared
+against it:
+
+    python -m benchmarks.run --save benchmarks/baseline.json
+    python -m benchmarks.run --compare benchmarks/baseline.json
+
+The comparison exits with status 1 when any measurement regressed by more
+than --threshold.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from rich.console import Console
+from rich.theme import Theme
+
+from benchmarks import fixtures
+from gh_explorer.api.models import CodeResultSet, RepoResultSet
+from gh_explorer.api.tree import RepoTree
+
+# Terminal widths every case is rendered at
+DEFAULT_WIDTHS = (80, 120, 200)
+
+# Terminal height used for the full-screen browser cases
+HEIGHT = 40
+
+# Relative slowdown (0.15 = 15%) that counts as a regression
+DEFAULT_THRESHOLD = 0.15
+
+# Differences below these floors are noise, whatever the ratio
+TIME_FLOOR_MS = 0.5
+MEMORY_FLOOR_KIB = 64.0
+
+class Case(NamedTuple):
+    """A benchmarked code path.
+
+    `setup(size, console)` prepares fixtures and returns the callable that is
+    timed; it is called again for every width.
+    """
+    name: str
+    sizes: Tuple[int, ...]
+    setup: Callable[[int, Console], Callable[[], Any]]
+
+def _make_console(width: int) -> Console:
+    """A console that renders to memory with full styling at a fixed size."""
+    from gh_explorer.cli import THEME_STYLES
+    return Console(
+        width=width,
+        height=HEIGHT,
+        theme=Theme(THEME_STYLES),
+        force_terminal=True,
+        color_system="truecolor",
+        legacy_windows=False,
+    )
+
+def _render(console: Console, renderable: Any) -> str:
+    """Render like console.print does, returning the output instead."""
+    console.begin_capture()
+    console.print(renderable)
+    return console.end_capture()
+
+# -- cases -------------------------------------------------------------------
+
+def _repo_list(size: int, console: Console) -> Callable[[], Any]:
+    from gh_explorer.utils.formatting import format_repo_list
+    repos = RepoResultSet.from_dicts(fixtures.repo_search_results(size))
+    return lambda: _render(console, format_repo_list(repos))
+
+def _repo_list_window(size: int, console: Console) -> Callable[[], Any]:
+    from gh_explorer.utils.formatting import format_repo_list
+    repos = RepoResultSet.from_dicts(fixtures.repo_search_results(size))
+    offset = size // 2
+    return lambda: _render(console, format_repo_list(repos, offset=offset, height=HEIGHT))
+
+def _code_results(size: int, console: Console) -> Callable[[], Any]:
+    from gh_explorer.utils.formatting import format_code_results
+    results = CodeResultSet.from_dicts(fixtures.code_search_results(size))
+    return lambda: _render(console, format_code_results(results))
+
+def _repo_details(size: int, console: Console) -> Callable[[], Any]:
+    from gh_explorer.utils.formatting import format_repo_details
+    repo = fixtures.repo_details(size)
+    return lambda: _render(console, format_repo_details(repo))
+
+class _FixtureClient:
+    """Answers the browser's fetches from fixtures, without any I/O."""
+
+    def __init__(self, readme_size: int, files: int = 50_000):
+        self.details = fixtures.repo_details(readme_size)
+        self.tree_payload = fixtures.repo_tree_payload(files)
+
+    def get_repository(self, name: str) -> Dict[str, Any]:
+        return dict(self.details, nameWithOwner=name)
+
+    def get_repositories(self, names: List[str]) -> Dict[str, Dict[str, Any]]:
+        return {name: self.get_repository(name) for name in names}
+
+    def get_repository_tree(self, name: str, ref: str = "HEAD") -> RepoTree:
+        return RepoTree.from_api(self.tree_payload)
+
+def _browser(repo_count: int, readme_size: int, console: Console, files: int = 1_000):
+    from gh_explorer.ui.widgets.repo_browser import RepoBrowser
+    client = _FixtureClient(readme_size, files)
+    browser = RepoBrowser({"CONSOLE": console, "CLIENT": client},
+                          RepoResultSet.from_dicts(fixtures.repo_search_results(repo_count)))
+    return browser
+
+def _browser_navigate(size: int, console: Console) -> Callable[[], Any]:
+    """Move the selection one row and redraw, as holding `j` does."""
+    browser = _browser(size, 1_000, console)
+    browser._select(0)
+
+    def step():
+        browser._select((browser.selected_index + 1) % len(browser.repos))
+        return _render(console, browser._compose_layout())
+    return step
+
+def _browser_readme(size: int, console: Console) -> Callable[[], Any]:
+    """Alternate between two opened repositories with READMEs of `size` chars."""
+    browser = _browser(2, size, console)
+    for name in browser.names:
+        browser.prefetcher._store(name, browser.client.get_repository(name))
+        browser.prefetcher.store_tree(name, browser.client.get_repository_tree(name))
+        browser.opened.add(name)
+
+    def step():
+        browser._select(1 - browser.selected_index)
+        return _render(console, browser._compose_layout())
+    return step
+
+def _browser_files(size: int, console: Console) -> Callable[[], Any]:
+    """Walk the Files pane of a `size`-file tree with every directory expanded."""
+    browser = _browser(1, 1_000, console, files=size)
+    name = browser.names[0]
+    browser.prefetcher._store(name, browser.client.get_repository(name))
+    browser.prefetcher.store_tree(name, browser.client.get_repository_tree(name))
+    browser.opened.add(name)
+    browser._select(0)
+    browser._compose_layout()
+    browser.focus = "files"
+    tree = browser.prefetcher.tree(name)
+    browser.expanded[name] = {path for path in tree._dirs if path}
+    browser._files_changed()
+
+    def step():
+        rows = len(browser._visible_file_rows())
+        browser._move_file_cursor(1 if browser.file_cursor < rows - 1 else -rows)
+        return _render(console, browser._compose_layout())
+    return step
+
+def _catalog_keystrokes(size: int, console: Console) -> Callable[[], Any]:
+    """Rank catalog matches after every keystroke of a misspelled topic.
+
+    The index holds the bundled topics plus synthetic ones up to `size`.
+    """
+    from gh_explorer.data.catalog import Catalog, Entry, FuzzyIndex
+    entries = Catalog().entries("topics")
+    entries += [Entry(name, 10, ()) for name in fixtures.topic_names(max(0, size - len(entries)))]
+    index = FuzzyIndex(entries)
+    typed = "machine lerning"
+    prefixes = [typed[:end] for end in range(1, len(typed) + 1)]
+
+    def step():
+        return [index.search(prefix) for prefix in prefixes]
+    return step
+
+CASES = [
+    Case("format_repo_list", (10, 1_000, 10_000), _repo_list),
+    Case("format_repo_list[window]", (100_000,), _repo_list_window),
+    Case("format_code_results", (10, 1_000), _code_results),
+    Case("format_repo_details", (4_000, 64_000, 1_000_000), _repo_details),
+    Case("browser.navigate", (100_000,), _browser_navigate),
+    Case("browser.readme", (16_000, 256_000), _browser_readme),
+    Case("browser.files", (50_000,), _browser_files),
+    Case("catalog.keystrokes[15]", (1_000, 20_000), _catalog_keystrokes),
+]
+
+# -- measurement ---------------------------------------------------------------
+
+def measure(fn: Callable[[], Any], repeat: int, min_time: float) -> Dict[str, float]:
+    """Time `fn` and trace its memory use.
+
+    Runs at least `repeat` times and until `min_time` seconds have been
+    spent. Memory is traced in a separate run so tracing does not distort
+    the timings.
+    """
+    fn()  # warm-up: imports, regex compilation, caches
+    times: List[float] = []
+    gc.collect()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while len(times) < repeat or (sum(times) < min_time and len(times) < repeat * 20):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base_current, _ = tracemalloc.get_traced_memory()
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    retained = after.compare_to(before, "filename")
+    del result
+
+    return {
+        "time_ms": min(times) * 1000,
+        "time_median_ms": statistics.median(times) * 1000,
+        "runs": len(times),
+        "peak_kib": (peak - base_current) / 1024,
+        "retained_kib": sum(stat.size_diff for stat in retained) / 1024,
+        "retained_blocks": sum(stat.count_diff for stat in retained),
+    }
+
+def run_cases(cases: List[Case],
+              widths: Tuple[int, ...],
+              repeat: int,
+              min_time: float,
+              quick: bool = False) -> Dict[str, Dict[str, float]]:
+    """Run every case at every size and width; return results keyed by label."""
+    results: Dict[str, Dict[str, float]] = {}
+    for case in cases:
+        sizes = case.sizes[:1] if quick else case.sizes
+        for size in sizes:
+            for width in widths:
+                label = f"{case.name}[{size}]@{width}"
+                # format_* size their columns from the terminal, not the console
+                os.environ["COLUMNS"] = str(width)
+                os.environ["LINES"] = str(HEIGHT)
+                console = _make_console(width)
+                results[label] = measure(case.setup(size, console), repeat, min_time)
+                _print_result(label, results[label])
+    return results
+
+# -- baselines -----------------------------------------------------------------
+
+def _metadata() -> Dict[str, str]:
+    from importlib.metadata import version
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "rich": version("rich"),
+    }
+
+def save_baseline(path: str, results: Dict[str, Dict[str, float]]) -> None:
+    """Write results and the environment they were measured in."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": _metadata(), "results": results}, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def compare(baseline: Dict[str, Dict[str, float]],
+            results: Dict[str, Dict[str, float]],
+            threshold: float) -> List[str]:
+    """Return a description of every measurement that regressed."""
+    regressions = []
+    for label, current in results.items():
+        previous = baseline.get(label)
+        if previous is None:
+            continue
+        for metric, floor, unit in (("time_ms", TIME_FLOOR_MS, "ms"),
+                                    ("peak_kib", MEMORY_FLOOR_KIB, "KiB")):
+            old, new = previous.get(metric), current.get(metric)
+            if old is None or new is None or new - old < floor:
+                continue
+            if old <= 0 or new / old > 1 + threshold:
+                change = f"+{(new / old - 1) * 100:.0f}%" if old > 0 else "new"
+                regressions.append(f"{label} {metric}: {old:.1f} -> {new:.1f} {unit} ({change})")
+    return regressions
+
+# -- command line ----------------------------------------------------------------
+
+def _print_result(label: str, result: Dict[str, float]) -> None:
+    print(f"{label:<42} {result['time_ms']:>10.2f} ms {result['time_median_ms']:>10.2f} ms "
+          f"{result['peak_kib']:>10.0f} KiB {result['retained_kib']:>10.0f} KiB "
+          f"{result['retained_blocks']:>8}", flush=True)
+
+def _parse_widths(value: str) -> Tuple[int, ...]:
+    return tuple(int(width) for width in value.split(",") if width)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--widths", type=_parse_widths, default=DEFAULT_WIDTHS,
+                        help="comma-separated terminal widths (default: 80,120,200)")
+    parser.add_argument("--only", action="append", default=[],
+                        help="run only cases whose name contains this (repeatable)")
+    parser.add_argument("--quick", action="store_true",
+                        help="run only the smallest size of each case")
+    parser.add_argument("--repeat", type=int, default=5, help="minimum timed runs per measurement")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="keep repeating until this many seconds are spent")
+    parser.add_argument("--save", metavar="FILE", help="write the results as a baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown flagged as a regression (default: 0.15)")
+    args = parser.parse_args(argv)
+
+    cases = [case for case in CASES
+             if not args.only or any(part in case.name for part in args.only)]
+    if not cases:
+        parser.error("no benchmark matches --only")
+
+    print(f"{'case[size]@width':<42} {'best':>13} {'median':>13} {'peak':>14} "
+          f"{'retained':>14} {'blocks':>8}")
+    results = run_cases(cases, args.widths, args.repeat, args.min_time, args.quick)
+
+    if args.save:
+        save_baseline(args.save, results)
+        print(f"\nBaseline written to {args.save}")
+
+    if args.compare:
+        baseline = load_baseline(args.compare)
+        if baseline.get("meta", {}).get("python") != platform.python_version():
+            print("\nwarning: baseline was recorded with a different Python version",
+                  file=sys.stderr)
+        regressions = compare(baseline.get("results", {}), results, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions above {args.threshold:.0%} against {args.compare}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Asyncio wrapper around GitHubClient with bounded concurrency
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from gh_explorer.api.client import BATCH_SIZE, GitHubClient
+from gh_explorer.api.models import CodeResultSet, RepoResultSet
+
+DEFAULT_CONCURRENCY = 8
+
+class AsyncGitHubClient:
+    """Coroutine versions of the GitHubClient query methods.
+
+    Each request runs on a worker thread (backends are blocking), and at most
+    `concurrency` requests are in flight at once. Independent sub-requests,
+    like a repository's metadata and its README, are issued concurrently.
+    """
+
+    def __init__(self,
+                 client: Optional[GitHubClient] = None,
+                 concurrency: int = DEFAULT_CONCURRENCY,
+                 **client_kwargs: Any):
+        """Wrap an existing client, or create one from `client_kwargs`."""
+        self.client = client if client is not None else GitHubClient(**client_kwargs)
+        self.concurrency = max(1, concurrency)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.concurrency,
+            thread_name_prefix="ghx-async"
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Return the semaphore for the running loop, creating it if needed."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    async def _call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking client call on the worker pool under the semaphore."""
+        async with self._get_semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor,
+                functools.partial(func, *args, **kwargs)
+            )
+
+    async def run_command(self, args: List[str]) -> str:
+        """Run a GitHub CLI command and return the output."""
+        return await self._call(self.client.run_command, args)
+
+    async def search_repositories(
+        self,
+        query: str,
+        limit: int = 20,
+        sort: Optional[str] = "stars",
+        language: Optional[str] = None,
+        topic: Optional[str] = None
+    ) -> RepoResultSet:
+        """Search for repositories matching query."""
+        return await self._call(
+            self.client.search_repositories,
+            query=query, limit=limit, sort=sort, language=language, topic=topic
+        )
+
+    async def get_repository(self, repo_name: str) -> Dict[str, Any]:
+        """Get repository details, fetching metadata and README concurrently."""
+        if not isinstance(self.client, GitHubClient):
+            # A DaemonClient forwards whole queries, not their sub-requests
+            return await self._call(self.client.get_repository, repo_name)
+        repo_data, readme = await asyncio.gather(
+            self._call(self.client._get_repository_info, repo_name),
+            self._call(self.client._get_readme, repo_name),
+        )
+        if readme is not None:
+            repo_data["readme"] = readme
+        await self._call(self.client._ingest, "add_repository", repo_data)
+        return repo_data
+
+    async def get_repositories(self, repo_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get many repositories, running the batched GraphQL chunks concurrently."""
+        names = list(dict.fromkeys(repo_names))
+        local = isinstance(self.client, GitHubClient)
+        # Each chunk sent to a DaemonClient is a whole query, indexed there
+        fetch = self.client._get_repositories_chunk if local else self.client.get_repositories
+        chunks = await asyncio.gather(*[
+            self._call(fetch, names[start:start + BATCH_SIZE])
+            for start in range(0, len(names), BATCH_SIZE)
+        ])
+        results: Dict[str, Dict[str, Any]] = {}
+        for chunk in chunks:
+            results.update(chunk)
+        if local:
+            await self._call(self.client._ingest, "add_repositories", list(results.values()))
+        return results
+
+    async def search_code(
+        self,
+        query: str,
+        limit: int = 20,
+        language: Optional[str] = None
+    ) -> CodeResultSet:
+        """Search for code matching query."""
+        return await self._call(
+            self.client.search_code, query=query, limit=limit, language=language
+        )
+
+    async def get_repository_files(self, repo_name: str, path: str = "") -> List[Dict[str, Any]]:
+        """Get files and directories in a repository path."""
+        return await self._call(self.client.get_repository_files, repo_name, path)
+
+    async def close(self) -> None:
+        """Shut down the worker pool."""
+        self._executor.shutdown(wait=False)
+
+    async def __aenter__(self) -> "AsyncGitHubClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Transport backends for the GitHub client
+
+SubprocessBackend spawns the gh CLI for every command. HTTPBackend borrows
+gh's token once and speaks REST/GraphQL over pooled keep-alive connections,
+translating the gh commands the client issues and handing anything else to
+the subprocess backend.
+"""
+
+import json
+import os
+import queue
+import subprocess
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Any, NamedTuple, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from gh_explorer.api import parsers
+from gh_explorer.api.cache import VALUE_FLAGS
+from gh_explorer.utils import trace
+
+if TYPE_CHECKING:
+    import http.client
+
+DEFAULT_API_URL = "https://api.github.com"
+
+class Response(NamedTuple):
+    """Result of a single backend request."""
+    status: int
+    body: str
+    headers: Dict[str, str]
+
+class UnsupportedCommand(Exception):
+    """Raised when a backend cannot translate a gh command."""
+
+def parse_included_response(output: str) -> Tuple[int, Dict[str, str], str]:
+    """Split `gh api --include` output into status, headers and body."""
+    output = output.replace("\r\n", "\n")
+    head, sep, body = output.partition("\n\n")
+    if not head.startswith("HTTP/"):
+        return 200, {}, output
+    lines = head.splitlines()
+    status = 200
+    parts = lines[0].split()
+    if len(parts) > 1 and parts[1].isdigit():
+        status = int(parts[1])
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if name:
+            headers[name.strip().lower()] = value.strip()
+    return status, headers, body
+
+def split_args(args: List[str]) -> Tuple[List[str], Dict[str, List[str]]]:
+    """Split a gh argument list into positionals and flag values."""
+    positionals = []
+    options: Dict[str, List[str]] = {}
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in VALUE_FLAGS and i + 1 < len(args):
+            options.setdefault(arg, []).append(args[i + 1])
+            i += 2
+            continue
+        if arg.startswith("-"):
+            options.setdefault(arg, []).append("")
+        else:
+            positionals.append(arg)
+        i += 1
+    return positionals, options
+
+class SubprocessBackend:
+    """Runs every command through a fresh gh process."""
+
+    name = "gh"
+
+    def execute(self, args: List[str], headers: Optional[Dict[str, str]] = None) -> Response:
+        """Spawn gh for a command and return its response.
+
+        When `headers` is given for a `gh api` call, the command is run with
+        --include so response headers (validators, rate limits) are returned
+        and the conditional headers are passed on. Other gh commands do not
+        expose HTTP headers, so they always come back as a plain 200.
+        """
+        include = headers is not None and args[:1] == ["api"]
+        cmd = ["gh"] + args
+        if include:
+            cmd.append("--include")
+            for name, value in headers.items():
+                cmd.extend(["-H", f"{name}: {value}"])
+
+        try:
+            result = subprocess.run(
+                cmd,
+                capture_output=True,
+                text=True,
+                check=True
+            )
+        except subprocess.CalledProcessError as e:
+            # gh treats 304 Not Modified as a failure, but with --include the
+            # status line is still printed on stdout
+            if include and e.stdout:
+                status, response_headers, _ = parse_included_response(e.stdout)
+                if status == 304:
+                    return Response(304, "", response_headers)
+            error_msg = e.stderr.strip() if e.stderr else str(e)
+            raise RuntimeError(f"GitHub CLI command failed: {error_msg}")
+
+        if include:
+            status, response_headers, body = parse_included_response(result.stdout)
+            return Response(status, body.strip(), response_headers)
+        return Response(200, result.stdout.strip(), {})
+
+    def close(self) -> None:
+        """Nothing to release for the subprocess backend."""
+
+class HTTPBackend:
+    """Talks to the GitHub API directly over pooled keep-alive connections."""
+
+    name = "http"
+
+    def __init__(self,
+                 token: Optional[str] = None,
+                 base_url: Optional[str] = None,
+                 fallback: Optional[SubprocessBackend] = None,
+                 pool_size: int = 8,
+                 timeout: float = 30.0):
+        """Initialize the backend; the token is looked up lazily on first use."""
+        self.fallback = fallback or SubprocessBackend()
+        self.base_url = (base_url or os.environ.get("GHX_API_URL") or DEFAULT_API_URL).rstrip("/")
+        parts = urlsplit(self.base_url)
+        self._scheme = parts.scheme or "https"
+        self._host = parts.hostname or "api.github.com"
+        self._port = parts.port
+        self._prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._token = token
+        self._token_lock = threading.Lock()
+        self._pool: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(maxsize=pool_size)
+
+    # -- connection handling -------------------------------------------------
+
+    @property
+    def token(self) -> str:
+        """Return the API token, borrowing it from gh the first time."""
+        if self._token is None:
+            with self._token_lock:
+                if self._token is None:
+                    token = os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN")
+                    if not token:
+                        token = self.fallback.execute(["auth", "token"]).body
+                    self._token = token.strip()
+        return self._token
+
+    def _connect(self) -> "http.client.HTTPConnection":
+        """Open a new connection to the API host."""
+        # Imported here: the gh backend never needs it, and it is slow to import
+        import http.client
+        if self._scheme == "http":
+            return http.client.HTTPConnection(self._host, self._port, timeout=self.timeout)
+        return http.client.HTTPSConnection(self._host, self._port, timeout=self.timeout)
+
+    def _acquire(self) -> "http.client.HTTPConnection":
+        """Take an idle connection from the pool or open a new one."""
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def _release(self, conn: "http.client.HTTPConnection") -> None:
+        """Return a connection to the pool, closing it if the pool is full."""
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self) -> None:
+        """Close every pooled connection."""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def request(self,
+                method: str,
+                path: str,
+                params: Optional[Dict[str, Any]] = None,
+                body: Optional[Any] = None,
+                headers: Optional[Dict[str, str]] = None) -> Response:
+        """Perform a single HTTP request against the API."""
+        url = path if path.startswith("/") else "/" + path
+        url = self._prefix + url
+        if params:
+            url += ("&" if "?" in url else "?") + urlencode(params)
+
+        request_headers = {
+            "Authorization": f"token {self.token}",
+            "Accept": "application/vnd.github+json",
+            "Accept-Encoding": "gzip",
+            "User-Agent": "gh-explorer",
+        }
+        request_headers.update(headers or {})
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode("utf-8")
+            request_headers["Content-Type"] = "application/json"
+
+        import http.client
+
+        # A pooled connection may have been closed by the server while idle;
+        # retry once on a fresh one before giving up.
+        for attempt in range(2):
+            conn = self._acquire()
+            try:
+                conn.request(method, url, body=payload, headers=request_headers)
+                resp = conn.getresponse()
+                data = resp.read()
+            except (http.client.HTTPException, OSError) as e:
+                conn.close()
+                if attempt:
+                    raise RuntimeError(f"GitHub API request failed: {e}") from e
+                continue
+
+            response_headers = {k.lower(): v for k, v in resp.getheaders()}
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+            if response_headers.get("content-encoding") == "gzip":
+                import gzip
+                data = gzip.decompress(data)
+            return Response(resp.status, data.decode("utf-8", errors="replace"), response_headers)
+
+    def _checked(self, response: Response) -> Response:
+        """Raise like gh does for error statuses."""
+        if response.status >= 400:
+            message = response.body
+            try:
+                message = json.loads(response.body).get("message", message)
+            except (ValueError, AttributeError):
+                pass
+            raise RuntimeError(f"GitHub CLI command failed: {message} (HTTP {response.status})")
+        return response
+
+    # -- gh command translation ----------------------------------------------
+
+    def execute(self, args: List[str], headers: Optional[Dict[str, str]] = None) -> Response:
+        """Run a gh command over HTTP, falling back to gh if it can't be translated."""
+        try:
+            return self._translate(args, headers)
+        except UnsupportedCommand:
+            return self.fallback.execute(args, headers)
+
+    def _translate(self, args: List[str], headers: Optional[Dict[str, str]]) -> Response:
+        """Dispatch a gh command to its HTTP equivalent."""
+        if args[:2] == ["search", "repos"]:
+            return self._search(args[2:], "repositories", parsers.repo_search_item, headers)
+        if args[:2] == ["search", "code"]:
+            return self._search(args[2:], "code", parsers.code_search_item, headers)
+        if args[:2] == ["repo", "view"]:
+            return self._repo_view(args[2:], headers)
+        if args[:1] == ["api"]:
+            return self._api(args[1:], headers)
+        raise UnsupportedCommand(args[0] if args else "")
+
+    def _search(self, args, kind, convert, headers) -> Response:
+        """Translate `gh search repos|code`, paging up to --limit results."""
+        positionals, options = split_args(args)
+        known = {"--json", "--limit", "-L", "--sort", "--order", "--language", "--topic"}
+        if "--json" not in options or set(options) - known:
+            raise UnsupportedCommand("search")
+        fields = parsers.split_fields(options["--json"][0])
+
+        terms = list(positionals)
+        for lang in options.get("--language", []):
+            terms.append(f"language:{lang}")
+        for topic in options.get("--topic", []):
+            terms.append(f"topic:{topic}")
+        params: Dict[str, Any] = {"q": " ".join(terms)}
+        if "--sort" in options:
+            params["sort"] = options["--sort"][0]
+        if "--order" in options:
+            params["order"] = options["--order"][0]
+        limit = int((options.get("--limit") or options.get("-L") or ["30"])[0])
+        params["per_page"] = min(100, limit)
+
+        extra = {"Accept": "application/vnd.github.text-match+json"} if kind == "code" else {}
+        # Conditional headers only make sense when a single page is fetched
+        single_page = limit <= 100
+        if single_page and headers:
+            extra.update(headers)
+
+        results: List[Dict[str, Any]] = []
+        page = 1
+        response = None
+        while len(results) < limit:
+            params["page"] = page
+            response = self.request("GET", f"/search/{kind}", params, headers=extra)
+            if response.status == 304 and single_page:
+                return response
+            self._checked(response)
+            items = trace.decode_json(response.body).get("items", [])
+            try:
+                results.extend(parsers.select_fields(convert(item), fields) for item in items)
+            except KeyError:
+                raise UnsupportedCommand("search")
+            if len(items) < params["per_page"]:
+                break
+            page += 1
+
+        return Response(200, json.dumps(results[:limit]), response.headers if response else {})
+
+    def _repo_view(self, args, headers) -> Response:
+        """Translate `gh repo view OWNER/REPO --json ...`."""
+        positionals, options = split_args(args)
+        if len(positionals) != 1 or set(options) != {"--json"}:
+            raise UnsupportedCommand("repo view")
+        fields = parsers.split_fields(options["--json"][0])
+
+        response = self.request("GET", f"/repos/{positionals[0]}", headers=headers)
+        if response.status == 304:
+            return response
+        self._checked(response)
+        try:
+            record = parsers.select_fields(parsers.repo_view(trace.decode_json(response.body)), fields)
+        except KeyError:
+            raise UnsupportedCommand("repo view")
+        return Response(200, json.dumps(record), response.headers)
+
+    def _api(self, args, headers) -> Response:
+        """Translate `gh api ENDPOINT` including GraphQL queries."""
+        positionals, options = split_args(args)
+        known = {"--jq", "-q", "-H", "--header", "-X", "--method",
+                 "-f", "--raw-field", "-F", "--field"}
+        if len(positionals) != 1 or set(options) - known:
+            raise UnsupportedCommand("api")
+        endpoint = positionals[0]
+
+        jq = (options.get("--jq") or options.get("-q") or [None])[0]
+        if jq is not None and not _is_simple_path(jq):
+            raise UnsupportedCommand("api --jq")
+
+        request_headers = dict(headers or {})
+        for header in options.get("-H", []) + options.get("--header", []):
+            name, _, value = header.partition(":")
+            request_headers[name.strip()] = value.strip()
+
+        fields: Dict[str, Any] = {}
+        for raw in options.get("-f", []) + options.get("--raw-field", []):
+            key, _, value = raw.partition("=")
+            fields[key] = value
+        for typed in options.get("-F", []) + options.get("--field", []):
+            key, _, value = typed.partition("=")
+            fields[key] = _typed_value(value)
+
+        method = (options.get("-X") or options.get("--method") or [""])[0].upper()
+        if endpoint == "graphql":
+            query = fields.pop("query", None)
+            body = {"query": query, "variables": fields}
+            response = self.request(method or "POST", "/graphql", body=body, headers=request_headers)
+        else:
+            method = method or ("POST" if fields else "GET")
+            if method == "GET":
+                response = self.request(method, "/" + endpoint.lstrip("/"), fields or None,
+                                        headers=request_headers)
+            else:
+                response = self.request(method, "/" + endpoint.lstrip("/"), body=fields,
+                                        headers=request_headers)
+        if response.status == 304:
+            return response
+        self._checked(response)
+
+        body_text = response.body
+        if endpoint == "graphql":
+            data = trace.decode_json(body_text)
+            if data.get("errors") and not data.get("data"):
+                raise RuntimeError(f"GitHub CLI command failed: {data['errors'][0].get('message')}")
+        if jq is not None:
+            body_text = _apply_path(trace.decode_json(body_text), jq)
+        return Response(response.status, body_text.strip(), response.headers)
+
+def _is_simple_path(expr: str) -> bool:
+    """Return True for jq expressions of the form `.` or `.a.b`."""
+    if expr == ".":
+        return True
+    return expr.startswith(".") and all(part.isidentifier() for part in expr[1:].split("."))
+
+def _apply_path(data: Any, expr: str) -> str:
+    """Evaluate a simple jq path and print the result the way gh does."""
+    if expr != ".":
+        for part in expr[1:].split("."):
+            data = data.get(part) if isinstance(data, dict) else None
+    if data is None:
+        return "null"
+    if isinstance(data, str):
+        return data
+    return json.dumps(data)
+
+def _typed_value(value: str) -> Any:
+    """Convert a `gh api -F` value to JSON the way gh does."""
+    if value in ("true", "false"):
+        return value == "true"
+    if value == "null":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+def create_backend(name: Optional[str] = None):
+    """Create a backend by name ("gh" or "http"), defaulting to GHX_BACKEND."""
+    name = (name or os.environ.get("GHX_BACKEND") or "gh").lower()
+    if name == "http":
+        return HTTPBackend()
+    if name in ("gh", "subprocess"):
+        return SubprocessBackend()
+    raise ValueError(f"Unknown backend: {name}")
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Batch execution of many queries on the async client
+
+Query specs are read as JSON lines or as one plain query per line and run
+concurrently. Each result is emitted as soon as it completes, tagged with
+its spec's id, and a failing spec produces an error record instead of
+stopping the batch.
+"""
+
+import asyncio
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+from gh_explorer.api.async_client import AsyncGitHubClient
+from gh_explorer.api.client import BATCH_SIZE
+
+# Operations a spec can request, named like the CLI commands
+OPS = ("search-repos", "search-code", "view-repo")
+
+# Spec fields passed through to the client, per operation
+_OPTIONS = {
+    "search-repos": ("limit", "sort", "language", "topic"),
+    "search-code": ("limit", "language"),
+    "view-repo": (),
+}
+
+def parse_spec(line: str, number: int, default_op: str = "search-repos") -> Dict[str, Any]:
+    """Parse one input line into a spec dict.
+
+    A line starting with "{" is a JSON object with an "op" (default
+    `default_op`), a "query" (or "repo" for view-repo), optional client
+    options and an optional "id". Any other line is a plain query for
+    `default_op`, optionally prefixed with an operation name. Specs without
+    an id are tagged with their line number. Raises ValueError for lines
+    that are not valid specs.
+    """
+    text = line.strip()
+    if text.startswith("{"):
+        try:
+            spec = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"invalid JSON: {e.msg}")
+        if not isinstance(spec, dict):
+            raise ValueError("a spec must be a JSON object")
+        spec = dict(spec)
+        spec.setdefault("op", default_op)
+        if spec["op"] == "view-repo" and "query" not in spec and "repo" in spec:
+            spec["query"] = spec.pop("repo")
+    else:
+        op, _, rest = text.partition(" ")
+        if op in OPS:
+            spec = {"op": op, "query": rest.strip()}
+        else:
+            spec = {"op": default_op, "query": text}
+    spec.setdefault("id", number)
+
+    if spec["op"] not in OPS:
+        raise ValueError(f"unknown op {spec['op']!r}; expected one of {', '.join(OPS)}")
+    if not isinstance(spec.get("query"), str) or not spec["query"].strip():
+        raise ValueError("missing query")
+    unknown = set(spec) - {"id", "op", "query"} - set(_OPTIONS[spec["op"]])
+    if unknown:
+        raise ValueError(f"unknown field(s) for {spec['op']}: {', '.join(sorted(unknown))}")
+    return spec
+
+def read_specs(lines: Iterable[str], default_op: str = "search-repos") -> Iterator[Dict[str, Any]]:
+    """Parse input lines, skipping blanks and # comments.
+
+    Lines that cannot be parsed come out as ready-made error records
+    (with "ok": False) so they are reported alongside the results.
+    """
+    for number, line in enumerate(lines, start=1):
+        text = line.strip()
+        if not text or text.startswith("#"):
+            continue
+        try:
+            yield parse_spec(text, number, default_op)
+        except ValueError as e:
+            yield error_record({"id": number, "op": None, "query": text}, e)
+
+def result_record(spec: Dict[str, Any], result: Any) -> Dict[str, Any]:
+    return {"id": spec["id"], "op": spec["op"], "query": spec["query"], "ok": True, "result": result}
+
+def error_record(spec: Dict[str, Any], error: Any) -> Dict[str, Any]:
+    return {"id": spec["id"], "op": spec["op"], "query": spec["query"], "ok": False,
+            "error": str(error).strip() or type(error).__name__}
+
+class BatchRunner:
+    """Runs specs on an AsyncGitHubClient and reports each as it completes.
+
+    view-repo specs are coalesced into batched GraphQL lookups of up to
+    BATCH_SIZE repositories; searches run one request each. Pacing within
+    the rate limits is left to the client's scheduler.
+    """
+
+    def __init__(self,
+                 client: AsyncGitHubClient,
+                 emit: Callable[[Dict[str, Any]], None]):
+        """Initialize with a client and a callback receiving every record."""
+        self.client = client
+        self.emit = emit
+        self.succeeded = 0
+        self.failed = 0
+
+    def _report(self, record: Dict[str, Any]) -> None:
+        if record["ok"]:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+        self.emit(record)
+
+    async def _search(self, spec: Dict[str, Any]) -> None:
+        options = {key: spec[key] for key in _OPTIONS[spec["op"]] if key in spec}
+        try:
+            if spec["op"] == "search-repos":
+                result = await self.client.search_repositories(spec["query"], **options)
+            else:
+                result = await self.client.search_code(spec["query"], **options)
+        except Exception as e:
+            self._report(error_record(spec, e))
+        else:
+            self._report(result_record(spec, result))
+
+    async def _view(self, specs: List[Dict[str, Any]]) -> None:
+        try:
+            found = await self.client.get_repositories([spec["query"] for spec in specs])
+        except Exception as e:
+            for spec in specs:
+                self._report(error_record(spec, e))
+            return
+        for spec in specs:
+            details = found.get(spec["query"])
+            if details is None:
+                self._report(error_record(spec, f"repository {spec['query']} not found or not accessible"))
+            else:
+                self._report(result_record(spec, details))
+
+    def _jobs(self, specs: Iterable[Dict[str, Any]]) -> Iterator[Callable[[], Any]]:
+        """Turn specs into coroutine factories, grouping view-repo specs."""
+        views: List[Dict[str, Any]] = []
+        for spec in specs:
+            if not spec.get("ok", True):
+                # Already an error record from parsing
+                yield lambda record=spec: self._report_async(record)
+            elif spec["op"] == "view-repo":
+                views.append(spec)
+                if len(views) == BATCH_SIZE:
+                    yield lambda chunk=views: self._view(chunk)
+                    views = []
+            else:
+                yield lambda spec=spec: self._search(spec)
+        if views:
+            yield lambda chunk=views: self._view(chunk)
+
+    async def _report_async(self, record: Dict[str, Any]) -> None:
+        self._report(record)
+
+    async def run(self, specs: Iterable[Dict[str, Any]]) -> None:
+        """Run every spec, keeping a bounded number of jobs pending at once."""
+        window = self.client.concurrency * 2
+        pending = set()
+        for job in self._jobs(specs):
+            if len(pending) >= window:
+                _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            pending.add(asyncio.ensure_future(job()))
+        if pending:
+            await asyncio.wait(pending)
+
+def run_batch(specs: Iterable[Dict[str, Any]],
+              client: AsyncGitHubClient,
+              emit: Callable[[Dict[str, Any]], None]) -> BatchRunner:
+    """Run a batch to completion; return the runner with its counts."""
+    runner = BatchRunner(client, emit)
+
+    async def main() -> None:
+        async with client:
+            await runner.run(specs)
+
+    asyncio.run(main())
+    return runner
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk cache for GitHub CLI responses
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+from gh_explorer.utils.paths import cache_dir
+
+# Flags whose following argument is their value, so the pair can be reordered
+# as a unit when normalizing an argument list.
+VALUE_FLAGS = {
+    "--json", "--limit", "-L", "--sort", "--order", "--language", "--topic",
+    "--jq", "-q", "--template", "-t", "-H", "--header", "-f", "--raw-field",
+    "-F", "--field", "-X", "--method",
+}
+
+# Flags that only change how gh prints a response, not what is fetched.
+OUTPUT_ONLY_FLAGS = {"--include", "-i"}
+
+DEFAULT_TTL = 300
+
+def normalize_args(args: List[str]) -> List[str]:
+    """Normalize a gh argument list so equivalent invocations share a key."""
+    positionals = []
+    options = []
+
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in VALUE_FLAGS and i + 1 < len(args):
+            value = args[i + 1]
+            if arg == "--json":
+                # Field order does not affect the response
+                value = ",".join(sorted(f.strip() for f in value.split(",")))
+            options.append([arg, value])
+            i += 2
+            continue
+        if arg in OUTPUT_ONLY_FLAGS:
+            pass
+        elif arg.startswith("-"):
+            options.append([arg])
+        else:
+            positionals.append(arg)
+        i += 1
+
+    normalized = list(positionals)
+    for option in sorted(options):
+        normalized.extend(option)
+    return normalized
+
+def is_cacheable(args: List[str]) -> bool:
+    """Return True if a gh invocation is a read-only query safe to cache."""
+    if not args:
+        return False
+
+    command = args[0]
+    if command == "search":
+        return True
+    if command == "repo":
+        return len(args) > 1 and args[1] == "view" and "--web" not in args
+    if command == "api":
+        for flag in ("-X", "--method"):
+            if flag in args:
+                idx = args.index(flag)
+                if idx + 1 < len(args) and args[idx + 1].upper() != "GET":
+                    return False
+        if len(args) > 1 and args[1] == "graphql":
+            # GraphQL goes over POST; only plain queries are safe to reuse
+            return not any(
+                arg.startswith("query=") and arg[6:].lstrip().startswith("mutation")
+                for arg in args[2:]
+            )
+        return not any(flag in args for flag in ("-f", "-F", "--field", "--raw-field", "--input"))
+    return False
+
+def cache_key(args: List[str]) -> str:
+    """Compute the cache key for a gh argument list."""
+    payload = json.dumps(normalize_args(args), separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ResponseCache:
+    """Stores gh responses on disk together with their HTTP validators.
+
+    Each entry holds the response body, the ETag and Last-Modified headers (when
+    the command exposes them) and the time it was fetched. Entries younger than
+    the TTL are served without running gh at all; older ones are revalidated.
+    """
+
+    def __init__(self, directory: Optional[Path] = None, ttl: Optional[int] = None):
+        """Initialize the cache in the given directory."""
+        self.directory = Path(directory) if directory else cache_dir("responses")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if ttl is None:
+            ttl = int(os.environ.get("GHX_CACHE_TTL", DEFAULT_TTL))
+        self.ttl = ttl
+
+    def _path(self, key: str) -> Path:
+        """Return the file holding the entry for a key."""
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored entry for a key, or None."""
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """Return True if an entry can be served without revalidation."""
+        return time.time() - entry.get("fetched_at", 0) < self.ttl
+
+    def validators(self, entry: Dict[str, Any]) -> Dict[str, str]:
+        """Return conditional request headers for revalidating an entry."""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(self, key: str, body: str, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Store a response body with the validators from its headers."""
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        entry = {
+            "body": body,
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "fetched_at": time.time(),
+        }
+        self._write(key, entry)
+        return entry
+
+    def touch(self, key: str, entry: Dict[str, Any]) -> None:
+        """Mark an entry as freshly validated (e.g. after a 304)."""
+        entry["fetched_at"] = time.time()
+        self._write(key, entry)
+
+    def clear(self) -> None:
+        """Remove every stored entry."""
+        for path in self.directory.glob("*/*.json"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def _write(self, key: str, entry: Dict[str, Any]) -> None:
+        """Atomically write an entry so concurrent readers never see partial files."""
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp, path)
+        except OSError:
+            # A cache that cannot be written is just a slower cache
+            pass
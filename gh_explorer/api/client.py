@@ -4,41 +4,258 @@ GitHub API client using the GitHub CLI (gh) as a backend
 """
 
 import json
-import subprocess
+import os
 import shlex
-from typing import Dict, List, Optional, Any, Union
+import shutil
+import sqlite3
+from typing import Callable, Dict, Iterator, List, Optional, Any, Tuple, Union
+from urllib.parse import quote, urlencode
+
+from gh_explorer.api import pagination, parsers
+from gh_explorer.api.backends import Response, create_backend
+from gh_explorer.api.cache import ResponseCache, cache_key, is_cacheable
+from gh_explorer.api.clone import CloneOptions, git_clone_flags, sparse_checkout
+from gh_explorer.api.models import CodeResultSet, RepoResultSet
+from gh_explorer.api.ratelimit import MAX_RETRIES, RateLimitScheduler
+from gh_explorer.api.tree import RepoTree
+from gh_explorer.data.blobs import BlobStore
+from gh_explorer.data.index import RepoIndex
+from gh_explorer.utils import trace
+from gh_explorer.utils.paths import cache_dir
+
+# --json fields requested from gh search, also used for the paged REST search
+REPO_SEARCH_FIELDS = "fullName,description,stargazersCount,forksCount,updatedAt,url,language"
+CODE_SEARCH_FIELDS = "repository,path,textMatches"
+# Grouped code search also needs the blob SHA to recognise copied files
+GROUPED_CODE_FIELDS = CODE_SEARCH_FIELDS + ",sha"
+
+# Remembers the `gh --version` check between runs (see _check_gh_installed)
+GH_PROBE_FILE = "gh-probe.json"
+
+# Repositories per batched GraphQL query. Each repository costs one node plus
+# its README lookups, so this keeps a query well inside the node and
+# response-size limits.
+BATCH_SIZE = 20
+
+# File names tried, in order, when looking up a README through GraphQL
+README_CANDIDATES = ["README.md", "readme.md", "Readme.md", "README.rst", "README.markdown", "README"]
+
+BATCH_REPO_FIELDS = """
+    nameWithOwner
+    description
+    stargazerCount
+    forkCount
+    updatedAt
+    url
+    primaryLanguage { name }
+    repositoryTopics(first: 20) { nodes { topic { name } } }"""
+
+def build_batch_query(count: int, readme_fields: str = "oid text") -> str:
+    """Build an aliased GraphQL query fetching `count` repositories with READMEs.
+    
+    `readme_fields` selects what is fetched for each README blob; "oid"
+    alone asks only for the SHAs, so text already stored can be skipped.
+    """
+    params = ", ".join(f"$o{i}: String!, $n{i}: String!" for i in range(count))
+    blocks = []
+    for i in range(count):
+        readmes = "".join(
+            f'\n    readme{j}: object(expression: "HEAD:{name}") {{ ... on Blob {{ {readme_fields} }} }}'
+            for j, name in enumerate(README_CANDIDATES)
+        )
+        blocks.append(f"  r{i}: repository(owner: $o{i}, name: $n{i}) {{{BATCH_REPO_FIELDS}{readmes}\n  }}")
+    return f"query({params}) {{\n" + "\n".join(blocks) + "\n}"
+
+def build_blob_query(count: int) -> str:
+    """Build an aliased GraphQL query fetching the text of `count` blobs by SHA."""
+    params = ", ".join(f"$o{i}: String!, $n{i}: String!, $s{i}: GitObjectID!" for i in range(count))
+    blocks = [
+        f"  b{i}: repository(owner: $o{i}, name: $n{i}) {{ object(oid: $s{i}) {{ ... on Blob {{ text }} }} }}"
+        for i in range(count)
+    ]
+    return f"query({params}) {{\n" + "\n".join(blocks) + "\n}"
+
+def build_readme_oid_query(paths: List[str]) -> str:
+    """Build a GraphQL query for the blob SHA of each candidate README path."""
+    lookups = "".join(
+        f"\n    c{j}: object(expression: {json.dumps('HEAD:' + path)}) {{ ... on Blob {{ oid }} }}"
+        for j, path in enumerate(paths)
+    )
+    return f"query($owner: String!, $name: String!) {{\n  repository(owner: $owner, name: $name) {{{lookups}\n  }}\n}}"
 
 class GitHubClient:
     """Client for interacting with GitHub through the GitHub CLI."""
     
-    def __init__(self):
-        """Initialize the GitHub client and verify gh is installed."""
+    def __init__(self, 
+                 cache: Optional[ResponseCache] = None, 
+                 use_cache: Optional[bool] = None,
+                 backend: Any = None,
+                 scheduler: Optional[RateLimitScheduler] = None,
+                 index: Optional[RepoIndex] = None,
+                 use_index: Optional[bool] = None,
+                 readmes: Optional[BlobStore] = None):
+        """Initialize the GitHub client and verify gh is installed.
+        
+        Read-only queries are served from an on-disk response cache unless
+        `use_cache` is False or GHX_NO_CACHE is set. `backend` is a backend
+        instance or name ("gh" or "http"); it defaults to GHX_BACKEND, then gh.
+        Requests are paced per rate-limit resource by `scheduler`. Fetched
+        repositories are added to the offline `index` unless `use_index` is
+        False or GHX_NO_INDEX is set. README text is kept in the `readmes`
+        blob store, which is bypassed along with the response cache.
+        """
+        if backend is None or isinstance(backend, str):
+            backend = create_backend(backend)
+        self.backend = backend
+        self.scheduler = scheduler if scheduler is not None else RateLimitScheduler()
+        if use_cache is None:
+            use_cache = not os.environ.get("GHX_NO_CACHE")
+        self.cache = cache if cache is not None else (ResponseCache() if use_cache else None)
+        self.readmes = readmes if readmes is not None else (BlobStore() if use_cache else None)
+        if use_index is None:
+            use_index = not os.environ.get("GHX_NO_INDEX")
+        self.index = index if index is not None else (RepoIndex() if use_index else None)
+        self.gh_version = ""
         self._check_gh_installed()
         
     def _check_gh_installed(self):
-        """Check if GitHub CLI is installed and throw error if not."""
+        """Check if GitHub CLI is installed and throw error if not.
+        
+        Spawning `gh --version` costs tens of milliseconds, so the result is
+        remembered in the cache directory and reused while the gh binary on
+        PATH is unchanged (same path, mtime and size).
+        """
+        path = shutil.which("gh")
+        if path is None:
+            raise RuntimeError(
+                "GitHub CLI (gh) is not installed or not in PATH. "
+                "Please install it from https://cli.github.com/"
+            )
+        
         try:
-            self.run_command(["--version"])
+            stat = os.stat(path)
+            signature = [path, stat.st_mtime_ns, stat.st_size]
+        except OSError:
+            signature = None
+        probe_file = os.path.join(cache_dir(), GH_PROBE_FILE)
+        
+        if signature is not None:
+            try:
+                with open(probe_file, "r", encoding="utf-8") as f:
+                    probe = json.load(f)
+                if probe.get("signature") == signature:
+                    self.gh_version = probe.get("version", "")
+                    return
+            except (OSError, ValueError, AttributeError):
+                pass
+        
+        try:
+            output = self.run_command(["--version"])
         except Exception as e:
             raise RuntimeError(
                 "GitHub CLI (gh) is not installed or not in PATH. "
                 "Please install it from https://cli.github.com/"
             ) from e
+        self.gh_version = output.splitlines()[0] if output else ""
+        
+        if signature is not None:
+            try:
+                tmp = f"{probe_file}.{os.getpid()}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump({"signature": signature, "version": self.gh_version}, f)
+                os.replace(tmp, probe_file)
+            except OSError:
+                pass
     
-    def run_command(self, args: List[str]) -> str:
-        """Run a GitHub CLI command and return the output."""
+    def close(self) -> None:
+        """Release the backend's pooled connections."""
+        self.backend.close()
+    
+    def _ingest(self, method: str, records: Any) -> None:
+        """Add fetched records to the offline index, never failing the fetch.
+        
+        `method` names the RepoIndex method that takes `records`.
+        """
+        if self.index is None:
+            return
         try:
-            cmd = ["gh"] + args
-            result = subprocess.run(
-                cmd, 
-                capture_output=True, 
-                text=True, 
-                check=True
-            )
-            return result.stdout.strip()
-        except subprocess.CalledProcessError as e:
-            error_msg = e.stderr.strip() if e.stderr else str(e)
-            raise RuntimeError(f"GitHub CLI command failed: {error_msg}")
+            getattr(self.index, method)(records)
+        except (sqlite3.Error, OSError):
+            pass
+    
+    def run_command(self, args: List[str]) -> str:
+        """Run a GitHub CLI command and return the output.
+        
+        Cacheable queries are answered from the response cache while fresh.
+        Stale entries are revalidated with a conditional request, and a 304
+        reuses the stored body without downloading it again.
+        """
+        with trace.span("request", "client", args=args) as span:
+            if self.cache is None or not is_cacheable(args):
+                body = self._execute(args).body
+                span.set(cache="bypass", bytes=len(body))
+                return body
+            
+            key = cache_key(args)
+            entry = self.cache.get(key)
+            if entry is not None and self.cache.is_fresh(entry):
+                span.set(cache="hit", bytes=len(entry["body"]))
+                return entry["body"]
+            
+            validators = self.cache.validators(entry) if entry is not None else {}
+            response = self._execute(args, validators)
+            if response.status == 304 and entry is not None:
+                self.cache.touch(key, entry)
+                span.set(cache="revalidated", bytes=len(entry["body"]))
+                return entry["body"]
+            
+            self.cache.put(key, response.body, response.headers)
+            span.set(cache="miss", bytes=len(response.body))
+            return response.body
+    
+    def _execute(self, args: List[str], headers: Optional[Dict[str, str]] = None) -> Response:
+        """Send a command to the backend and return its response.
+        
+        Requests are sent with their (possibly empty) conditional headers so
+        the backend returns response headers: validators for the cache and
+        rate-limit state for the scheduler. The request waits for quota in
+        its rate-limit bucket first, and a rate-limit rejection is retried
+        after the reset instead of failing.
+        """
+        if headers is None:
+            headers = {}
+        resource = self.scheduler.classify(args)
+        if resource is None:
+            with trace.span("backend.execute", "backend", backend=self.backend.name) as span:
+                response = self.backend.execute(args, headers)
+                span.set(status=response.status, bytes=len(response.body))
+            return response
+        
+        attempt = 0
+        while True:
+            waited = self.scheduler.acquire(resource)
+            with trace.span("backend.execute", "backend", backend=self.backend.name,
+                            resource=resource, attempt=attempt, rate_limit_wait=waited) as span:
+                try:
+                    response = self.backend.execute(args, headers)
+                except RuntimeError as e:
+                    if attempt >= MAX_RETRIES or not self.scheduler.is_rate_limit_error(e):
+                        raise
+                    span.set(rate_limited=True)
+                    retry = True
+                else:
+                    retry = False
+                    self.scheduler.update(resource, response.headers)
+                    span.set(status=response.status, bytes=len(response.body),
+                             rate_limit_remaining=self.scheduler.buckets[resource].remaining)
+            if retry:
+                self.scheduler.backoff(resource, attempt)
+                attempt += 1
+                continue
+            if response.status == 304:
+                # Conditional requests answered with 304 do not count
+                self.scheduler.refund(resource)
+            return response
     
     def search_repositories(
         self, 
@@ -47,11 +264,10 @@ class GitHubClient:
         sort: Optional[str] = "stars",
         language: Optional[str] = None,
         topic: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
+    ) -> RepoResultSet:
         """Search for repositories matching query."""
         # Build command arguments
-        args = ["search", "repos", query, "--json", 
-                "fullName,description,stargazersCount,forksCount,updatedAt,url,language"]
+        args = ["search", "repos", query, "--json", REPO_SEARCH_FIELDS]
         
         if limit:
             args.extend(["--limit", str(limit)])
@@ -64,46 +280,198 @@ class GitHubClient:
             
         # Execute command
         output = self.run_command(args)
-        return json.loads(output)
+        repos = RepoResultSet.from_dicts(trace.decode_json(output))
+        self._ingest("add_search_results", repos)
+        return repos
     
     def get_repository(self, repo_name: str) -> Dict[str, Any]:
         """Get detailed information about a repository."""
-        # Get the basic repository info
+        repo_data = self._get_repository_details(repo_name)
+        self._ingest("add_repository", repo_data)
+        return repo_data
+    
+    def _get_repository_details(self, repo_name: str) -> Dict[str, Any]:
+        """Get a repository's info and README, without indexing them."""
+        repo_data = self._get_repository_info(repo_name)
+        readme = self._get_readme(repo_name)
+        if readme is not None:
+            repo_data["readme"] = readme
+        return repo_data
+    
+    def _get_repository_info(self, repo_name: str) -> Dict[str, Any]:
+        """Get the basic repository info without the README."""
         args = ["repo", "view", repo_name, "--json", 
-                "nameWithOwner,description,stargazerCount,forkCount,updatedAt,url,primaryLanguage"]
+                "nameWithOwner,description,stargazerCount,forkCount,updatedAt,url,primaryLanguage,repositoryTopics"]
         
         # Execute command
         output = self.run_command(args)
-        repo_data = json.loads(output)
+        return trace.decode_json(output)
+    
+    def _get_readme(self, repo_name: str) -> Optional[Dict[str, str]]:
+        """Get the README of a repository as a {"text": ...} dict.
+        
+        Returns None when the repository has no README or it cannot be
+        fetched. When the README was seen before (in this repository, or
+        in a fork with the same README) only its blob SHA is looked up and
+        the stored text is reused; a first view downloads it directly and
+        takes the SHA from that response.
+        """
+        ref = self.readmes.ref(repo_name) if self.readmes is not None else None
+        if ref is not None:
+            oid, path = self._get_readme_oid(repo_name, ref[1])
+            text = self.readmes.get(oid) if oid else None
+            if text is not None:
+                self.readmes.set_ref(repo_name, oid, path)
+                return {"text": text} if text else None
         
-        # Get the README separately using gh api
         try:
-            readme_content = self.run_command([
-                "api", 
-                f"repos/{repo_name}/readme", 
-                "--jq", ".content"
-            ])
+            readme = trace.decode_json(self.run_command(["api", f"repos/{repo_name}/readme"]))
             import base64
-            if readme_content:
-                # GitHub API returns base64 encoded content
-                readme_text = base64.b64decode(readme_content).decode('utf-8')
-                repo_data["readme"] = {"text": readme_text}
+            # GitHub API returns base64 encoded content
+            readme_text = base64.b64decode(readme.get("content") or "").decode('utf-8')
         except Exception:
             # README might not exist
-            repo_data["readme"] = {"text": "No README available."}
-            
-        return repo_data
+            return None
+        if not readme_text:
+            return None
+        if self.readmes is not None and readme.get("sha"):
+            self.readmes.put(readme["sha"], readme_text)
+            self.readmes.set_ref(repo_name, readme["sha"], readme.get("path") or "README.md")
+        return {"text": readme_text}
+    
+    def _get_readme_oid(self, repo_name: str, known_path: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+        """Return the (blob SHA, path) of a repository's README at HEAD.
+        
+        Tries the path the README was last seen at, then the usual README
+        names. Returns (None, None) if none exists or the lookup fails.
+        """
+        paths = list(dict.fromkeys(([known_path] if known_path else []) + README_CANDIDATES))
+        owner, _, name = repo_name.partition("/")
+        try:
+            output = self.run_command([
+                "api", "graphql",
+                "-f", f"query={build_readme_oid_query(paths)}",
+                "-f", f"owner={owner}", "-f", f"name={name}",
+            ])
+            repository = (trace.decode_json(output).get("data") or {}).get("repository") or {}
+        except Exception:
+            return None, None
+        for j, path in enumerate(paths):
+            blob = repository.get(f"c{j}")
+            if blob and blob.get("oid"):
+                return blob["oid"], path
+        return None, None
+    
+    def get_repositories(self, repo_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get details and READMEs for many repositories in batched GraphQL queries.
+        
+        Returns a dict keyed by the requested names, each value shaped like the
+        result of get_repository. Repositories that cannot be found are omitted.
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        names = list(dict.fromkeys(repo_names))
+        for start in range(0, len(names), BATCH_SIZE):
+            results.update(self._get_repositories_chunk(names[start:start + BATCH_SIZE]))
+        self._ingest("add_repositories", list(results.values()))
+        return results
+    
+    def _get_repositories_chunk(self, repo_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch one chunk of repositories with a single aliased GraphQL query.
+        
+        With a blob store only README SHAs are requested at first; text is
+        then fetched in one more query for the blobs not already stored.
+        """
+        readme_fields = "oid" if self.readmes is not None else "oid text"
+        args = ["api", "graphql", "-f", f"query={build_batch_query(len(repo_names), readme_fields)}"]
+        for i, name in enumerate(repo_names):
+            owner, _, repo = name.partition("/")
+            args.extend(["-f", f"o{i}={owner}", "-f", f"n{i}={repo}"])
+        
+        try:
+            data = trace.decode_json(self.run_command(args)).get("data") or {}
+        except Exception:
+            # gh fails the whole query if any repository is missing; fall back
+            # to fetching this chunk one repository at a time (indexed by the
+            # caller along with the other chunks)
+            results = {}
+            for name in repo_names:
+                try:
+                    results[name] = self._get_repository_details(name)
+                except Exception:
+                    pass
+            return results
+        
+        results = {}
+        readme_blobs = {}
+        for i, name in enumerate(repo_names):
+            node = data.get(f"r{i}")
+            if not node:
+                continue
+            readme_text = None
+            for j, path in enumerate(README_CANDIDATES):
+                blob = node.pop(f"readme{j}", None)
+                if name not in readme_blobs and blob and blob.get("oid"):
+                    readme_blobs[name] = blob["oid"]
+                    readme_text = blob.get("text")
+                    if self.readmes is not None:
+                        self.readmes.set_ref(name, blob["oid"], path)
+            if readme_text:
+                # Shaped like get_repository: no "readme" key without one
+                node["readme"] = {"text": readme_text}
+            # Flatten to the shape `gh repo view --json repositoryTopics` prints
+            topics = (node.get("repositoryTopics") or {}).get("nodes") or []
+            node["repositoryTopics"] = [{"name": t["topic"]["name"]} for t in topics if t and t.get("topic")] or None
+            results[name] = node
+        
+        if self.readmes is not None:
+            texts = self._get_readme_texts(readme_blobs)
+            for name, oid in readme_blobs.items():
+                if texts.get(oid):
+                    results[name]["readme"] = {"text": texts[oid]}
+        return results
+    
+    def _get_readme_texts(self, readme_blobs: Dict[str, str]) -> Dict[str, str]:
+        """Return README text by SHA, downloading only the blobs not stored yet.
+        
+        `readme_blobs` maps repository names to README blob SHAs.
+        """
+        texts: Dict[str, str] = {}
+        missing: Dict[str, str] = {}
+        for name, oid in readme_blobs.items():
+            if oid in texts or oid in missing.values():
+                continue
+            text = self.readmes.get(oid)
+            if text is not None:
+                texts[oid] = text
+            else:
+                missing[name] = oid
+        if not missing:
+            return texts
+        
+        args = ["api", "graphql", "-f", f"query={build_blob_query(len(missing))}"]
+        for i, (name, oid) in enumerate(missing.items()):
+            owner, _, repo = name.partition("/")
+            args.extend(["-f", f"o{i}={owner}", "-f", f"n{i}={repo}", "-f", f"s{i}={oid}"])
+        try:
+            data = trace.decode_json(self.run_command(args)).get("data") or {}
+        except Exception:
+            return texts
+        for i, oid in enumerate(missing.values()):
+            blob = (data.get(f"b{i}") or {}).get("object") or {}
+            if blob.get("text") is not None:
+                texts[oid] = blob["text"]
+                self.readmes.put(oid, blob["text"])
+        return texts
     
     def search_code(
         self, 
         query: str, 
         limit: int = 20, 
         language: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
+    ) -> CodeResultSet:
         """Search for code matching query."""
         # Build command arguments
-        args = ["search", "code", query, "--json", 
-                "repository,path,textMatches"]
+        args = ["search", "code", query, "--json", CODE_SEARCH_FIELDS]
         
         if limit:
             args.extend(["--limit", str(limit)])
@@ -112,7 +480,124 @@ class GitHubClient:
             
         # Execute command
         output = self.run_command(args)
-        return json.loads(output)
+        return CodeResultSet.from_dicts(trace.decode_json(output))
+    
+    def iter_search_repositories(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        sort: Optional[str] = "stars",
+        language: Optional[str] = None,
+        topic: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Lazily yield repositories matching query, page by page.
+        
+        With no limit (or one above the API's 1000-result cap) the query is
+        split into disjoint created:/stars: range slices so every match can be
+        enumerated. Results are then ordered by slice rather than globally.
+        """
+        terms = [query] if query else []
+        if language:
+            terms.append(f"language:{language}")
+        if topic:
+            terms.append(f"topic:{topic}")
+        yield from self._iter_search(
+            "repositories",
+            " ".join(terms),
+            parsers.repo_search_item,
+            parsers.split_fields(REPO_SEARCH_FIELDS),
+            pagination.repository_dimensions(),
+            limit=limit,
+            sort=sort
+        )
+    
+    def iter_search_code(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        language: Optional[str] = None,
+        fields: str = CODE_SEARCH_FIELDS
+    ) -> Iterator[Dict[str, Any]]:
+        """Lazily yield code matches for query, page by page.
+        
+        Past the 1000-result cap the query is split into size: range slices.
+        `fields` are gh search --json field names of the REST items.
+        """
+        terms = [query] if query else []
+        if language:
+            terms.append(f"language:{language}")
+        yield from self._iter_search(
+            "code",
+            " ".join(terms),
+            parsers.code_search_item,
+            parsers.split_fields(fields),
+            pagination.code_dimensions(),
+            limit=limit
+        )
+    
+    def _search_page(
+        self, 
+        kind: str, 
+        query: str, 
+        page: int, 
+        sort: Optional[str] = None,
+        per_page: int = pagination.PAGE_SIZE
+    ) -> Dict[str, Any]:
+        """Fetch one page of REST search results."""
+        params = {"q": query, "per_page": per_page, "page": page}
+        if sort:
+            params["sort"] = sort
+        args = ["api", f"search/{kind}?{urlencode(params)}"]
+        if kind == "code":
+            args.extend(["-H", "Accept: application/vnd.github.text-match+json"])
+        return trace.decode_json(self.run_command(args))
+    
+    def _iter_search(
+        self,
+        kind: str,
+        query: str,
+        convert: Callable[[Dict[str, Any]], Dict[str, Any]],
+        fields: List[str],
+        dims: List[pagination.Dimension],
+        limit: Optional[int] = None,
+        sort: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Page through a search, slicing it when it overflows the result cap."""
+        exhaustive = limit is None or limit > pagination.SEARCH_CAP
+        dims = pagination.usable_dimensions(query, dims)
+        remaining = limit
+        
+        # Depth-first over slices, left half first, so only the current path
+        # of pending slices is held in memory
+        stack: List[pagination.Slice] = [{}]
+        while stack:
+            constraints = stack.pop()
+            sliced = pagination.slice_query(query, dims, constraints)
+            # Fixed for the whole slice, since page numbers count in its units
+            per_page = pagination.PAGE_SIZE if remaining is None else min(remaining, pagination.PAGE_SIZE)
+            data = self._search_page(kind, sliced, 1, sort, per_page)
+            total = data.get("total_count", 0)
+            
+            if exhaustive and total > pagination.SEARCH_CAP:
+                halves = pagination.split_slice(constraints, dims)
+                if halves:
+                    stack.extend(reversed(halves))
+                    continue
+            
+            reachable = min(total, pagination.SEARCH_CAP)
+            page = 1
+            while True:
+                items = data.get("items", [])
+                for item in items:
+                    yield parsers.select_fields(convert(item), fields)
+                    if remaining is not None:
+                        remaining -= 1
+                        if remaining <= 0:
+                            return
+                if len(items) < per_page or page * per_page >= reachable:
+                    break
+                page += 1
+                data = self._search_page(kind, sliced, page, sort, per_page)
     
     def create_gist(
         self, 
@@ -138,14 +623,24 @@ class GitHubClient:
         """Open a repository in the web browser."""
         self.run_command(["repo", "view", repo_name, "--web"])
         
-    def clone_repository(self, repo_name: str, directory: Optional[str] = None) -> str:
-        """Clone a repository."""
-        args = ["repo", "clone", repo_name]
+    def clone_repository(self,
+                         repo_name: str,
+                         directory: Optional[str] = None,
+                         options: Optional[CloneOptions] = None) -> str:
+        """Clone a repository and return the directory it was cloned into.
         
-        if directory:
-            args.append(directory)
-            
-        return self.run_command(args)
+        `options` can make the clone shallow, partial or sparse.
+        """
+        directory = directory or repo_name.partition("/")[2] or repo_name
+        args = ["repo", "clone", repo_name, directory]
+        flags = git_clone_flags(options) if options else []
+        if flags:
+            args += ["--"] + flags
+        
+        self.run_command(args)
+        if options and options.sparse:
+            sparse_checkout(directory, options.sparse)
+        return directory
         
     def get_repository_files(self, repo_name: str, path: str = "") -> List[Dict[str, Any]]:
         """Get files and directories in a repository path."""
@@ -160,7 +655,31 @@ class GitHubClient:
                 "--jq", "."
             ])
             
-            return json.loads(output)
+            return trace.decode_json(output)
         except Exception as e:
             # If there's an error, return an empty list
-            return []
\ No newline at end of file
+            return []
+    
+    def get_repository_tree(self, repo_name: str, ref: str = "HEAD") -> RepoTree:
+        """Get the whole file tree of a repository in one request.
+        
+        If GitHub truncates the recursive listing, the tree holds only the
+        root level and deeper directories are listed on demand with
+        load_tree_directory.
+        """
+        output = self.run_command(["api", f"repos/{repo_name}/git/trees/{quote(ref, safe='')}?recursive=1"])
+        return RepoTree.from_api(trace.decode_json(output))
+    
+    def get_tree_listing(self, repo_name: str, sha: str) -> Dict[str, Any]:
+        """Get the non-recursive git/trees listing of one directory by its tree SHA."""
+        output = self.run_command(["api", f"repos/{repo_name}/git/trees/{sha}"])
+        return trace.decode_json(output)
+    
+    def load_tree_directory(self, repo_name: str, tree: RepoTree, path: str) -> None:
+        """List one directory of a truncated tree and add it to the tree."""
+        if tree.is_loaded(path):
+            return
+        sha = tree.dir_sha(path)
+        if sha is None:
+            raise KeyError(f"Unknown directory: {path}")
+        tree.set_listing(path, self.get_tree_listing(repo_name, sha))
\ No newline at end of file
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Cloning many repositories at once
+
+Repositories are cloned with `gh repo clone` on a bounded worker pool, each
+into DEST/owner/name. Clones can be shallow (--depth), partial (a git
+--filter such as blob:none, which fetches file contents only as they are
+checked out) and sparse (only paths matching the given patterns are
+checked out). Repositories whose directory already exists are skipped, so
+an interrupted run can simply be repeated.
+"""
+
+import os
+import shutil
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+# Clones running at once; each is a gh process plus git's own transfer
+DEFAULT_WORKERS = 4
+
+# Characters that make a sparse-checkout pattern a gitignore-style pattern
+# rather than a plain directory (which cone mode handles much faster)
+_GLOB_CHARS = set("*?[!")
+
+class CloneOptions(NamedTuple):
+    """How to clone: history depth, git object filter and sparse patterns."""
+    depth: Optional[int] = None
+    filter: Optional[str] = None
+    sparse: Sequence[str] = ()
+
+def git_clone_flags(options: CloneOptions) -> List[str]:
+    """git clone flags for the options (passed through gh after "--")."""
+    flags: List[str] = []
+    if options.depth:
+        flags.append(f"--depth={options.depth}")
+    if options.filter:
+        flags.append(f"--filter={options.filter}")
+    if options.sparse:
+        # Checked out once the sparse patterns are in place
+        flags.append("--no-checkout")
+    return flags
+
+def _git(directory: str, *args: str) -> None:
+    try:
+        subprocess.run(["git", "-C", directory, *args], capture_output=True, text=True, check=True)
+    except subprocess.CalledProcessError as e:
+        error_msg = e.stderr.strip() if e.stderr else str(e)
+        raise RuntimeError(f"git {args[0]} failed: {error_msg}")
+
+def sparse_checkout(directory: str, patterns: Sequence[str]) -> None:
+    """Check out only `patterns` in a clone made with --no-checkout.
+
+    Plain directory names use cone mode; any glob switches to gitignore-
+    style patterns.
+    """
+    cone = not any(_GLOB_CHARS & set(pattern) for pattern in patterns)
+    _git(directory, "sparse-checkout", "set", "--cone" if cone else "--no-cone", *patterns)
+    _git(directory, "checkout")
+
+def clone_directory(dest: str, repo_name: str) -> str:
+    """Where clone_repositories puts a repository: DEST/owner/name."""
+    owner, _, name = repo_name.partition("/")
+    return os.path.join(dest, owner, name)
+
+def clone_repositories(client: Any,
+                       repo_names: Iterable[str],
+                       dest: str = ".",
+                       options: Optional[CloneOptions] = None,
+                       workers: int = DEFAULT_WORKERS,
+                       on_start: Optional[Callable[[str], None]] = None,
+                       on_done: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+    """Clone repositories concurrently; return one result per repository.
+
+    Each result has "repo", "path", "status" ("cloned", "exists" or
+    "failed"), "seconds" and, on failure, "error". A failed clone's
+    partial directory is removed. `on_start` is called from a worker as a
+    clone begins, and `on_done` from the calling thread as each ends.
+    """
+    options = options or CloneOptions()
+    names = list(dict.fromkeys(repo_names))
+
+    def clone(repo_name: str) -> Dict[str, Any]:
+        path = clone_directory(dest, repo_name)
+        result: Dict[str, Any] = {"repo": repo_name, "path": path}
+        started = time.monotonic()
+        if os.path.exists(path):
+            result["status"] = "exists"
+        else:
+            if on_start:
+                on_start(repo_name)
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            try:
+                client.clone_repository(repo_name, path, options)
+                result["status"] = "cloned"
+            except Exception as e:
+                shutil.rmtree(path, ignore_errors=True)
+                try:
+                    # The owner directory, unless other clones are in it
+                    os.rmdir(os.path.dirname(path))
+                except OSError:
+                    pass
+                result["status"] = "failed"
+                result["error"] = str(e).strip() or type(e).__name__
+        result["seconds"] = round(time.monotonic() - started, 2)
+        return result
+
+    results: Dict[str, Dict[str, Any]] = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="ghx-clone") as pool:
+        futures = [pool.submit(clone, name) for name in names]
+        for future in as_completed(futures):
+            result = future.result()
+            results[result["repo"]] = result
+            if on_done:
+                on_done(result)
+    return [results[name] for name in names]
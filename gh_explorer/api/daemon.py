@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Resident ghx daemon serving GitHubClient queries over a Unix socket
+
+`ghx daemon` keeps one GitHubClient (with its gh check, response cache,
+README store and connection pool) alive and answers queries sent as JSON
+lines over a Unix domain socket. CLI commands reach it through
+DaemonClient, which forwards the query methods and runs everything else,
+or everything when no daemon is listening, in process.
+
+Protocol: one request line {"method": ..., "params": {...}} per
+connection. Plain methods answer with one {"result": ...} or
+{"error": ...} line; iterator methods stream {"item": ...} lines ended by
+{"done": true} (or an error line).
+"""
+
+import json
+import os
+import socket
+import stat
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from gh_explorer.api.models import CodeResultSet, RepoResultSet
+from gh_explorer.utils import trace
+from gh_explorer.utils.paths import APP_NAME, cache_dir
+
+SOCKET_NAME = "daemon.sock"
+
+# How long a command waits for the daemon to accept before running locally
+CONNECT_TIMEOUT = 0.25
+
+# GitHubClient methods the daemon answers, and how their results are rebuilt
+_METHODS: Dict[str, Callable[[Any], Any]] = {
+    "search_repositories": RepoResultSet.from_dicts,
+    "search_code": CodeResultSet.from_dicts,
+    "get_repository": lambda result: result,
+    "get_repositories": lambda result: result,
+    "get_repository_files": lambda result: result,
+}
+_ITER_METHODS = ("iter_search_repositories", "iter_search_code")
+
+def socket_path() -> Path:
+    """Return the daemon socket: $GHX_DAEMON_SOCKET, else in the runtime dir.
+
+    $XDG_RUNTIME_DIR is per-user and private; without it the cache
+    directory is used.
+    """
+    if os.environ.get("GHX_DAEMON_SOCKET"):
+        return Path(os.environ["GHX_DAEMON_SOCKET"])
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        directory = Path(runtime, APP_NAME)
+        directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        return directory / SOCKET_NAME
+    return cache_dir() / SOCKET_NAME
+
+def _send(sock: socket.socket, message: Dict[str, Any]) -> None:
+    from gh_explorer.utils.output import json_default
+    sock.sendall(json.dumps(message, separators=(",", ":"), default=json_default).encode("utf-8") + b"\n")
+
+def connect(path: Optional[Path] = None, timeout: float = CONNECT_TIMEOUT) -> Optional[socket.socket]:
+    """Connect to the daemon; return None if none is listening."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(path or socket_path()))
+    except OSError:
+        sock.close()
+        return None
+    # Queries themselves may take as long as GitHub does
+    sock.settimeout(None)
+    return sock
+
+class DaemonUnavailable(Exception):
+    """The daemon could not be reached, or went away mid-request."""
+
+class DaemonClient:
+    """A GitHubClient stand-in that forwards queries to the daemon.
+
+    Public calls the daemon does not serve, and any call made while no
+    daemon is reachable, go to a local GitHubClient created on first need,
+    so commands behave the same either way. Private GitHubClient methods
+    are not available: reaching for them would bypass the daemon.
+    """
+
+    def __init__(self, make_local: Callable[[], Any], path: Optional[Path] = None):
+        """Initialize with a factory for the fallback in-process client."""
+        self.path = path or socket_path()
+        self._make_local = make_local
+        self._local = None
+        self._local_lock = threading.Lock()
+        self.available = True
+
+    @property
+    def local(self) -> Any:
+        """The in-process client, created once even when threads race for it."""
+        if self._local is None:
+            with self._local_lock:
+                if self._local is None:
+                    self._local = self._make_local()
+        return self._local
+
+    def close(self) -> None:
+        """Close the local client, if one was ever needed."""
+        if self._local is not None:
+            self._local.close()
+
+    def _open(self, method: str, params: Dict[str, Any]):
+        if not self.available:
+            raise DaemonUnavailable()
+        sock = connect(self.path)
+        if sock is None:
+            # Stay local for the rest of this process
+            self.available = False
+            raise DaemonUnavailable()
+        try:
+            _send(sock, {"method": method, "params": params})
+        except OSError:
+            sock.close()
+            raise DaemonUnavailable()
+        return sock, sock.makefile("r", encoding="utf-8")
+
+    @staticmethod
+    def _read(reader) -> Dict[str, Any]:
+        line = reader.readline()
+        if not line:
+            raise DaemonUnavailable()
+        message = trace.decode_json(line)
+        if "error" in message:
+            raise RuntimeError(message["error"])
+        return message
+
+    def call(self, method: str, **params: Any) -> Any:
+        """Run a query method on the daemon, or locally if it is unreachable."""
+        with trace.span("daemon.call", "daemon", method=method) as span:
+            result = self._call(method, params)
+            span.set(daemon=self.available)
+        return result
+
+    def _call(self, method: str, params: Dict[str, Any]) -> Any:
+        try:
+            sock, reader = self._open(method, params)
+        except DaemonUnavailable:
+            return getattr(self.local, method)(**params)
+        try:
+            result = self._read(reader)["result"]
+        except (DaemonUnavailable, OSError):
+            # Nothing was returned yet, so running it here is still safe
+            return getattr(self.local, method)(**params)
+        finally:
+            reader.close()
+            sock.close()
+        return _METHODS[method](result)
+
+    def stream(self, method: str, **params: Any) -> Iterator[Dict[str, Any]]:
+        """Stream an iterator method's items from the daemon, or locally."""
+        try:
+            sock, reader = self._open(method, params)
+        except DaemonUnavailable:
+            yield from getattr(self.local, method)(**params)
+            return
+        try:
+            while True:
+                try:
+                    with trace.span("daemon.read", "daemon", method=method):
+                        message = self._read(reader)
+                except (DaemonUnavailable, OSError):
+                    # Items were already handed out, so this cannot be rerun
+                    raise RuntimeError("The ghx daemon stopped while streaming results")
+                if message.get("done"):
+                    return
+                yield message["item"]
+        finally:
+            reader.close()
+            sock.close()
+
+    def __getattr__(self, name: str) -> Any:
+        if name in _METHODS:
+            return lambda *args, **kwargs: self.call(name, **_named(name, args, kwargs))
+        if name in _ITER_METHODS:
+            return lambda *args, **kwargs: self.stream(name, **_named(name, args, kwargs))
+        if name.startswith("_"):
+            raise AttributeError(f"DaemonClient does not forward private method {name!r}")
+        return getattr(self.local, name)
+
+# Positional parameter names of the forwarded methods, so positional calls
+# can be sent as JSON objects
+_POSITIONAL = {
+    "search_repositories": ("query", "limit", "sort", "language", "topic"),
+    "search_code": ("query", "limit", "language"),
+    "get_repository": ("repo_name",),
+    "get_repositories": ("repo_names",),
+    "get_repository_files": ("repo_name", "path"),
+    "iter_search_repositories": ("query", "limit", "sort", "language", "topic"),
+    "iter_search_code": ("query", "limit", "language", "fields"),
+}
+
+def _named(method: str, args: tuple, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    params = dict(zip(_POSITIONAL[method], args))
+    params.update(kwargs)
+    return params
+
+def daemon_status(path: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """Return the running daemon's status, or None if none answers."""
+    sock = connect(path)
+    if sock is None:
+        return None
+    with sock, sock.makefile("r", encoding="utf-8") as reader:
+        try:
+            _send(sock, {"method": "status", "params": {}})
+            line = reader.readline()
+        except OSError:
+            return None
+    return json.loads(line).get("result") if line else None
+
+def stop_daemon(path: Optional[Path] = None) -> bool:
+    """Ask a running daemon to exit; return False if none answers."""
+    sock = connect(path)
+    if sock is None:
+        return False
+    with sock, sock.makefile("r", encoding="utf-8") as reader:
+        try:
+            _send(sock, {"method": "shutdown", "params": {}})
+            reader.readline()
+        except OSError:
+            pass
+    return True
+
+def serve(client: Any,
+          path: Optional[Path] = None,
+          log: Callable[[str], None] = lambda message: print(message, file=sys.stderr)) -> None:
+    """Answer queries with `client` on the socket until asked to shut down."""
+    import socketserver
+    import time
+
+    path = Path(path or socket_path())
+    if path.exists():
+        if daemon_status(path) is not None:
+            raise RuntimeError(f"A ghx daemon is already listening on {path}")
+        if not stat.S_ISSOCK(path.stat().st_mode):
+            raise RuntimeError(f"{path} exists and is not a socket")
+        # Left behind by a daemon that did not exit cleanly
+        path.unlink()
+
+    started = time.time()
+    counts = {"requests": 0, "errors": 0}
+    counts_lock = threading.Lock()
+
+    def count(key: str) -> None:
+        with counts_lock:
+            counts[key] += 1
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            line = self.rfile.readline()
+            if not line:
+                return
+            try:
+                request = json.loads(line)
+                method = request["method"]
+                params = request.get("params") or {}
+            except (ValueError, KeyError, TypeError):
+                _send(self.connection, {"error": "malformed request"})
+                return
+            count("requests")
+            try:
+                if method == "status":
+                    _send(self.connection, {"result": {
+                        "pid": os.getpid(), "socket": str(path), "uptime": time.time() - started, **counts,
+                    }})
+                elif method == "shutdown":
+                    _send(self.connection, {"result": True})
+                    threading.Thread(target=server.shutdown, daemon=True).start()
+                elif method in _METHODS:
+                    _send(self.connection, {"result": getattr(client, method)(**params)})
+                elif method in _ITER_METHODS:
+                    for item in getattr(client, method)(**params):
+                        _send(self.connection, {"item": item})
+                    _send(self.connection, {"done": True})
+                else:
+                    _send(self.connection, {"error": f"unknown method {method!r}"})
+            except (BrokenPipeError, ConnectionResetError):
+                # The command went away (e.g. piped into `head`)
+                pass
+            except Exception as e:
+                count("errors")
+                log(f"{method} failed: {e}")
+                try:
+                    _send(self.connection, {"error": str(e) or type(e).__name__})
+                except OSError:
+                    pass
+
+    class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    # The socket grants the user's GitHub access, so only they may connect
+    old_umask = os.umask(0o177)
+    try:
+        server = Server(str(path), Handler)
+    finally:
+        os.umask(old_umask)
+    log(f"ghx daemon listening on {path} (pid {os.getpid()})")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        try:
+            path.unlink()
+        except OSError:
+            pass
+        log("ghx daemon stopped")
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Incremental grouping of code search hits by repository
+
+Hits are folded in one at a time as search pages arrive, so a grouped view
+can be redrawn after every page. The same (repository, path) seen twice
+(overlapping query slices) is dropped, and hits whose content is identical
+to an earlier hit (vendored or forked copies of the same file) are collapsed
+onto the first one instead of being listed again.
+"""
+
+import hashlib
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# A hit's location: (repository, path)
+Location = Tuple[str, str]
+
+_WHITESPACE = re.compile(r"\s+")
+
+def first_fragment(hit: Dict[str, Any]) -> str:
+    """Return the first text-match fragment of a hit, or ""."""
+    matches = hit.get("textMatches") or []
+    return (matches[0].get("fragment") or "") if matches else ""
+
+def content_key(hit: Dict[str, Any]) -> Optional[str]:
+    """Return a key shared by hits with identical content, or None.
+
+    The blob SHA identifies identical files exactly; without one, the
+    fragments are compared with whitespace collapsed, since re-indented
+    vendored copies are still copies.
+    """
+    if hit.get("sha"):
+        return "sha:" + hit["sha"]
+    fragments = " ".join(
+        _WHITESPACE.sub(" ", match.get("fragment") or "").strip()
+        for match in hit.get("textMatches") or []
+    ).strip()
+    if not fragments:
+        return None
+    return "text:" + hashlib.blake2b(fragments.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+class CodeHit:
+    """One matching file, plus the other places its content was seen."""
+
+    __slots__ = ("repo", "path", "fragment", "copies", "duplicate_of")
+
+    def __init__(self, repo: str, path: str, fragment: str):
+        self.repo = repo
+        self.path = path
+        self.fragment = fragment
+        # Locations of later hits with the same content
+        self.copies: List[Location] = []
+        # Set when this hit is itself a copy of an earlier hit
+        self.duplicate_of: Optional[Location] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        record: Dict[str, Any] = {"path": self.path, "fragment": self.fragment}
+        if self.copies:
+            record["copies"] = [{"repository": repo, "path": path} for repo, path in self.copies]
+        if self.duplicate_of:
+            record["duplicateOf"] = {"repository": self.duplicate_of[0], "path": self.duplicate_of[1]}
+        return record
+
+class RepoGroup:
+    """The hits in one repository, in arrival order."""
+
+    __slots__ = ("repo", "hits", "duplicates")
+
+    def __init__(self, repo: str):
+        self.repo = repo
+        self.hits: List[CodeHit] = []
+        # How many of `hits` are copies of content shown elsewhere
+        self.duplicates = 0
+
+    @property
+    def count(self) -> int:
+        return len(self.hits)
+
+    @property
+    def unique(self) -> int:
+        return len(self.hits) - self.duplicates
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "repository": self.repo,
+            "hits": self.count,
+            "duplicates": self.duplicates,
+            "files": [hit.to_dict() for hit in self.hits],
+        }
+
+class CodeHitGrouper:
+    """Folds code search hits into per-repository groups as they arrive."""
+
+    def __init__(self):
+        """Initialize with no groups."""
+        # Insertion-ordered, so a streamed view keeps groups where they appeared
+        self.groups: Dict[str, RepoGroup] = {}
+        self._seen: Dict[Location, CodeHit] = {}
+        self._by_content: Dict[str, CodeHit] = {}
+        self.total = 0
+        self.duplicates = 0
+        self.repeated = 0
+
+    def add(self, hit: Dict[str, Any]) -> Optional[CodeHit]:
+        """Add one hit; return it, or None if its location was already seen."""
+        repo = (hit.get("repository") or {}).get("nameWithOwner") or "Unknown"
+        path = hit.get("path") or "Unknown"
+        location = (repo, path)
+        if location in self._seen:
+            self.repeated += 1
+            return None
+
+        entry = CodeHit(repo, path, first_fragment(hit))
+        self._seen[location] = entry
+        group = self.groups.get(repo)
+        if group is None:
+            group = self.groups[repo] = RepoGroup(repo)
+        group.hits.append(entry)
+        self.total += 1
+
+        key = content_key(hit)
+        if key is not None:
+            original = self._by_content.get(key)
+            if original is None:
+                self._by_content[key] = entry
+            else:
+                original.copies.append(location)
+                entry.duplicate_of = (original.repo, original.path)
+                group.duplicates += 1
+                self.duplicates += 1
+        return entry
+
+    def extend(self, hits: Iterable[Dict[str, Any]]) -> int:
+        """Add several hits; return how many were new."""
+        return sum(1 for hit in hits if self.add(hit) is not None)
+
+    def __len__(self) -> int:
+        return len(self.groups)
+
+    def ordered(self, by_count: bool = False) -> List[RepoGroup]:
+        """Return the groups in arrival order, or most distinct hits first."""
+        groups = list(self.groups.values())
+        if by_count:
+            # sorted() is stable, so ties keep their arrival order
+            groups.sort(key=lambda group: (-group.unique, -group.count))
+        return groups
+
+    def to_dicts(self, by_count: bool = True) -> List[Dict[str, Any]]:
+        return [group.to_dict() for group in self.ordered(by_count)]
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Compact columnar containers for search results
+
+A list of dicts costs a hash table per row. Result sets store one column per
+field instead: integers in arrays, text packed into one buffer per column,
+repeated strings (languages, dates) interned, and objects shared between
+rows (the repository of a code hit) stored once. Rows are materialized as
+lightweight records on access and read like the dicts gh returns, and
+`to_dicts()` converts back at the JSON boundary.
+"""
+
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+def _intern(value: Any) -> Any:
+    """Intern strings so equal values share one object."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+class ResultRecord:
+    """One row of a result set, readable like the dict gh returns."""
+
+    __slots__ = ("_set", "_index")
+
+    def __init__(self, result_set: "ResultSet", index: int):
+        self._set = result_set
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._set._columns:
+            raise KeyError(key)
+        return self._set._columns[key][self._index]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a field, or `default` if the result set has no such field."""
+        column = self._set._columns.get(key)
+        return default if column is None else column[self._index]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._set._columns
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._set.FIELDS)
+
+    def keys(self) -> Tuple[str, ...]:
+        return self._set.FIELDS
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(field, self[field]) for field in self._set.FIELDS]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the row as a plain dict."""
+        return dict(self.items())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ResultRecord):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __repr__(self) -> str:
+        return f"{type(self._set).__name__}Record({self.to_dict()!r})"
+
+class TextColumn:
+    """Strings packed into one UTF-8 buffer with an offsets array.
+
+    A str object costs about 50 bytes before its first character; packing
+    saves that per row. Values are decoded on access. None is allowed.
+    """
+
+    __slots__ = ("_data", "_offsets", "_missing")
+
+    def __init__(self, values: Iterable[Optional[str]] = ()):
+        """Pack `values` into a new column."""
+        chunks: List[bytes] = []
+        offsets = array("q", [0])
+        missing = bytearray()
+        position = 0
+        for value in values:
+            if value is None:
+                missing.append(1)
+            else:
+                chunk = value.encode("utf-8")
+                chunks.append(chunk)
+                position += len(chunk)
+                missing.append(0)
+            offsets.append(position)
+        self._data = b"".join(chunks)
+        self._offsets = offsets
+        # Only kept when some value is actually missing
+        self._missing = missing if any(missing) else None
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def _value(self, index: int) -> Optional[str]:
+        if self._missing is not None and self._missing[index]:
+            return None
+        return self._data[self._offsets[index]:self._offsets[index + 1]].decode("utf-8")
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return TextColumn(self.values(*index.indices(len(self))))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("column index out of range")
+        return self._value(index)
+
+    def values(self, start: int = 0, stop: Optional[int] = None, step: int = 1) -> Iterator[Optional[str]]:
+        """Yield the values from `start` to `stop`."""
+        stop = len(self) if stop is None else stop
+        for index in range(start, stop, step):
+            yield self._value(index)
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        return self.values()
+
+class ResultSet:
+    """Column-oriented rows with a fixed set of fields.
+
+    Subclasses declare FIELDS (in output order) and how each one is stored:
+    INT_FIELDS in integer arrays, TEXT_FIELDS in packed text columns,
+    INTERNED_FIELDS (few distinct values) as interned strings, and
+    SHARED_FIELDS as objects shared between rows, keyed by one of their own
+    fields. Anything else is kept as a plain list.
+    """
+
+    FIELDS: Tuple[str, ...] = ()
+    INT_FIELDS: Tuple[str, ...] = ()
+    TEXT_FIELDS: Tuple[str, ...] = ()
+    INTERNED_FIELDS: Tuple[str, ...] = ()
+    SHARED_FIELDS: Dict[str, str] = {}
+
+    __slots__ = ("_columns",)
+
+    def __init__(self, columns: Optional[Dict[str, Sequence[Any]]] = None):
+        """Initialize from equally long columns, one per field."""
+        if columns is None:
+            columns = {field: self._build_column(field, []) for field in self.FIELDS}
+        self._columns = columns
+
+    @classmethod
+    def _build_column(cls, field: str, values: List[Any]) -> Sequence[Any]:
+        """Store one field's values in the representation declared for it."""
+        if field in cls.INT_FIELDS:
+            return array("q", [int(value or 0) for value in values])
+        if field in cls.TEXT_FIELDS:
+            return TextColumn(values)
+        if field in cls.INTERNED_FIELDS:
+            return [_intern(value) for value in values]
+        if field in cls.SHARED_FIELDS:
+            key_field = cls.SHARED_FIELDS[field]
+            seen: Dict[Any, Any] = {}
+            shared = []
+            for value in values:
+                key = value.get(key_field) if isinstance(value, dict) else None
+                shared.append(value if key is None else seen.setdefault(key, value))
+            return shared
+        return list(values)
+
+    @classmethod
+    def from_dicts(cls, rows: Iterable[Dict[str, Any]]) -> "ResultSet":
+        """Build a result set from dicts (e.g. decoded gh --json output)."""
+        values: Dict[str, List[Any]] = {field: [] for field in cls.FIELDS}
+        appenders = [(field, values[field].append) for field in cls.FIELDS]
+        for row in rows:
+            for field, append in appenders:
+                append(row.get(field))
+        return cls({field: cls._build_column(field, values.pop(field)) for field in cls.FIELDS})
+
+    def column(self, field: str) -> Sequence[Any]:
+        """Return the column for a field. Treat it as read-only."""
+        return self._columns[field]
+
+    def __len__(self) -> int:
+        return len(self._columns[self.FIELDS[0]])
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __iter__(self) -> Iterator[ResultRecord]:
+        for index in range(len(self)):
+            yield ResultRecord(self, index)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return type(self)({field: column[index] for field, column in self._columns.items()})
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("result set index out of range")
+        return ResultRecord(self, index)
+
+    def take(self, indexes: Sequence[int]) -> "ResultSet":
+        """Return a new result set with the rows at `indexes`, in that order."""
+        return type(self)({
+            field: self._build_column(field, [column[i] for i in indexes])
+            for field, column in self._columns.items()
+        })
+
+    def sort_by(self, field: str, reverse: bool = False) -> "ResultSet":
+        """Return a copy sorted on one column; missing values sort last."""
+        column = list(self._columns[field])
+        present = [i for i, value in enumerate(column) if value is not None]
+        missing = [i for i, value in enumerate(column) if value is None]
+        present.sort(key=column.__getitem__, reverse=reverse)
+        return self.take(present + missing)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Convert to a list of plain dicts, e.g. for JSON output."""
+        fields = self.FIELDS
+        columns = [self._columns[field] for field in fields]
+        return [dict(zip(fields, values)) for values in zip(*columns)]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ResultSet):
+            other = other.to_dicts()
+        return self.to_dicts() == other
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} rows)"
+
+class RepoResultSet(ResultSet):
+    """Repository search results (the REPO_SEARCH_FIELDS of gh search repos)."""
+
+    FIELDS = ("fullName", "description", "stargazersCount", "forksCount",
+              "updatedAt", "url", "language")
+    INT_FIELDS = ("stargazersCount", "forksCount")
+    TEXT_FIELDS = ("fullName", "description", "url")
+    INTERNED_FIELDS = ("updatedAt", "language")
+
+    __slots__ = ()
+
+class CodeResultSet(ResultSet):
+    """Code search results (the CODE_SEARCH_FIELDS of gh search code)."""
+
+    FIELDS = ("repository", "path", "textMatches")
+    TEXT_FIELDS = ("path",)
+    # Hits in the same repository share one repository object
+    SHARED_FIELDS = {"repository": "nameWithOwner"}
+
+    __slots__ = ()
+
+def iter_columns(rows: Union[ResultSet, Sequence[Dict[str, Any]]],
+                 fields: Sequence[str],
+                 start: int = 0,
+                 stop: Optional[int] = None) -> Iterator[Tuple[Any, ...]]:
+    """Yield tuples of `fields` for rows `start` to `stop`.
+
+    Reads a result set's columns directly, and also accepts a plain list of
+    dicts so callers need not care which one they were given. Missing
+    values are None.
+    """
+    stop = len(rows) if stop is None else min(stop, len(rows))
+    if isinstance(rows, ResultSet):
+        columns = [rows._columns.get(field) for field in fields]
+        if all(column is not None for column in columns):
+            return zip(*[
+                column.values(start, stop) if isinstance(column, TextColumn) else column[start:stop]
+                for column in columns
+            ])
+    return (tuple(row.get(field) for field in fields) for row in rows[start:stop])
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Query slicing for exhaustive enumeration past the search API's result cap
+
+The search API never returns more than 1000 results for one query. To
+enumerate more, a query is narrowed with range qualifiers (created:, stars:,
+size:) into disjoint slices that each fit under the cap.
+"""
+
+from datetime import date
+from typing import Dict, List, Optional, NamedTuple, Tuple
+
+# Hard cap on results the search API returns for any single query
+SEARCH_CAP = 1000
+
+# Results per page; the API maximum
+PAGE_SIZE = 100
+
+class Dimension(NamedTuple):
+    """A numeric search qualifier that a query can be split on."""
+    qualifier: str
+    low: int
+    high: int
+    is_date: bool = False
+
+# GitHub launched in 2008; nothing was created before this
+_EPOCH = date(2007, 10, 1).toordinal()
+
+def repository_dimensions() -> List[Dimension]:
+    """Dimensions used to slice repository searches, tried in order."""
+    return [
+        Dimension("created", _EPOCH, date.today().toordinal(), is_date=True),
+        Dimension("stars", 0, 10_000_000),
+    ]
+
+def code_dimensions() -> List[Dimension]:
+    """Dimensions used to slice code searches (file size in bytes)."""
+    return [Dimension("size", 0, 1_000_000)]
+
+Slice = Dict[str, Tuple[int, int]]
+
+def _format_value(dim: Dimension, value: int) -> str:
+    """Format a bound for use in a qualifier."""
+    return date.fromordinal(value).isoformat() if dim.is_date else str(value)
+
+def slice_query(query: str, dims: List[Dimension], constraints: Slice) -> str:
+    """Append the range qualifiers of a slice to a query."""
+    terms = [query] if query else []
+    for dim in dims:
+        if dim.qualifier in constraints:
+            low, high = constraints[dim.qualifier]
+            terms.append(f"{dim.qualifier}:{_format_value(dim, low)}..{_format_value(dim, high)}")
+    return " ".join(terms)
+
+def usable_dimensions(query: str, dims: List[Dimension]) -> List[Dimension]:
+    """Drop dimensions the query already constrains itself."""
+    return [dim for dim in dims if f"{dim.qualifier}:" not in query]
+
+def split_slice(constraints: Slice, dims: List[Dimension]) -> Optional[List[Slice]]:
+    """Split a slice in two along the first dimension that can still be halved.
+
+    Returns None when every dimension is down to a single value.
+    """
+    for dim in dims:
+        low, high = constraints.get(dim.qualifier, (dim.low, dim.high))
+        if low < high:
+            mid = (low + high) // 2
+            left = dict(constraints)
+            right = dict(constraints)
+            left[dim.qualifier] = (low, mid)
+            right[dim.qualifier] = (mid + 1, high)
+            return [left, right]
+    return None
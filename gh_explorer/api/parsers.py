@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Conversion of raw GitHub REST payloads into the shapes gh prints with --json
+"""
+
+from typing import Dict, List, Optional, Any, Iterable
+
+def _language(name: Optional[str]) -> Optional[Dict[str, str]]:
+    """Wrap a language name the way gh's primaryLanguage field does."""
+    return {"name": name} if name else None
+
+def repo_search_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a REST search/repositories item to `gh search repos --json` fields."""
+    owner = item.get("owner") or {}
+    return {
+        "fullName": item.get("full_name"),
+        "name": item.get("name"),
+        "owner": {"login": owner.get("login")},
+        "description": item.get("description"),
+        "stargazersCount": item.get("stargazers_count", 0),
+        "forksCount": item.get("forks_count", 0),
+        "watchersCount": item.get("watchers_count", 0),
+        "openIssuesCount": item.get("open_issues_count", 0),
+        "updatedAt": item.get("updated_at"),
+        "createdAt": item.get("created_at"),
+        "pushedAt": item.get("pushed_at"),
+        "url": item.get("html_url"),
+        "homepage": item.get("homepage"),
+        "language": item.get("language"),
+        "isFork": item.get("fork", False),
+        "isArchived": item.get("archived", False),
+        "defaultBranch": item.get("default_branch"),
+        "topics": item.get("topics", []),
+    }
+
+def repo_view(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a REST repos/{owner}/{repo} payload to `gh repo view --json` fields."""
+    owner = item.get("owner") or {}
+    branch = item.get("default_branch")
+    return {
+        "nameWithOwner": item.get("full_name"),
+        "name": item.get("name"),
+        "owner": {"login": owner.get("login")},
+        "description": item.get("description"),
+        "stargazerCount": item.get("stargazers_count", 0),
+        "forkCount": item.get("forks_count", 0),
+        "updatedAt": item.get("updated_at"),
+        "createdAt": item.get("created_at"),
+        "pushedAt": item.get("pushed_at"),
+        "url": item.get("html_url"),
+        "homepageUrl": item.get("homepage") or "",
+        "primaryLanguage": _language(item.get("language")),
+        "isFork": item.get("fork", False),
+        "isArchived": item.get("archived", False),
+        "defaultBranchRef": {"name": branch} if branch else None,
+        "repositoryTopics": [{"name": t} for t in item.get("topics", [])] or None,
+    }
+
+def code_search_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a REST search/code item to `gh search code --json` fields."""
+    repo = item.get("repository") or {}
+    matches = []
+    for match in item.get("text_matches") or []:
+        matches.append({
+            "fragment": match.get("fragment", ""),
+            "property": match.get("property", ""),
+            "type": match.get("object_type", ""),
+            "matches": [
+                {"text": m.get("text", ""), "indices": m.get("indices", [])}
+                for m in match.get("matches") or []
+            ],
+        })
+    return {
+        "path": item.get("path"),
+        "sha": item.get("sha"),
+        "url": item.get("html_url"),
+        "repository": {
+            "nameWithOwner": repo.get("full_name"),
+            "url": repo.get("html_url"),
+            "isFork": repo.get("fork", False),
+            "isPrivate": repo.get("private", False),
+        },
+        "textMatches": matches,
+    }
+
+def select_fields(record: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    """Keep only the requested --json fields, raising KeyError for unknown ones."""
+    return {field: record[field] for field in fields}
+
+def split_fields(spec: str) -> List[str]:
+    """Split a comma-separated --json field list."""
+    return [f.strip() for f in spec.split(",") if f.strip()]
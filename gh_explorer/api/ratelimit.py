@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Rate-limit-aware request scheduling
+
+GitHub meters the search, code search, core REST and GraphQL APIs
+separately. The scheduler keeps a token bucket per resource, corrects it
+with the x-ratelimit-* headers of every response, and makes callers wait
+for quota instead of letting requests fail.
+"""
+
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# Default (limit, window in seconds) per resource for an authenticated user
+DEFAULT_LIMITS = {
+    "search": (30, 60.0),
+    "code_search": (10, 60.0),
+    "core": (5000, 3600.0),
+    "graphql": (5000, 3600.0),
+}
+
+# How often a rate-limited request is retried before giving up
+MAX_RETRIES = 3
+
+_RATE_LIMIT_ERROR = re.compile(r"rate limit|HTTP 429", re.IGNORECASE)
+
+class TokenBucket:
+    """A token bucket that also tracks the server-reported quota."""
+
+    def __init__(self, limit: int, window: float):
+        """Initialize a full bucket allowing `limit` requests per `window` seconds."""
+        self.capacity = float(limit)
+        self.rate = limit / window
+        self.window = window
+        self.tokens = float(limit)
+        self.updated = time.monotonic()
+        # Quota as last reported by GitHub
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens earned since the last update."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a request could be sent, without reserving it."""
+        self._refill(now)
+        wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+        if self.remaining == 0 and self.reset_at is not None:
+            wait = max(wait, self.reset_at - time.time())
+        return max(0.0, wait)
+
+    def reserve(self, now: float) -> float:
+        """Take a token and return how long the caller must wait to use it.
+
+        Tokens may go negative; later callers then queue up behind earlier ones.
+        """
+        wait = self.wait_time(now)
+        self.tokens -= 1
+        if self.remaining is not None and self.remaining > 0:
+            self.remaining -= 1
+        return wait
+
+class RateLimitScheduler:
+    """Paces requests per GitHub rate-limit resource."""
+
+    def __init__(self,
+                 limits: Optional[Dict[str, tuple]] = None,
+                 on_wait: Optional[Callable[[str, float], None]] = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        """Initialize buckets from `limits` ({resource: (limit, window)}).
+
+        `on_wait(resource, seconds)` is called before the scheduler sleeps, so
+        callers can report the expected wait.
+        """
+        self.on_wait = on_wait
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self.buckets = {
+            name: TokenBucket(limit, window)
+            for name, (limit, window) in (limits or DEFAULT_LIMITS).items()
+        }
+
+    @staticmethod
+    def classify(args: List[str]) -> Optional[str]:
+        """Return the rate-limit resource a gh command is charged against.
+        
+        Returns None for commands that do not call the API (or are not
+        metered), which are never paced.
+        """
+        if not args or args[0] in ("--version", "auth", "gist") or args[:2] == ["repo", "clone"]:
+            return None
+        if "--web" in args:
+            return None
+        if args[:2] == ["search", "code"]:
+            return "code_search"
+        if args[:1] == ["search"]:
+            return "search"
+        if args[:2] == ["api", "graphql"]:
+            return "graphql"
+        if args[:1] == ["api"] and len(args) > 1:
+            endpoint = args[1].lstrip("/")
+            if endpoint.startswith("search/code"):
+                return "code_search"
+            if endpoint.startswith("search/"):
+                return "search"
+        return "core"
+
+    def acquire(self, resource: str) -> float:
+        """Block until a request against `resource` may be sent; return the wait."""
+        with self._lock:
+            wait = self.buckets[resource].reserve(time.monotonic())
+        if wait > 0:
+            if self.on_wait:
+                self.on_wait(resource, wait)
+            self.sleep(wait)
+        return wait
+
+    def refund(self, resource: str) -> None:
+        """Give back a token for a request GitHub did not charge (e.g. a 304)."""
+        with self._lock:
+            bucket = self.buckets[resource]
+            bucket.tokens = min(bucket.capacity, bucket.tokens + 1)
+
+    def update(self, resource: str, headers: Dict[str, str]) -> None:
+        """Correct a bucket from x-ratelimit-* response headers."""
+        if not headers or "x-ratelimit-remaining" not in headers:
+            return
+        resource = headers.get("x-ratelimit-resource", resource)
+        with self._lock:
+            bucket = self.buckets.get(resource)
+            if bucket is None:
+                return
+            try:
+                remaining = int(headers["x-ratelimit-remaining"])
+                reset_at = float(headers.get("x-ratelimit-reset", 0)) or None
+                limit = int(headers.get("x-ratelimit-limit", 0))
+            except ValueError:
+                return
+            if limit and limit != bucket.capacity:
+                bucket.capacity = float(limit)
+                bucket.rate = limit / bucket.window
+            bucket.remaining = remaining
+            bucket.reset_at = reset_at
+            bucket.tokens = min(bucket.tokens, float(remaining))
+
+    def is_rate_limit_error(self, error: Exception) -> bool:
+        """Return True if a failed request was rejected for exceeding a rate limit."""
+        return bool(_RATE_LIMIT_ERROR.search(str(error)))
+
+    def backoff(self, resource: str, attempt: int) -> float:
+        """Wait after a rate-limit rejection; return the seconds waited.
+
+        Waits until the reported reset when it is known, otherwise for one
+        window of the bucket scaled by the attempt number.
+        """
+        with self._lock:
+            bucket = self.buckets[resource]
+            bucket.tokens = min(bucket.tokens, 0.0)
+            if bucket.reset_at is not None and bucket.reset_at > time.time():
+                wait = bucket.reset_at - time.time() + 1
+            else:
+                wait = min(bucket.window, 60.0) * (attempt + 1)
+        if self.on_wait:
+            self.on_wait(resource, wait)
+        self.sleep(wait)
+        return wait
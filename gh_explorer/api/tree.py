@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Compact in-memory file trees of repositories
+
+A repository's whole tree comes from one `git/trees/{sha}?recursive=1`
+request and is kept as parallel arrays plus a per-directory index of child
+entries, so listing any directory is a dict lookup. When GitHub truncates a
+recursive listing (very large repositories), directories are instead listed
+one at a time with `git/trees/{sha}` as they are expanded.
+"""
+
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, Optional
+
+# Entry kinds, named like the contents API's "type" field
+DIR = "dir"
+FILE = "file"
+SYMLINK = "symlink"
+SUBMODULE = "submodule"
+
+_KIND_CODES = {DIR: 0, FILE: 1, SYMLINK: 2, SUBMODULE: 3}
+_KIND_NAMES = {code: name for name, code in _KIND_CODES.items()}
+
+# The directory index key of the repository root
+ROOT = -1
+
+def entry_kind(item: Dict[str, Any]) -> str:
+    """Return the kind of a git/trees entry."""
+    if item.get("type") == "tree":
+        return DIR
+    if item.get("type") == "commit":
+        return SUBMODULE
+    if item.get("mode") == "120000":
+        return SYMLINK
+    return FILE
+
+class RepoTree:
+    """Every path of a repository at one commit, indexed by directory.
+
+    Entries live in parallel columns (interned base names, parent indexes,
+    kinds, sizes); `_children` maps each directory whose contents are known
+    to its entries, directories first and then by name. A tree is not
+    locked: once shared, change it from one thread only.
+    """
+
+    def __init__(self, sha: str = "", truncated: bool = False):
+        """Initialize an empty tree for the commit tree `sha`."""
+        self.sha = sha
+        # True when the tree is filled in directory by directory
+        self.truncated = truncated
+        self._names: List[str] = []
+        self._parents = array("l")
+        self._kinds = bytearray()
+        self._sizes = array("q")
+        # Tree SHAs of directories not listed yet, needed to list them later
+        self._dir_shas: Dict[int, str] = {}
+        self._children: Dict[int, array] = {}
+        self._dirs: Dict[str, int] = {"": ROOT}
+
+    @classmethod
+    def from_api(cls, payload: Dict[str, Any]) -> "RepoTree":
+        """Build a tree from a git/trees response.
+
+        A truncated recursive response is only trusted for the root level;
+        deeper directories are left to be listed on demand.
+        """
+        truncated = bool(payload.get("truncated"))
+        tree = cls(payload.get("sha", ""), truncated=truncated)
+        items = payload.get("tree") or []
+        if truncated:
+            items = [item for item in items if "/" not in item.get("path", "")]
+        tree._add_items("", items)
+        if not truncated:
+            # A complete listing: every directory's contents are known,
+            # including empty ones
+            for index in tree._dirs.values():
+                tree._children.setdefault(index, array("l"))
+            tree._dir_shas.clear()
+        tree._sort()
+        return tree
+
+    def _ensure_dir(self, path: str) -> int:
+        """Return the index of a directory, creating it and its parents."""
+        index = self._dirs.get(path)
+        if index is not None:
+            return index
+        parent_path, _, name = path.rpartition("/")
+        return self._add(self._ensure_dir(parent_path), name, DIR, 0)
+
+    def _append(self, parent: int, name: str, kind: str, size: int) -> int:
+        """Add an entry's columns without listing it in its parent."""
+        index = len(self._names)
+        self._names.append(sys.intern(name))
+        self._parents.append(parent)
+        self._kinds.append(_KIND_CODES[kind])
+        self._sizes.append(size)
+        if kind == DIR:
+            self._dirs[self.path_of(index)] = index
+        return index
+
+    def _add(self, parent: int, name: str, kind: str, size: int) -> int:
+        index = self._append(parent, name, kind, size)
+        self._children.setdefault(parent, array("l")).append(index)
+        return index
+
+    def _add_items(self, base: str, items: Iterable[Dict[str, Any]]) -> None:
+        """Add git/trees entries whose paths are relative to directory `base`."""
+        for item in items:
+            relative = item.get("path", "")
+            if not relative:
+                continue
+            path = f"{base}/{relative}" if base else relative
+            kind = entry_kind(item)
+            if kind == DIR and path in self._dirs:
+                index = self._dirs[path]
+            else:
+                parent_path, _, name = path.rpartition("/")
+                index = self._add(self._ensure_dir(parent_path), name, kind, int(item.get("size") or 0))
+            if kind == DIR and item.get("sha"):
+                self._dir_shas[index] = item["sha"]
+
+    def _sort(self, parents: Optional[Iterable[int]] = None) -> None:
+        """Order children directories first, then case-insensitively by name."""
+        for parent in (self._children if parents is None else parents):
+            children = self._children.get(parent)
+            if children is not None:
+                self._children[parent] = self._ordered(children)
+
+    def _ordered(self, children: Iterable[int]) -> array:
+        return array("l", sorted(children, key=lambda i: (self._kinds[i] != _KIND_CODES[DIR],
+                                                          self._names[i].casefold())))
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def path_of(self, index: int) -> str:
+        """Return the full path of an entry."""
+        parts = []
+        while index != ROOT:
+            parts.append(self._names[index])
+            index = self._parents[index]
+        return "/".join(reversed(parts))
+
+    def is_dir(self, path: str) -> bool:
+        return path in self._dirs
+
+    def is_loaded(self, path: str = "") -> bool:
+        """Return True if a directory's contents are known."""
+        index = self._dirs.get(path)
+        return index is not None and index in self._children
+
+    def dir_sha(self, path: str) -> Optional[str]:
+        """Return the tree SHA of a directory that has not been listed yet."""
+        index = self._dirs.get(path)
+        return self._dir_shas.get(index) if index is not None else None
+
+    def set_listing(self, path: str, payload: Dict[str, Any]) -> None:
+        """Fill in a directory from a non-recursive git/trees response.
+
+        The children are collected first and published with one
+        assignment; until then the directory still reads as not loaded.
+        """
+        index = self._ensure_dir(path)
+        if index in self._children:
+            return
+        children = array("l")
+        for item in payload.get("tree") or []:
+            name = item.get("path", "")
+            if not name:
+                continue
+            kind = entry_kind(item)
+            child = self._append(index, name, kind, int(item.get("size") or 0))
+            if kind == DIR and item.get("sha"):
+                self._dir_shas[child] = item["sha"]
+            children.append(child)
+        self._children[index] = self._ordered(children)
+        self._dir_shas.pop(index, None)
+
+    def child_indexes(self, path: str = "") -> array:
+        """Return the entry indexes in a directory; KeyError if not loaded."""
+        index = self._dirs[path]
+        return self._children[index]
+
+    def name(self, index: int) -> str:
+        return self._names[index]
+
+    def kind(self, index: int) -> str:
+        return _KIND_NAMES[self._kinds[index]]
+
+    def listdir(self, path: str = "") -> List[Dict[str, Any]]:
+        """List a directory with contents-API-like entries (name, path, type, size)."""
+        return [
+            {"name": self._names[i], "path": self.path_of(i),
+             "type": self.kind(i), "size": self._sizes[i]}
+            for i in self.child_indexes(path)
+        ]
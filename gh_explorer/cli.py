@@ -6,18 +6,12 @@ GitHub Explorer CLI - A shell-integrated tool for exploring GitHub
 import sys
 import os
 import click
-from rich.console import Console
-from rich.theme import Theme
-from rich.panel import Panel
-from rich.text import Text
-
-from gh_explorer.api.client import GitHubClient
-from gh_explorer.utils.formatting import format_repo_list, format_repo_details
-from gh_explorer.ui.screens.main_menu import display_main_menu
-from gh_explorer.ui.screens.repo_search import search_repos_interactive
-
-# Set up Rich console
-console = Console(theme=Theme({
+
+# Rich, the API client and the screens are imported lazily: ghx is called from
+# shell prompts and scripts, and most invocations need only a few of them.
+
+# Named styles used in console markup throughout the app
+THEME_STYLES = {
     "info": "dim cyan",
     "warning": "magenta",
     "danger": "bold red",
@@ -27,45 +21,227 @@ console = Console(theme=Theme({
     "forks": "cyan",
     "language": "green",
     "date": "dim white",
-}))
+}
+
+_console = None
+
+def get_console():
+    """Return the shared Rich console, creating it on first use."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        from rich.theme import Theme
+        
+        # Set up Rich console
+        _console = Console(theme=Theme(THEME_STYLES))
+        from gh_explorer.utils import trace
+        if trace.active():
+            # Layout and drawing happen when a renderable is printed
+            _console.print = trace.traced("render", "console.print")(_console.print)
+    return _console
+
+class LazyContext(dict):
+    """ctx.obj that builds expensive entries (client, console) on first access."""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._factories = {}
+    
+    def register(self, key, factory):
+        """Build `key` with `factory()` the first time it is looked up."""
+        self._factories[key] = factory
+        self.pop(key, None)
+    
+    def __getitem__(self, key):
+        if not dict.__contains__(self, key) and key in self._factories:
+            self[key] = self._factories[key]()
+        return dict.__getitem__(self, key)
+    
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or key in self._factories
+    
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+# Output formats shared by the query commands
+OUTPUT_FORMATS = click.Choice(['table', 'json', 'ndjson'])
+
+def report_rate_limit_wait(resource, seconds):
+    """Tell the user (on stderr, so piped output stays clean) why we pause."""
+    if seconds >= 1:
+        click.echo(f"Rate limit: waiting {seconds:.0f}s for {resource} quota...", err=True)
+
+def catalog_callback(kind):
+    """Option callback mapping a --language/--topic value to its catalog name.
+    
+    Exact names and aliases ("golang") are replaced by the catalog name,
+    ignoring case and separators. Anything else is kept as typed, since
+    topics are literal tags; a close catalog entry ("pyhton") is suggested
+    on stderr. `ghx --no-fuzzy` passes values through untouched.
+    """
+    def callback(ctx, param, value):
+        if not value or (ctx.obj and ctx.obj.get('NO_FUZZY')):
+            return value
+        from gh_explorer.data.catalog import get_catalog, normalize
+        catalog = get_catalog()
+        match = catalog.resolve(kind, value)
+        if match is None:
+            suggestion = catalog.suggest(kind, value)
+            if suggestion is not None:
+                click.echo(f"'{value}' is not a known {kind[:-1]}; did you mean {param.opts[0]} "
+                           f"{suggestion.name}? Searching for '{value}' as given.", err=True)
+            return value
+        if normalize(match.name) != normalize(value):
+            click.echo(f"Using {param.opts[0]} {match.name} for '{value}'", err=True)
+        return match.name
+    return callback
+
+def catalog_completion(kind):
+    """Shell completion of --language/--topic values from the catalog."""
+    def complete(ctx, param, incomplete):
+        from gh_explorer.data.catalog import get_catalog
+        catalog = get_catalog()
+        if not incomplete:
+            return [entry.name for entry in catalog.entries(kind)[:50]]
+        return [match.name for match in catalog.search(kind, incomplete, limit=20)]
+    return complete
+
+def start_trace(ctx, path):
+    """Trace this run; the file and a summary on stderr are written at exit."""
+    from gh_explorer.utils import trace
+    tracer = trace.enable(path)
+    command = ctx.invoked_subcommand or "interactive"
+    
+    def finish():
+        wall = tracer.now()
+        tracer.add(f"ghx {command}", "command", 0, wall, {"argv": sys.argv[1:]})
+        trace.disable()
+        try:
+            tracer.write()
+        except OSError as e:
+            click.echo(f"Could not write trace to {path}: {e}", err=True)
+            return
+        from rich.console import Console
+        Console(stderr=True).print(trace.format_summary(tracer, wall / 1e6))
+    
+    ctx.call_on_close(finish)
+
+def resolve_format(output_format, json_output):
+    """Combine --format with the older --json flag."""
+    if output_format:
+        return output_format
+    return 'json' if json_output else 'table'
 
 @click.group(invoke_without_command=True)
 @click.option('--debug/--no-debug', default=False, help='Enable debug mode')
+@click.option('--no-cache', is_flag=True, help='Bypass the on-disk response cache')
+@click.option('--backend', type=click.Choice(['gh', 'http']), default=None,
+              help='Transport: spawn gh per request, or pooled HTTP (default: $GHX_BACKEND or gh)')
+@click.option('--no-fuzzy', is_flag=True,
+              help='Use --language/--topic values exactly as typed, without catalog lookups')
+@click.option('--trace', 'trace_file', type=click.Path(dir_okay=False, writable=True),
+              envvar='GHX_TRACE', default=None,
+              help='Record requests, parsing and rendering as Chrome trace JSON in this file')
 @click.pass_context
-def cli(ctx, debug):
+def cli(ctx, debug, no_cache, backend, no_fuzzy, trace_file):
     """GitHub Explorer (ghx) - Shell-integrated GitHub exploration tool"""
-    ctx.ensure_object(dict)
+    ctx.ensure_object(LazyContext)
     ctx.obj['DEBUG'] = debug
-    ctx.obj['CLIENT'] = GitHubClient()
-    ctx.obj['CONSOLE'] = console
+    ctx.obj['NO_FUZZY'] = no_fuzzy
+    if trace_file:
+        start_trace(ctx, trace_file)
+    
+    def make_local_client():
+        from gh_explorer.api.client import GitHubClient
+        from gh_explorer.api.ratelimit import RateLimitScheduler
+        return GitHubClient(
+            use_cache=False if no_cache else None,
+            backend=backend,
+            scheduler=RateLimitScheduler(on_wait=report_rate_limit_wait)
+        )
+    
+    def make_client():
+        # A running `ghx daemon` answers queries from its warm client; it is
+        # configured with the defaults, so explicit transport options and
+        # GHX_NO_DAEMON keep everything in process
+        if no_cache or backend or os.environ.get("GHX_NO_DAEMON"):
+            return make_local_client()
+        from gh_explorer.api.daemon import DaemonClient
+        return DaemonClient(make_local_client)
+    
+    # The client (and its gh check) is only created once a command uses it
+    ctx.obj.register('CLIENT', make_client)
+    
+    def close_client():
+        # Only a client that was actually created holds connections
+        if dict.__contains__(ctx.obj, 'CLIENT'):
+            ctx.obj['CLIENT'].close()
+    ctx.call_on_close(close_client)
+    ctx.obj.register('CONSOLE', get_console)
     
     if ctx.invoked_subcommand is None:
         # No subcommand was specified, run interactive mode
+        from gh_explorer.ui.screens.main_menu import display_main_menu
         display_main_menu(ctx.obj)
 
 @cli.command()
 @click.argument('query', required=False, nargs=-1)
 @click.option('--limit', '-l', default=20, help='Maximum number of results')
-@click.option('--language', help='Filter by programming language')
-@click.option('--topic', help='Filter by topic')
+@click.option('--language', help='Filter by programming language',
+              callback=catalog_callback('languages'), shell_complete=catalog_completion('languages'))
+@click.option('--topic', help='Filter by topic',
+              callback=catalog_callback('topics'), shell_complete=catalog_completion('topics'))
 @click.option('--sort', type=click.Choice(['stars', 'forks', 'updated']), 
               default='stars', help='Sort results by')
 @click.option('--json', 'json_output', is_flag=True, help='Output as JSON')
+@click.option('--format', 'output_format', type=OUTPUT_FORMATS, default=None,
+              help='Output format; ndjson streams one record per line')
+@click.option('--offline', is_flag=True,
+              help='Search repositories fetched before, from the local index, without network access')
+@click.option('--semantic', is_flag=True,
+              help='Rank indexed repositories by similarity to the query instead of matching words (offline)')
 @click.pass_context
-def search_repos(ctx, query, limit, language, topic, sort, json_output):
+def search_repos(ctx, query, limit, language, topic, sort, json_output, output_format, offline, semantic):
     """Search for GitHub repositories"""
     # Convert tuple of arguments to a space-separated string if provided
     query_str = ' '.join(query) if query else ''
+    output_format = resolve_format(output_format, json_output)
     
     if not query_str:
         # If no query provided, go to interactive mode
+        from gh_explorer.ui.screens.repo_search import search_repos_interactive
         search_repos_interactive(ctx.obj)
         return
     
+    if semantic:
+        search_repos_semantic(ctx.obj['CONSOLE'], query_str, limit, language, topic, output_format)
+        return
+    
+    if offline:
+        search_repos_offline(ctx.obj['CONSOLE'], query_str, limit, language, topic, output_format)
+        return
+    
     client = ctx.obj['CLIENT']
-    console = ctx.obj['CONSOLE']
+    # Rich is only loaded when output is rendered for the terminal
+    console = ctx.obj['CONSOLE'] if output_format == 'table' else None
     
-    console.print(f"[info]Searching for repositories: [/info][repo]{query_str}[/repo]")
+    if output_format == 'ndjson':
+        # Stream records as pages arrive, without building the full list
+        from gh_explorer.utils.output import write_ndjson
+        write_ndjson(client.iter_search_repositories(
+            query=query_str,
+            limit=limit,
+            language=language,
+            topic=topic,
+            sort=sort
+        ))
+        return
+    
+    if output_format == 'table':
+        console.print(f"[info]Searching for repositories: [/info][repo]{query_str}[/repo]")
     
     repos = client.search_repositories(
         query=query_str, 
@@ -75,9 +251,9 @@ def search_repos(ctx, query, limit, language, topic, sort, json_output):
         sort=sort
     )
     
-    if json_output:
-        import json
-        console.print(json.dumps(repos))
+    if output_format == 'json':
+        from gh_explorer.utils.output import write_json
+        write_json(repos)
     else:
         # Always use the simple output mode for now
         # Until we can properly debug the terminal capabilities
@@ -103,47 +279,169 @@ def search_repos(ctx, query, limit, language, topic, sort, json_output):
                 # Handle terminal input errors gracefully
                 pass
 
+def search_repos_offline(console, query_str, limit, language, topic, output_format):
+    """Answer a repository search from the local index, ranked by BM25."""
+    from gh_explorer.data.index import RepoIndex
+    
+    if topic:
+        click.echo("Topics are not indexed; --topic is ignored with --offline", err=True)
+    if output_format == 'table':
+        console.print(f"[info]Searching indexed repositories: [/info][repo]{query_str}[/repo]")
+    
+    repos = RepoIndex().search(query_str, limit=limit, language=language)
+    print_indexed_repos(console, repos, output_format, "No indexed repositories match.")
+
+def semantic_store():
+    """Open the semantic store, or explain what --semantic and related need."""
+    import sqlite3
+    from gh_explorer.data.semantic import SemanticStore
+    
+    try:
+        store = SemanticStore()
+        # Opens (or creates) the index, so an unusable one fails here
+        store.index.count()
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    except sqlite3.Error as e:
+        raise click.ClickException(
+            f"The local index cannot be opened ({e}). Point GHX_INDEX_PATH at a "
+            "writable file, or remove the damaged one to start a new index."
+        )
+    return store
+
+def search_repos_semantic(console, query_str, limit, language, topic, output_format):
+    """Answer a repository search from the local index, ranked by similarity."""
+    store = semantic_store()
+    if output_format == 'table':
+        console.print(f"[info]Finding indexed repositories similar to: [/info][repo]{query_str}[/repo]")
+    
+    repos = store.search(query_str, limit=limit, language=language, topic=topic)
+    print_indexed_repos(console, repos, output_format, "No similar indexed repositories.")
+
+def print_indexed_repos(console, repos, output_format, empty_message):
+    """Write repositories found in the local index in the chosen format."""
+    if output_format == 'json':
+        from gh_explorer.utils.output import write_json
+        write_json(repos)
+    elif output_format == 'ndjson':
+        from gh_explorer.utils.output import write_ndjson
+        write_ndjson(repos)
+    elif not repos:
+        console.print(f"[warning]{empty_message} Only repositories "
+                      "ghx has fetched before can be found offline.[/warning]")
+    else:
+        from gh_explorer.utils.formatting import format_repo_list
+        console.print(format_repo_list(repos))
+
+@cli.command()
+@click.argument('repo', required=True)
+@click.option('--limit', '-l', default=20, help='Maximum number of results')
+@click.option('--language', help='Only show repositories in this language',
+              callback=catalog_callback('languages'), shell_complete=catalog_completion('languages'))
+@click.option('--topic', help='Only show repositories with this topic',
+              callback=catalog_callback('topics'), shell_complete=catalog_completion('topics'))
+@click.option('--json', 'json_output', is_flag=True, help='Output as JSON')
+@click.option('--format', 'output_format', type=OUTPUT_FORMATS, default=None,
+              help='Output format; ndjson writes one record per line')
+@click.pass_context
+def related(ctx, repo, limit, language, topic, json_output, output_format):
+    """Find indexed repositories similar to REPO (owner/name)
+    
+    Similarity is computed offline from the names, topics, descriptions and
+    README openings of repositories ghx has fetched before. REPO itself is
+    fetched first if it is not indexed yet.
+    """
+    output_format = resolve_format(output_format, json_output)
+    console = ctx.obj['CONSOLE'] if output_format == 'table' else None
+    store = semantic_store()
+    try:
+        repos = store.related(repo, limit=limit, language=language, topic=topic)
+    except KeyError:
+        # Fetching the repository adds it to the index
+        ctx.obj['CLIENT'].get_repository(repo)
+        try:
+            repos = store.related(repo, limit=limit, language=language, topic=topic)
+        except KeyError:
+            raise click.ClickException(
+                f"{repo} is not in the local index and could not be added to it. "
+                "Check the name, and unset GHX_NO_INDEX if it is set."
+            )
+    
+    if output_format == 'table':
+        console.print(f"[info]Indexed repositories similar to: [/info][repo]{repo}[/repo]")
+    print_indexed_repos(console, repos, output_format, "No similar indexed repositories.")
+
 @cli.command()
 @click.argument('repo', required=True)
 @click.option('--web', is_flag=True, help='Open in web browser')
 @click.option('--json', 'json_output', is_flag=True, help='Output as JSON')
+@click.option('--format', 'output_format', type=OUTPUT_FORMATS, default=None,
+              help='Output format; ndjson writes one compact line')
 @click.pass_context
-def view_repo(ctx, repo, web, json_output):
+def view_repo(ctx, repo, web, json_output, output_format):
     """View details of a GitHub repository"""
+    output_format = resolve_format(output_format, json_output)
     client = ctx.obj['CLIENT']
-    console = ctx.obj['CONSOLE']
+    # Rich is only loaded when output is rendered for the terminal
+    console = ctx.obj['CONSOLE'] if output_format == 'table' else None
     
     if web:
         # Open in web browser
         client.open_in_browser(repo)
         return
     
-    console.print(f"[info]Fetching repository details for: [/info][repo]{repo}[/repo]")
+    if output_format == 'table':
+        console.print(f"[info]Fetching repository details for: [/info][repo]{repo}[/repo]")
     
     repo_details = client.get_repository(repo)
     
-    if json_output:
-        import json
-        console.print(json.dumps(repo_details))
+    if output_format == 'json':
+        from gh_explorer.utils.output import write_json
+        write_json(repo_details)
+    elif output_format == 'ndjson':
+        from gh_explorer.utils.output import write_ndjson
+        write_ndjson([repo_details])
     else:
+        from gh_explorer.utils.formatting import format_repo_details
         formatted = format_repo_details(repo_details)
         console.print(formatted)
 
 @cli.command()
 @click.argument('query', required=True, nargs=-1)
 @click.option('--limit', '-l', default=20, help='Maximum number of results')
-@click.option('--language', help='Filter by programming language')
+@click.option('--language', help='Filter by programming language',
+              callback=catalog_callback('languages'), shell_complete=catalog_completion('languages'))
 @click.option('--json', 'json_output', is_flag=True, help='Output as JSON')
+@click.option('--format', 'output_format', type=OUTPUT_FORMATS, default=None,
+              help='Output format; ndjson streams one record per line')
+@click.option('--group', is_flag=True,
+              help='Stream results grouped by repository, collapsing duplicate files')
 @click.pass_context
-def search_code(ctx, query, limit, language, json_output):
+def search_code(ctx, query, limit, language, json_output, output_format, group):
     """Search for code in GitHub repositories"""
     # Convert tuple of arguments to a space-separated string
     query_str = ' '.join(query)
+    output_format = resolve_format(output_format, json_output)
     
     client = ctx.obj['CLIENT']
-    console = ctx.obj['CONSOLE']
+    # Rich is only loaded when output is rendered for the terminal
+    console = ctx.obj['CONSOLE'] if output_format == 'table' else None
     
-    console.print(f"[info]Searching for code: [/info]{query_str}")
+    if group:
+        search_code_grouped(console, client, query_str, limit, language, output_format)
+        return
+    
+    if output_format == 'ndjson':
+        from gh_explorer.utils.output import write_ndjson
+        write_ndjson(client.iter_search_code(
+            query=query_str,
+            limit=limit,
+            language=language
+        ))
+        return
+    
+    if output_format == 'table':
+        console.print(f"[info]Searching for code: [/info]{query_str}")
     
     results = client.search_code(
         query=query_str,
@@ -151,21 +449,263 @@ def search_code(ctx, query, limit, language, json_output):
         language=language
     )
     
-    if json_output:
-        import json
-        console.print(json.dumps(results))
+    if output_format == 'json':
+        from gh_explorer.utils.output import write_json
+        write_json(results)
     else:
         from gh_explorer.utils.formatting import format_code_results
         formatted = format_code_results(results)
         console.print(formatted)
 
+@cli.command()
+@click.argument('input_file', type=click.File('r'), default='-')
+@click.option('--op', 'default_op', type=click.Choice(['search-repos', 'search-code', 'view-repo']),
+              default='search-repos', help='Operation for lines that do not name one')
+@click.option('--concurrency', '-j', type=click.IntRange(min=1), default=8,
+              help='Requests in flight at once')
+@click.pass_context
+def batch(ctx, input_file, default_op, concurrency):
+    """Run many queries concurrently, streaming tagged NDJSON results
+    
+    INPUT_FILE (default: stdin) holds one query per line, optionally
+    prefixed with an operation, or JSON specs such as
+    {"id": "a", "op": "search-code", "query": "def main", "limit": 5}.
+    Each result line carries its spec's id (the line number by default)
+    and "ok"; failed specs get an "error" and do not stop the batch.
+    """
+    import time
+    from gh_explorer.api.async_client import AsyncGitHubClient
+    from gh_explorer.api.batch import read_specs, run_batch
+    from gh_explorer.utils.output import write_ndjson
+    
+    started = time.monotonic()
+    client = AsyncGitHubClient(ctx.obj['CLIENT'], concurrency=concurrency)
+    runner = run_batch(
+        read_specs(input_file, default_op),
+        client,
+        lambda record: write_ndjson([record])
+    )
+    click.echo(f"batch: {runner.succeeded} succeeded, {runner.failed} failed "
+               f"in {time.monotonic() - started:.1f}s", err=True)
+    if runner.failed:
+        ctx.exit(1)
+
+@cli.command(name='clone-many')
+@click.argument('repos', nargs=-1)
+@click.option('--from', 'input_file', type=click.File('r'), default=None,
+              help='Read repositories from a file (- for stdin): owner/name per line, or search NDJSON')
+@click.option('--search', 'query', default=None, help='Clone the results of a repository search')
+@click.option('--limit', '-l', default=20, help='Maximum number of search results to clone')
+@click.option('--dest', '-d', type=click.Path(file_okay=False), default='.',
+              help='Directory to clone into, as DEST/owner/name')
+@click.option('--depth', type=click.IntRange(min=1), default=None,
+              help='Shallow clone with this many commits of history')
+@click.option('--filter', 'filter_spec', default=None,
+              help='Partial clone filter, e.g. blob:none (fetch file contents on demand)')
+@click.option('--sparse', multiple=True,
+              help='Only check out paths matching this pattern (repeatable)')
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=4, help='Clones to run at once')
+@click.option('--format', 'output_format', type=OUTPUT_FORMATS, default=None,
+              help='Output format; json and ndjson report each clone instead of progress')
+@click.pass_context
+def clone_many(ctx, repos, input_file, query, limit, dest, depth, filter_spec, sparse, jobs, output_format):
+    """Clone many repositories in parallel
+    
+    Repositories come from the arguments, --from (for example the output of
+    `ghx search-repos --format ndjson`) and --search. Each is cloned into
+    DEST/owner/name; existing directories are skipped, so an interrupted run
+    can be repeated.
+    """
+    import json
+    from gh_explorer.api.clone import CloneOptions, clone_repositories
+    
+    output_format = output_format or 'table'
+    client = ctx.obj['CLIENT']
+    names = list(repos)
+    if input_file is not None:
+        for number, line in enumerate(input_file, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise click.BadParameter(f"line {number} is not valid JSON ({e.msg})", param_hint="'--from'")
+                line = record.get("fullName") or record.get("nameWithOwner") if isinstance(record, dict) else None
+                if not line:
+                    raise click.BadParameter(f"line {number} has no fullName or nameWithOwner",
+                                             param_hint="'--from'")
+            names.append(line)
+    if query:
+        names.extend(repo["fullName"] for repo in client.search_repositories(query=query, limit=limit))
+    if not names:
+        raise click.UsageError("Give repositories as arguments, with --from or with --search")
+    
+    options = CloneOptions(depth=depth, filter=filter_spec, sparse=sparse)
+    if output_format == 'table':
+        from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeElapsedColumn
+        console = ctx.obj['CONSOLE']
+        total = len(dict.fromkeys(names))
+        active = []
+        
+        with Progress(TextColumn("[progress.description]{task.description}"), BarColumn(),
+                      MofNCompleteColumn(), TimeElapsedColumn(), console=console) as progress:
+            task = progress.add_task("Cloning", total=total)
+            
+            def describe():
+                shown = ", ".join(active[:2]) + (f" +{len(active) - 2}" if len(active) > 2 else "")
+                return f"Cloning {shown}" if shown else "Cloning"
+            
+            def on_start(repo_name):
+                active.append(repo_name)
+                progress.update(task, description=describe())
+            
+            def on_done(result):
+                if result["repo"] in active:
+                    active.remove(result["repo"])
+                if result["status"] == "failed":
+                    progress.console.print(f"[danger]{result['repo']}: {result['error']}[/danger]")
+                progress.update(task, advance=1, description=describe())
+            
+            results = clone_repositories(client, names, dest, options, jobs, on_start, on_done)
+        counts = {status: sum(1 for r in results if r["status"] == status)
+                  for status in ("cloned", "exists", "failed")}
+        console.print(f"[success]{counts['cloned']} cloned[/success], {counts['exists']} already present, "
+                      f"[{'danger' if counts['failed'] else 'info'}]{counts['failed']} failed[/] in {dest}")
+    elif output_format == 'ndjson':
+        from gh_explorer.utils.output import write_ndjson
+        results = clone_repositories(client, names, dest, options, jobs,
+                                     on_done=lambda result: write_ndjson([result]))
+    else:
+        from gh_explorer.utils.output import write_json
+        results = clone_repositories(client, names, dest, options, jobs)
+        write_json(results)
+    
+    if any(result["status"] == "failed" for result in results):
+        ctx.exit(1)
+
+@cli.command()
+@click.option('--status', is_flag=True, help='Report whether a daemon is running')
+@click.option('--stop', is_flag=True, help='Stop the running daemon')
+@click.option('--socket', 'socket_file', type=click.Path(dir_okay=False), default=None,
+              help='Socket path (default: $GHX_DAEMON_SOCKET or the runtime directory)')
+@click.pass_context
+def daemon(ctx, status, stop, socket_file):
+    """Keep a warm client in memory and answer other ghx commands over a socket
+    
+    While it runs, query commands forward to it instead of starting their
+    own client; they fall back to working in process when it is not
+    running. Stop it with Ctrl+C or `ghx daemon --stop`.
+    """
+    from pathlib import Path
+    from gh_explorer.api import daemon as ghx_daemon
+    
+    path = Path(socket_file) if socket_file else ghx_daemon.socket_path()
+    if status:
+        info = ghx_daemon.daemon_status(path)
+        if info is None:
+            click.echo(f"No ghx daemon is listening on {path}")
+            ctx.exit(1)
+        click.echo(f"ghx daemon pid {info['pid']} on {info['socket']}: up {info['uptime']:.0f}s, "
+                   f"{info['requests']} requests, {info['errors']} errors")
+        return
+    if stop:
+        if not ghx_daemon.stop_daemon(path):
+            click.echo(f"No ghx daemon is listening on {path}")
+            ctx.exit(1)
+        click.echo("ghx daemon stopped")
+        return
+    
+    client = ctx.obj['CLIENT']
+    # Always serve from a real in-process client, never from another daemon
+    client = getattr(client, 'local', client)
+    ghx_daemon.serve(client, path, log=lambda message: click.echo(message, err=True))
+
+@cli.group()
+def catalog():
+    """Look up and refresh the bundled language and topic catalog"""
+
+CATALOG_KINDS = click.Choice(['languages', 'topics'])
+
+@catalog.command('list')
+@click.option('--kind', type=CATALOG_KINDS, default='languages', show_default=True)
+def catalog_list(kind):
+    """Print every name, most popular first (e.g. for piping into fzf)"""
+    from gh_explorer.data.catalog import get_catalog
+    from gh_explorer.utils.output import write_lines
+    write_lines(entry.name for entry in get_catalog().entries(kind))
+
+@catalog.command('match')
+@click.argument('text')
+@click.option('--kind', type=CATALOG_KINDS, default='languages', show_default=True)
+@click.option('--limit', '-l', default=10, help='Maximum number of matches')
+def catalog_match(text, kind, limit):
+    """Print the names best matching TEXT, best first"""
+    from gh_explorer.data.catalog import get_catalog
+    from gh_explorer.utils.output import write_lines
+    write_lines(match.name for match in get_catalog().search(kind, text, limit))
+
+@catalog.command('refresh')
+@click.option('--kind', type=CATALOG_KINDS, default=None, help='Refresh only one kind')
+@click.option('--limit', '-l', default=30, show_default=True,
+              help='Entries to refresh; each costs one search request')
+@click.option('--discover', is_flag=True, help="Also add GitHub's featured topics")
+@click.pass_context
+def catalog_refresh(ctx, kind, limit, discover):
+    """Update popularity weights of the least recently refreshed entries
+    
+    Run it now and then (e.g. daily); each run continues where the last
+    one stopped. Refreshed data is kept next to the offline index.
+    """
+    from gh_explorer.data.catalog import KINDS, get_catalog, refresh_catalog
+    
+    client = ctx.obj['CLIENT']
+    refreshed = refresh_catalog(
+        get_catalog(),
+        client,
+        kinds=[kind] if kind else KINDS,
+        limit=limit,
+        discover=discover,
+        on_entry=lambda kind, name, weight: click.echo(f"{kind[:-1]} {name}: {weight} repositories", err=True)
+    )
+    click.echo(f"Refreshed {refreshed} catalog entries", err=True)
+
+def search_code_grouped(console, client, query_str, limit, language, output_format):
+    """Page through a code search, grouping hits by repository as they arrive."""
+    from gh_explorer.api.client import GROUPED_CODE_FIELDS
+    
+    hits = client.iter_search_code(
+        query=query_str,
+        limit=limit,
+        language=language,
+        fields=GROUPED_CODE_FIELDS
+    )
+    
+    if output_format == 'table':
+        from gh_explorer.ui.widgets.code_groups import GroupedCodeView
+        console.print(f"[info]Searching for code: [/info]{query_str}")
+        GroupedCodeView().stream(hits, console)
+        return
+    
+    # Machine-readable output needs every hit before the groups are final
+    from gh_explorer.api.grouping import CodeHitGrouper
+    grouper = CodeHitGrouper()
+    grouper.extend(hits)
+    if output_format == 'json':
+        from gh_explorer.utils.output import write_json
+        write_json(grouper.to_dicts())
+    else:
+        from gh_explorer.utils.output import write_ndjson
+        write_ndjson(grouper.to_dicts())
+
 def main():
     """Main entry point for the CLI"""
     import signal
     
     # Handle keyboard interrupts (Ctrl+C) gracefully
     def signal_handler(sig, frame):
-        console.print("\n[info]Exiting GitHub Explorer. Goodbye![/info]")
+        get_console().print("\n[info]Exiting GitHub Explorer. Goodbye![/info]")
         sys.exit(0)
     
     # Register signal handlers
@@ -174,11 +714,12 @@ def main():
     try:
         # Set environment variable for proper Escape key handling in terminal
         os.environ["ESCDELAY"] = "25"  # 25ms delay for escape key (faster response)
-        cli(obj={})
+        cli(obj=LazyContext())
     except KeyboardInterrupt:
-        console.print("\n[info]Exiting GitHub Explorer. Goodbye![/info]")
+        get_console().print("\n[info]Exiting GitHub Explorer. Goodbye![/info]")
         sys.exit(0)
     except Exception as e:
+        console = get_console()
         console.print(f"[danger]Error: {str(e)}[/danger]")
         if os.environ.get("GHX_DEBUG"):
             import traceback
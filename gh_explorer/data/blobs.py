@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Content-addressed store for README text
+
+READMEs are stored zlib-compressed under their git blob SHA, so forks and
+mirrors with identical READMEs share one copy. A small ref per repository
+records which blob (and path) its README was last seen at, so a later view
+only needs to check whether the SHA changed.
+"""
+
+import os
+import re
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Optional, Tuple
+
+from gh_explorer.utils.paths import cache_dir
+
+_SHA = re.compile(r"^[0-9a-f]{40}$|^[0-9a-f]{64}$")
+
+class BlobStore:
+    """README text keyed by git blob SHA, plus a repository -> blob map."""
+
+    def __init__(self, directory: Optional[Path] = None):
+        """Initialize the store in the given directory."""
+        self.directory = Path(directory) if directory else cache_dir("readmes")
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _blob_path(self, sha: str) -> Path:
+        """Return the file holding a blob."""
+        return self.directory / "objects" / sha[:2] / f"{sha}.z"
+
+    def _ref_path(self, repo_name: str) -> Path:
+        """Return the file holding a repository's ref."""
+        owner, _, name = repo_name.lower().partition("/")
+        return self.directory / "refs" / owner / f"{name}.ref"
+
+    def has(self, sha: str) -> bool:
+        """Return True if a blob is stored."""
+        return bool(_SHA.match(sha)) and self._blob_path(sha).exists()
+
+    def get(self, sha: str) -> Optional[str]:
+        """Return the text of a blob, or None if it is not stored."""
+        if not _SHA.match(sha):
+            return None
+        try:
+            with open(self._blob_path(sha), "rb") as f:
+                return zlib.decompress(f.read()).decode("utf-8")
+        except (OSError, zlib.error, UnicodeDecodeError):
+            return None
+
+    def put(self, sha: str, text: str) -> None:
+        """Store a blob. Blobs never change, so an existing one is kept."""
+        if not _SHA.match(sha) or self.has(sha):
+            return
+        self._write(self._blob_path(sha), zlib.compress(text.encode("utf-8"), 6))
+
+    def ref(self, repo_name: str) -> Optional[Tuple[str, str]]:
+        """Return the (sha, path) a repository's README was last seen at."""
+        try:
+            with open(self._ref_path(repo_name), "r", encoding="utf-8") as f:
+                sha, _, path = f.read().strip().partition(" ")
+        except OSError:
+            return None
+        return (sha, path) if _SHA.match(sha) and path else None
+
+    def set_ref(self, repo_name: str, sha: str, path: str) -> None:
+        """Record where a repository's README is."""
+        if not _SHA.match(sha) or "/" not in repo_name or self.ref(repo_name) == (sha, path):
+            return
+        self._write(self._ref_path(repo_name), f"{sha} {path}\n".encode("utf-8"))
+
+    def _write(self, path: Path, data: bytes) -> None:
+        """Atomically write a file so concurrent readers never see partial data."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            # A store that cannot be written just means downloading again
+            pass
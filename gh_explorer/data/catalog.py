@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Catalog of GitHub languages and topics with fuzzy lookup
+
+A compact catalog ships with the package (catalog.json next to this module):
+for each language and popular topic, its canonical name, a popularity
+weight (roughly its number of repositories) and common aliases. Refreshed
+weights and newly discovered topics are kept in an overlay in the data
+directory, so the bundled file never needs rewriting.
+
+Lookups go through a trigram index: the trigrams a query shares with each
+name or alias pick a shortlist, which is re-ranked by edit distance and
+popularity. Only exact names and aliases are substituted for what the user
+typed; typos such as "pyhton" get a suggestion without a search request.
+"""
+
+import heapq
+import json
+import math
+import os
+import re
+import tempfile
+import time
+from bisect import bisect_left
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from gh_explorer.utils.paths import data_dir
+
+CATALOG_FILE = Path(__file__).with_name("catalog.json")
+OVERLAY_FILE = "catalog.json"
+
+KINDS = ("languages", "topics")
+
+# Similarity a fuzzy match needs before it is suggested
+SUGGEST_THRESHOLD = 0.75
+
+# ...and must be this much more similar than the next best match
+SUGGEST_MARGIN = 0.05
+
+# Shorter input only matches exact names and aliases
+MIN_FUZZY_LENGTH = 3
+
+# Candidates taken from the trigram index before re-ranking
+SHORTLIST = 12
+
+_SEPARATORS = re.compile(r"[\s_\-]+")
+
+def normalize(text: str) -> str:
+    """Fold case and drop separators, so "Vim script" == "vim-script"."""
+    return _SEPARATORS.sub("", text.casefold())
+
+def trigrams(key: str) -> List[str]:
+    """Trigrams of a normalized key, padded so starts and ends count."""
+    padded = f"  {key} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal-string-alignment distance (transpositions cost 1), capped at limit + 1."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        best = i
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+            best = min(best, value)
+        if best > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+class Entry(NamedTuple):
+    """A language or topic."""
+    name: str
+    weight: int
+    aliases: Tuple[str, ...]
+
+class Match(NamedTuple):
+    """A ranked lookup result; `matched` is the name or alias that matched."""
+    name: str
+    score: float
+    similarity: float
+    matched: str
+
+class FuzzyIndex:
+    """Trigram index over the names and aliases of catalog entries."""
+
+    def __init__(self, entries: Iterable[Entry]):
+        """Index the entries; each name and alias becomes one term."""
+        self.entries: List[Entry] = list(entries)
+        self._keys: List[str] = []
+        self._texts: List[str] = []
+        self._owners: List[int] = []
+        self._exact: Dict[str, int] = {}
+        self._postings: Dict[str, List[int]] = {}
+        # Canonical names win over other entries' aliases
+        for index, entry in enumerate(self.entries):
+            self._add_term(entry.name, index)
+        for index, entry in enumerate(self.entries):
+            for alias in entry.aliases:
+                self._add_term(alias, index)
+        self._sorted = sorted(range(len(self._keys)), key=self._keys.__getitem__)
+        self._sorted_keys = [self._keys[term] for term in self._sorted]
+        top = max((entry.weight for entry in self.entries), default=1)
+        self._log_top = math.log1p(max(top, 1))
+
+    def _add_term(self, text: str, owner: int) -> None:
+        key = normalize(text)
+        if not key or key in self._exact:
+            return
+        term = len(self._keys)
+        self._keys.append(key)
+        self._texts.append(text)
+        self._owners.append(owner)
+        self._exact[key] = term
+        for gram in set(trigrams(key)):
+            self._postings.setdefault(gram, []).append(term)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def exact(self, text: str) -> Optional[Entry]:
+        """Return the entry whose name or alias is `text`, ignoring case and separators."""
+        term = self._exact.get(normalize(text))
+        return self.entries[self._owners[term]] if term is not None else None
+
+    def _popularity(self, owner: int) -> float:
+        return math.log1p(max(self.entries[owner].weight, 0)) / self._log_top
+
+    def _candidates(self, key: str) -> List[int]:
+        """Terms most similar to the key by shared trigrams, plus prefix matches."""
+        grams = set(trigrams(key))
+        shared = Counter()
+        for gram in grams:
+            for term in self._postings.get(gram, ()):
+                shared[term] += 1
+        # Dice coefficient, so long terms sharing a few common trigrams
+        # do not crowd out close matches
+        keys = self._keys
+        candidates = heapq.nlargest(SHORTLIST, shared,
+                                    key=lambda term: shared[term] / (len(grams) + len(keys[term]) + 1))
+        start = bisect_left(self._sorted_keys, key)
+        for position in range(start, min(start + SHORTLIST, len(self._sorted))):
+            if not self._sorted_keys[position].startswith(key):
+                break
+            candidates.append(self._sorted[position])
+        return candidates
+
+    def search(self, text: str, limit: int = 10) -> List[Match]:
+        """Return up to `limit` entries best matching `text`, best first.
+
+        Similarity is 1 for an exact name or alias, high for a prefix of one
+        and otherwise falls with edit distance. Popularity breaks near-ties,
+        so "py" ranks Python above rarer languages starting with "py".
+        """
+        key = normalize(text)
+        if not key:
+            return []
+        best: Dict[int, Match] = {}
+        for term in self._candidates(key):
+            candidate = self._keys[term]
+            if candidate == key:
+                similarity = 1.0
+            elif candidate.startswith(key):
+                similarity = 0.5 + 0.45 * len(key) / len(candidate)
+            else:
+                limit_distance = max(1, len(key) // 3)
+                distance = edit_distance(key, candidate, limit_distance)
+                if distance > limit_distance:
+                    continue
+                similarity = 1.0 - distance / max(len(key), len(candidate))
+            owner = self._owners[term]
+            score = similarity + 0.1 * self._popularity(owner)
+            if owner not in best or score > best[owner].score:
+                best[owner] = Match(self.entries[owner].name, score, similarity, self._texts[term])
+        return sorted(best.values(), key=lambda match: -match.score)[:limit]
+
+    def resolve(self, text: str) -> Optional[Match]:
+        """Return the entry `text` names exactly, by name or alias.
+
+        Case and separators are ignored. Anything else is left alone:
+        topics are literal tags, so "vue3" must not become "vue".
+        """
+        entry = self.exact(text)
+        return Match(entry.name, 1.1, 1.0, text) if entry is not None else None
+
+    def suggest(self, text: str) -> Optional[Match]:
+        """Return the close match `text` was most likely meant as, or None.
+
+        The match must be similar enough and clearly ahead of the
+        runner-up; it is only a suggestion, never applied by itself.
+        """
+        if self.exact(text) is not None or len(normalize(text)) < MIN_FUZZY_LENGTH:
+            return None
+        matches = self.search(text, limit=2)
+        if not matches or matches[0].similarity < SUGGEST_THRESHOLD:
+            return None
+        if len(matches) > 1 and matches[0].similarity - matches[1].similarity < SUGGEST_MARGIN:
+            return None
+        return matches[0]
+
+def _read(path: Path) -> Dict[str, Any]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+class Catalog:
+    """The bundled catalog merged with the local overlay."""
+
+    def __init__(self, bundled: Optional[Path] = None, overlay: Optional[Path] = None):
+        """Load both files; a missing or damaged overlay is ignored."""
+        self.bundled_path = Path(bundled or CATALOG_FILE)
+        self.overlay_path = Path(overlay) if overlay else data_dir() / OVERLAY_FILE
+        self._bundled = _read(self.bundled_path)
+        self._overlay = _read(self.overlay_path)
+        self._indexes: Dict[str, FuzzyIndex] = {}
+
+    def entries(self, kind: str) -> List[Entry]:
+        """All entries of a kind, most popular first."""
+        merged: Dict[str, Entry] = {}
+        for name, weight, aliases in self._bundled.get(kind, []):
+            merged[normalize(name)] = Entry(name, int(weight), tuple(aliases))
+        for name, record in self._overlay.get(kind, {}).items():
+            key = normalize(name)
+            known = merged.get(key)
+            aliases = tuple(dict.fromkeys((known.aliases if known else ()) + tuple(record.get("aliases", ()))))
+            weight = record.get("weight", known.weight if known else 0)
+            merged[key] = Entry(known.name if known else name, int(weight), aliases)
+        return sorted(merged.values(), key=lambda entry: -entry.weight)
+
+    def index(self, kind: str) -> FuzzyIndex:
+        """Return the (cached) fuzzy index of a kind."""
+        if kind not in KINDS:
+            raise ValueError(f"Unknown catalog kind: {kind}")
+        if kind not in self._indexes:
+            self._indexes[kind] = FuzzyIndex(self.entries(kind))
+        return self._indexes[kind]
+
+    def search(self, kind: str, text: str, limit: int = 10) -> List[Match]:
+        return self.index(kind).search(text, limit)
+
+    def resolve(self, kind: str, text: str) -> Optional[Match]:
+        return self.index(kind).resolve(text)
+
+    def suggest(self, kind: str, text: str) -> Optional[Match]:
+        return self.index(kind).suggest(text)
+
+    def refreshed_at(self, kind: str, name: str) -> float:
+        """When an entry's weight was last refreshed (0 if never)."""
+        return self._overlay.get(kind, {}).get(name, {}).get("refreshed", 0.0)
+
+    def update(self, kind: str, name: str, weight: Optional[int] = None,
+               aliases: Iterable[str] = ()) -> None:
+        """Record a new weight and/or aliases for an entry, adding it if new."""
+        records = self._overlay.setdefault(kind, {})
+        record = records.setdefault(name, {})
+        if weight is not None:
+            record["weight"] = int(weight)
+            record["refreshed"] = time.time()
+        new_aliases = [alias for alias in aliases if normalize(alias) != normalize(name)]
+        if new_aliases:
+            record["aliases"] = list(dict.fromkeys(record.get("aliases", []) + new_aliases))
+        self._indexes.pop(kind, None)
+
+    def save(self) -> None:
+        """Atomically write the overlay."""
+        self._overlay["version"] = 1
+        self.overlay_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.overlay_path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self._overlay, f, separators=(",", ":"), ensure_ascii=False)
+        os.replace(tmp, self.overlay_path)
+
+    def stalest(self, kind: str, count: int) -> List[Entry]:
+        """The `count` entries refreshed longest ago, popular ones first among equals."""
+        entries = self.entries(kind)
+        entries.sort(key=lambda entry: self.refreshed_at(kind, entry.name))
+        return entries[:count]
+
+_catalog: Optional[Catalog] = None
+
+def get_catalog() -> Catalog:
+    """Return the shared catalog, loading it on first use."""
+    global _catalog
+    if _catalog is None:
+        _catalog = Catalog()
+    return _catalog
+
+def _count_query(kind: str, name: str) -> str:
+    qualifier = "language" if kind == "languages" else "topic"
+    return f'{qualifier}:"{name}"' if " " in name else f"{qualifier}:{name}"
+
+def refresh_catalog(catalog: Catalog,
+                    client: Any,
+                    kinds: Iterable[str] = KINDS,
+                    limit: int = 30,
+                    discover: bool = False,
+                    on_entry: Optional[Callable[[str, str, int], None]] = None) -> int:
+    """Refresh the weights of the `limit` stalest entries from live counts.
+
+    Each entry costs one search request (its total_count), so refreshing a
+    few entries per run keeps within the search rate limit; over repeated
+    runs the whole catalog cycles through. With `discover`, GitHub's
+    featured topics are added first. `on_entry(kind, name, weight)` is
+    called after each refresh. Returns the number of entries refreshed.
+    """
+    from urllib.parse import urlencode
+
+    kinds = list(kinds)
+    if discover and "topics" in kinds:
+        page = 1
+        while True:
+            data = json.loads(client.run_command(
+                ["api", "search/topics?" + urlencode({"q": "is:featured", "per_page": 100, "page": page})]
+            ))
+            items = data.get("items") or []
+            known = catalog.index("topics")
+            for item in items:
+                if item.get("name") and known.exact(item["name"]) is None:
+                    catalog.update("topics", item["name"])
+            if len(items) < 100:
+                break
+            page += 1
+        catalog.save()
+
+    refreshed = 0
+    # Alternate kinds so a small limit still touches both
+    queue: List[Tuple[str, Entry]] = []
+    stalest = {kind: catalog.stalest(kind, limit) for kind in kinds}
+    for position in range(limit):
+        for kind in kinds:
+            if position < len(stalest[kind]):
+                queue.append((kind, stalest[kind][position]))
+    for kind, entry in queue[:limit]:
+        query = urlencode({"q": _count_query(kind, entry.name), "per_page": 1})
+        data = json.loads(client.run_command(["api", f"search/repositories?{query}"]))
+        weight = int(data.get("total_count") or 0)
+        catalog.update(kind, entry.name, weight=weight)
+        # Saved as it goes, so an interrupted refresh keeps its progress
+        catalog.save()
+        refreshed += 1
+        if on_entry is not None:
+            on_entry(kind, entry.name, weight)
+    return refreshed
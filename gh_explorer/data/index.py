@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Offline full-text index of repositories ghx has fetched
+
+Search results and repository details are stored in a local SQLite database
+with an FTS5 index over names, descriptions, languages and READMEs, so
+repositories seen before can be searched without network access.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from gh_explorer.api.models import RepoResultSet
+from gh_explorer.utils.paths import data_dir
+
+INDEX_FILE = "index.sqlite3"
+
+# 2 added repos.topics
+SCHEMA_VERSION = 2
+
+# Characters of each README that semantic search reads
+README_HEAD = 2000
+
+# Placeholder the client stores when a repository has no README
+NO_README = "No README available."
+
+# bm25() weights, in repos_fts column order: a hit in the name counts far
+# more than one somewhere in a long README
+BM25_WEIGHTS = (10.0, 4.0, 2.0, 1.0)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS repos (
+    id INTEGER PRIMARY KEY,
+    full_name TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    description TEXT,
+    stars INTEGER NOT NULL DEFAULT 0,
+    forks INTEGER NOT NULL DEFAULT 0,
+    language TEXT,
+    url TEXT,
+    updated_at TEXT,
+    readme TEXT,
+    indexed_at REAL NOT NULL,
+    topics TEXT
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS repos_fts USING fts5(
+    full_name, description, language, readme,
+    content='repos', content_rowid='id',
+    tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS repos_ai AFTER INSERT ON repos BEGIN
+    INSERT INTO repos_fts(rowid, full_name, description, language, readme)
+    VALUES (new.id, new.full_name, new.description, new.language, new.readme);
+END;
+
+CREATE TRIGGER IF NOT EXISTS repos_ad AFTER DELETE ON repos BEGIN
+    INSERT INTO repos_fts(repos_fts, rowid, full_name, description, language, readme)
+    VALUES ('delete', old.id, old.full_name, old.description, old.language, old.readme);
+END;
+
+CREATE TRIGGER IF NOT EXISTS repos_au AFTER UPDATE ON repos BEGIN
+    INSERT INTO repos_fts(repos_fts, rowid, full_name, description, language, readme)
+    VALUES ('delete', old.id, old.full_name, old.description, old.language, old.readme);
+    INSERT INTO repos_fts(rowid, full_name, description, language, readme)
+    VALUES (new.id, new.full_name, new.description, new.language, new.readme);
+END;
+"""
+
+# Search results carry no README or topics, so an update keeps those already stored
+_UPSERT = """
+INSERT INTO repos (full_name, description, stars, forks, language, url, updated_at, readme, indexed_at, topics)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(full_name) DO UPDATE SET
+    full_name = excluded.full_name,
+    description = excluded.description,
+    stars = excluded.stars,
+    forks = excluded.forks,
+    language = excluded.language,
+    url = excluded.url,
+    updated_at = excluded.updated_at,
+    readme = COALESCE(excluded.readme, repos.readme),
+    indexed_at = excluded.indexed_at,
+    topics = COALESCE(excluded.topics, repos.topics)
+"""
+
+# gh search qualifiers the offline search understands
+_QUALIFIER = re.compile(r"^(language|user|org|repo):(\S+)$", re.IGNORECASE)
+
+_Row = Tuple[str, Optional[str], int, int, Optional[str], Optional[str], Optional[str], Optional[str], float,
+             Optional[str]]
+
+def _search_row(repo: Dict[str, Any], now: float) -> _Row:
+    """Index row for a search result (gh search repos --json fields)."""
+    return (
+        repo.get("fullName"),
+        repo.get("description"),
+        int(repo.get("stargazersCount") or 0),
+        int(repo.get("forksCount") or 0),
+        repo.get("language") or None,
+        repo.get("url"),
+        repo.get("updatedAt"),
+        None,
+        now,
+        None,
+    )
+
+def _details_row(details: Dict[str, Any], now: float) -> _Row:
+    """Index row for repository details (the result of get_repository)."""
+    language = details.get("primaryLanguage") or {}
+    readme = (details.get("readme") or {}).get("text")
+    topics = [topic.get("name") for topic in details.get("repositoryTopics") or [] if topic.get("name")]
+    return (
+        details.get("nameWithOwner"),
+        details.get("description"),
+        int(details.get("stargazerCount") or 0),
+        int(details.get("forkCount") or 0),
+        language.get("name") if isinstance(language, dict) else language,
+        details.get("url"),
+        details.get("updatedAt"),
+        readme if readme and readme != NO_README else None,
+        now,
+        # Space-separated; None keeps topics stored earlier
+        " ".join(topics) if topics else None,
+    )
+
+def build_match_query(text: str) -> str:
+    """Turn free text into an FTS5 query that ANDs every word.
+
+    Words are quoted so FTS5 operators and punctuation in the input are
+    matched literally instead of being parsed.
+    """
+    terms = re.findall(r"\w+", text)
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+class RepoIndex:
+    """SQLite FTS5 index of repository records and READMEs."""
+
+    def __init__(self, path: Optional[str] = None):
+        """Initialize the index; the database is opened on first use.
+
+        The default location is the gh-explorer data directory, or
+        GHX_INDEX_PATH when set.
+        """
+        self.path = path or os.environ.get("GHX_INDEX_PATH")
+        self._conn: Optional[sqlite3.Connection] = None
+        # The async client writes from worker threads
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database and create the schema if needed."""
+        if self._conn is None:
+            path = self.path or str(data_dir() / INDEX_FILE)
+            conn = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+            # Readers (e.g. an --offline search) never block a writer
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                conn.executescript(_SCHEMA)
+                if version == 1:
+                    conn.execute("ALTER TABLE repos ADD COLUMN topics TEXT")
+                conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            self._conn = conn
+        return self._conn
+
+    def _upsert(self, rows: Iterable[_Row]) -> int:
+        rows = [row for row in rows if row[0]]
+        if not rows:
+            return 0
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(_UPSERT, rows)
+        return len(rows)
+
+    def add_search_results(self, repos: Iterable[Dict[str, Any]]) -> int:
+        """Index repository search results; return how many were stored."""
+        now = time.time()
+        return self._upsert(_search_row(repo, now) for repo in repos)
+
+    def add_repositories(self, repos: Iterable[Dict[str, Any]]) -> int:
+        """Index repository details including their READMEs."""
+        now = time.time()
+        return self._upsert(_details_row(details, now) for details in repos)
+
+    def add_repository(self, details: Dict[str, Any]) -> int:
+        """Index one repository's details including its README."""
+        return self.add_repositories([details])
+
+    def search(self,
+               query: str,
+               limit: int = 20,
+               language: Optional[str] = None) -> RepoResultSet:
+        """Search the index, best BM25 match first.
+
+        `query` may contain language:, user:, org: and repo: qualifiers like
+        a gh search. Results have the fields of search_repositories.
+        """
+        words = []
+        conditions = []
+        params: List[Any] = []
+        for token in query.split():
+            qualifier = _QUALIFIER.match(token)
+            if not qualifier:
+                words.append(token)
+                continue
+            name, value = qualifier.group(1).lower(), qualifier.group(2)
+            if name == "language":
+                language = value
+            elif name == "repo":
+                conditions.append("r.full_name = ?")
+                params.append(value)
+            else:
+                conditions.append("r.full_name LIKE ? ESCAPE '\\'")
+                params.append(value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "/%")
+        if language:
+            conditions.append("r.language = ? COLLATE NOCASE")
+            params.append(language)
+
+        match = build_match_query(" ".join(words))
+        if match:
+            weights = ", ".join(str(weight) for weight in BM25_WEIGHTS)
+            sql = (
+                "SELECT r.full_name, r.description, r.stars, r.forks, r.updated_at, r.url, r.language "
+                f"FROM repos_fts JOIN repos r ON r.id = repos_fts.rowid WHERE repos_fts MATCH ?"
+            )
+            params.insert(0, match)
+            order = f"bm25(repos_fts, {weights}), r.stars DESC"
+        else:
+            # Only qualifiers: list matching repositories by popularity
+            sql = ("SELECT r.full_name, r.description, r.stars, r.forks, r.updated_at, r.url, r.language "
+                   "FROM repos r WHERE 1")
+            order = "r.stars DESC"
+        for condition in conditions:
+            sql += f" AND {condition}"
+        sql += f" ORDER BY {order}"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._connect().execute(sql, params).fetchall()
+        return RepoResultSet.from_dicts(
+            dict(zip(RepoResultSet.FIELDS, row)) for row in rows
+        )
+
+    def changed_since(self, since: float, batch: int = 1000) -> Iterator[List[Tuple[Any, ...]]]:
+        """Yield batches of (id, full_name, description, language, topics,
+        readme head, indexed_at) for repositories indexed after `since`,
+        oldest first.
+        """
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self._connect().execute(
+                    "SELECT id, full_name, description, language, topics, substr(readme, 1, ?), indexed_at "
+                    "FROM repos WHERE indexed_at > ? AND id > ? ORDER BY id LIMIT ?",
+                    (README_HEAD, since, last_id, batch)
+                ).fetchall()
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1][0]
+
+    def repo_id(self, full_name: str) -> Optional[int]:
+        """Return the row id of an indexed repository."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT id FROM repos WHERE full_name = ?", (full_name,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get_by_ids(self, ids: Sequence[int],
+                   language: Optional[str] = None,
+                   topic: Optional[str] = None) -> RepoResultSet:
+        """Return repositories by row id, in the order given, as search results.
+
+        Rows not matching `language` or `topic` (when given) are left out.
+        """
+        if not ids:
+            return RepoResultSet.from_dicts([])
+        placeholders = ",".join("?" * len(ids))
+        sql = ("SELECT id, full_name, description, stars, forks, updated_at, url, language "
+               f"FROM repos WHERE id IN ({placeholders})")
+        params: List[Any] = list(ids)
+        if language:
+            sql += " AND language = ? COLLATE NOCASE"
+            params.append(language)
+        if topic:
+            sql += " AND ' ' || topics || ' ' LIKE ?"
+            params.append(f"% {topic.lower()} %")
+        with self._lock:
+            rows = {row[0]: row[1:] for row in self._connect().execute(sql, params)}
+        return RepoResultSet.from_dicts(
+            dict(zip(RepoResultSet.FIELDS, rows[i])) for i in ids if i in rows
+        )
+
+    def count(self) -> int:
+        """Return the number of indexed repositories."""
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM repos").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
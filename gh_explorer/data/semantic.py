@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Offline similarity search over indexed repositories
+
+Each repository in the offline index (see gh_explorer.data.index) is turned
+into a hashed TF-IDF vector of its name, topics, description, language and
+the start of its README. Feature hashing projects the sparse vector onto a
+small number of dimensions, which is stored L2-normalized as int8 in one
+memory-mapped NumPy matrix whose row is the repository's index row id.
+The matrix is brought up to date incrementally from the index's
+indexed_at timestamps before each query, and a query is one chunked
+matrix-vector product followed by a top-k partition.
+
+NumPy is optional: install gh-explorer[semantic].
+"""
+
+import json
+import math
+import os
+import re
+import tempfile
+import zlib
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency, checked when a store is opened
+    np = None
+
+from gh_explorer.api.models import RepoResultSet
+from gh_explorer.data.index import RepoIndex
+from gh_explorer.utils.paths import data_dir
+
+# Dimensions of the hashed vectors. 256 int8 columns keep a million
+# repositories in 256 MB with cosine errors around 0.05.
+DIMENSIONS = 256
+
+# Buckets used to count document frequencies of hashed features
+DF_BUCKETS = 1 << 20
+
+# Bump when the features change; older stores are then rebuilt
+FEATURE_VERSION = 1
+
+# Lowest cosine reported; below it hash collisions outweigh real overlap
+MIN_SCORE = 0.1
+
+# Rows scored per matrix-vector product, bounding temporary memory
+CHUNK_ROWS = 1 << 16
+
+# How much a feature counts depending on where it occurs
+FIELD_WEIGHTS = {
+    "name": 3.0,
+    "topic": 2.5,
+    "description": 1.5,
+    "language": 1.0,
+    "readme": 1.0,
+}
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#]*")
+_CAMEL = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_MARKUP = re.compile(r"https?://\S+|<[^>]*>|!\[[^\]]*\]\([^)]*\)|[`*_#>\[\]()|]")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this "
+    "to was were will with you your we our can use using used".split()
+)
+
+def require_numpy() -> None:
+    """Raise a helpful error when the optional NumPy dependency is missing."""
+    if np is None:
+        raise RuntimeError(
+            "Semantic search needs NumPy. Install it with: pip install 'gh-explorer[semantic]'"
+        )
+
+def words(text: str) -> List[str]:
+    """Lowercase words of a text, splitting camelCase, without stopwords."""
+    text = _CAMEL.sub(" ", text or "").lower()
+    return [word for word in _WORD.findall(text) if word not in _STOPWORDS and len(word) > 1]
+
+def features(full_name: str = "",
+             description: Optional[str] = None,
+             language: Optional[str] = None,
+             topics: Optional[str] = None,
+             readme: Optional[str] = None) -> Dict[str, float]:
+    """Weighted term frequencies of a repository's text fields.
+
+    Features are words and adjacent word pairs; topics and the language
+    also count as whole tokens, so "machine-learning" matches exactly.
+    """
+    weights: Counter = Counter()
+
+    def add(tokens: Iterable[str], weight: float) -> None:
+        for token in tokens:
+            weights[token] += weight
+
+    def add_text(text: Optional[str], weight: float) -> None:
+        tokens = words(text or "")
+        add(tokens, weight)
+        add((f"{a} {b}" for a, b in zip(tokens, tokens[1:])), weight * 0.5)
+
+    add_text(full_name.partition("/")[2].replace("-", " ").replace("_", " "), FIELD_WEIGHTS["name"])
+    for topic in (topics or "").split():
+        weights[f"topic:{topic.lower()}"] += FIELD_WEIGHTS["topic"]
+        add(words(topic.replace("-", " ")), FIELD_WEIGHTS["topic"] * 0.5)
+    add_text(description, FIELD_WEIGHTS["description"])
+    if language:
+        weights[f"language:{language.lower()}"] += FIELD_WEIGHTS["language"]
+    if readme:
+        add_text(_MARKUP.sub(" ", readme), FIELD_WEIGHTS["readme"])
+    # Sublinear term frequency, so a word repeated all over a README does
+    # not drown out the name and description
+    return {token: 1.0 + math.log(weight) if weight > 1 else weight for token, weight in weights.items()}
+
+def query_features(text: str) -> Dict[str, float]:
+    """Features of a free-text query.
+
+    Query words may name a topic or language as well as appear in text,
+    so each also counts as those whole tokens.
+    """
+    tokens = words(text)
+    weights: Dict[str, float] = {}
+    for token in tokens:
+        weights[token] = weights.get(token, 0.0) + 1.0
+        weights[f"topic:{token}"] = 1.0
+        weights[f"language:{token}"] = 1.0
+    for a, b in zip(tokens, tokens[1:]):
+        weights[f"{a} {b}"] = 0.5
+        weights[f"topic:{a}-{b}"] = 1.0
+    return weights
+
+def _hash(token: str) -> int:
+    """A stable 32-bit hash (the builtin hash() changes between runs).
+
+    CRC32 is linear, so two words colliding would also collide with any
+    common prefix ("topic:..."); the MurmurHash3 finalizer breaks that.
+    """
+    h = zlib.crc32(token.encode("utf-8"))
+    h = ((h ^ (h >> 16)) * 0x85EBCA6B) & 0xFFFFFFFF
+    h = ((h ^ (h >> 13)) * 0xC2B2AE35) & 0xFFFFFFFF
+    return h ^ (h >> 16)
+
+class SemanticStore:
+    """Hashed TF-IDF vectors of indexed repositories, kept in sync with the index.
+
+    Files (in the data directory unless `directory` is given):
+    semantic.i8 holds the int8 matrix, semantic-df.npy the document
+    frequency buckets and semantic.json the dimensions, the number of
+    documents counted and the indexed_at the store is synced up to.
+    """
+
+    def __init__(self, index: Optional[RepoIndex] = None, directory: Optional[Path] = None):
+        """Open (or start) the store for an index; nothing is read until used."""
+        require_numpy()
+        self.index = index if index is not None else RepoIndex()
+        self.directory = Path(directory) if directory else data_dir()
+        self.matrix_path = self.directory / "semantic.i8"
+        self.df_path = self.directory / "semantic-df.npy"
+        self.meta_path = self.directory / "semantic.json"
+        self._meta: Optional[Dict[str, float]] = None
+        self._df = None
+        self._matrix = None
+
+    # -- persistence -----------------------------------------------------
+
+    def _load(self) -> None:
+        if self._meta is not None:
+            return
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = {}
+        if meta.get("version") != FEATURE_VERSION or meta.get("dimensions") != DIMENSIONS:
+            # Missing, or built with other features: start over
+            meta = {"version": FEATURE_VERSION, "dimensions": DIMENSIONS,
+                    "documents": 0, "synced": 0.0, "rows": 0}
+            self._df = np.zeros(DF_BUCKETS, dtype=np.int32)
+            for path in (self.matrix_path, self.df_path):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+        else:
+            try:
+                self._df = np.load(self.df_path)
+            except (OSError, ValueError):
+                self._df = np.zeros(DF_BUCKETS, dtype=np.int32)
+        self._meta = meta
+        self._matrix = self._open_matrix(int(meta["rows"]))
+
+    def _open_matrix(self, rows: int):
+        if rows == 0:
+            return np.zeros((0, DIMENSIONS), dtype=np.int8)
+        return np.memmap(self.matrix_path, dtype=np.int8, mode="r+", shape=(rows, DIMENSIONS))
+
+    def _grow(self, rows: int) -> None:
+        """Make room for `rows` rows, at least doubling to keep growth cheap."""
+        current = self._matrix.shape[0]
+        if rows <= current:
+            return
+        rows = max(rows, current * 2, 1024)
+        if isinstance(self._matrix, np.memmap):
+            self._matrix.flush()
+        self._matrix = None
+        with open(self.matrix_path, "ab") as f:
+            f.truncate(rows * DIMENSIONS)
+        self._meta["rows"] = rows
+        self._matrix = self._open_matrix(rows)
+
+    def _save(self) -> None:
+        if isinstance(self._matrix, np.memmap):
+            self._matrix.flush()
+        self._write_atomic(self.df_path, lambda f: np.save(f, self._df), binary=True)
+        self._write_atomic(self.meta_path, lambda f: json.dump(self._meta, f))
+
+    def _write_atomic(self, path: Path, write, binary: bool = False) -> None:
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb" if binary else "w") as f:
+            write(f)
+        os.replace(tmp, path)
+
+    # -- vectors ---------------------------------------------------------
+
+    def _idf(self, hashes: "np.ndarray") -> "np.ndarray":
+        documents = max(self._meta["documents"], 1)
+        df = self._df[hashes & (DF_BUCKETS - 1)]
+        return np.log((documents + 1) / (df + 1)) + 1.0
+
+    def vectorize(self, weights: Dict[str, float], known_only: bool = False) -> "np.ndarray":
+        """Project weighted features onto a unit float32 vector.
+
+        With `known_only`, features no indexed repository has are dropped:
+        they cannot match anything and would only add collision noise.
+        """
+        vector = np.zeros(DIMENSIONS, dtype=np.float32)
+        if not weights:
+            return vector
+        hashes = np.fromiter((_hash(token) for token in weights), dtype=np.int64, count=len(weights))
+        values = np.fromiter(weights.values(), dtype=np.float32, count=len(weights)) * self._idf(hashes)
+        if known_only:
+            values[self._df[hashes & (DF_BUCKETS - 1)] == 0] = 0
+        # Low bits pick the DF bucket; higher bits the dimension and sign
+        dims = (hashes >> 20) % DIMENSIONS
+        signs = np.where(hashes & (1 << 31), -1.0, 1.0).astype(np.float32)
+        np.add.at(vector, dims, signs * values)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    @staticmethod
+    def _quantize(vector: "np.ndarray") -> "np.ndarray":
+        return np.clip(np.rint(vector * 127), -127, 127).astype(np.int8)
+
+    # -- sync ------------------------------------------------------------
+
+    def sync(self) -> int:
+        """Vectorize repositories indexed since the last sync; return how many."""
+        self._load()
+        changed = 0
+        for batch in self.index.changed_since(self._meta["synced"]):
+            pending = []
+            for repo_id, full_name, description, language, topics, readme, indexed_at in batch:
+                weights = features(full_name, description, language, topics, readme)
+                hashes = np.fromiter((_hash(token) for token in weights), dtype=np.int64, count=len(weights))
+                # Counted once per repository; an updated repository counts
+                # again, which only slightly lowers the IDF of its terms
+                np.add.at(self._df, np.unique(hashes & (DF_BUCKETS - 1)), 1)
+                self._meta["documents"] += 1
+                pending.append((repo_id, weights))
+                self._meta["synced"] = max(self._meta["synced"], indexed_at)
+            self._grow(max(repo_id for repo_id, _ in pending) + 1)
+            for repo_id, weights in pending:
+                self._matrix[repo_id] = self._quantize(self.vectorize(weights))
+            changed += len(pending)
+        if changed:
+            self._save()
+        return changed
+
+    # -- queries ---------------------------------------------------------
+
+    def top_k(self, query: "np.ndarray", k: int, exclude: Sequence[int] = ()) -> List[Tuple[int, float]]:
+        """Return (row id, cosine) of the k rows most similar to a unit vector."""
+        self._load()
+        rows = self._matrix.shape[0]
+        if rows == 0 or k <= 0 or not query.any():
+            return []
+        want = k + len(exclude)
+        best_ids: List["np.ndarray"] = []
+        best_scores: List["np.ndarray"] = []
+        for start in range(0, rows, CHUNK_ROWS):
+            chunk = np.asarray(self._matrix[start:start + CHUNK_ROWS], dtype=np.float32)
+            scores = chunk @ query
+            if len(scores) > want:
+                top = np.argpartition(scores, -want)[-want:]
+            else:
+                top = np.arange(len(scores))
+            best_ids.append(top + start)
+            best_scores.append(scores[top])
+        ids = np.concatenate(best_ids)
+        scores = np.concatenate(best_scores) / 127.0
+        order = np.argsort(-scores)
+        skip = set(exclude)
+        results = []
+        for i in order:
+            if scores[i] < MIN_SCORE or len(results) >= k:
+                break
+            if int(ids[i]) not in skip:
+                results.append((int(ids[i]), float(scores[i])))
+        return results
+
+    def _results(self, hits: List[Tuple[int, float]], limit: int,
+                 language: Optional[str], topic: Optional[str]) -> RepoResultSet:
+        repos = self.index.get_by_ids([repo_id for repo_id, _ in hits], language=language, topic=topic)
+        return repos[:limit] if len(repos) > limit else repos
+
+    def search(self, text: str, limit: int = 20,
+               language: Optional[str] = None, topic: Optional[str] = None) -> RepoResultSet:
+        """Repositories most similar to free text, best first."""
+        self.sync()
+        hits = self.top_k(self.vectorize(query_features(text), known_only=True), limit * 5 if language or topic else limit)
+        return self._results(hits, limit, language, topic)
+
+    def related(self, full_name: str, limit: int = 20,
+                language: Optional[str] = None, topic: Optional[str] = None) -> RepoResultSet:
+        """Repositories most similar to an indexed repository, best first.
+
+        Raises KeyError if the repository is not in the index.
+        """
+        self.sync()
+        repo_id = self.index.repo_id(full_name)
+        if repo_id is None or repo_id >= self._matrix.shape[0]:
+            raise KeyError(full_name)
+        vector = self._matrix[repo_id].astype(np.float32)
+        norm = np.linalg.norm(vector)
+        if not norm:
+            return RepoResultSet.from_dicts([])
+        # Over-fetch when filtering, since filters apply after ranking
+        hits = self.top_k(vector / norm, limit * 5 if language or topic else limit, exclude=[repo_id])
+        return self._results(hits, limit, language, topic)
@@ -3,10 +3,12 @@
 Repository search screen for GitHub Explorer
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Sequence
+from rich.markup import escape
 from rich.panel import Panel
 from rich.text import Text
 
+from gh_explorer.data.catalog import get_catalog, normalize
 from gh_explorer.utils.formatting import format_repo_list
 from gh_explorer.ui.widgets.repo_browser import RepoBrowser
 
@@ -26,8 +28,8 @@ def search_repos_interactive(ctx: Dict[str, Any]) -> None:
     # Allow filtering options
     console.print()
     console.print("[bold]Filter options (press Enter to skip):[/bold]")
-    language = console.input("Language: ")
-    topic = console.input("Topic: ")
+    language = ask_catalog_value(console, "Language: ", "languages")
+    topic = ask_catalog_value(console, "Topic: ", "topics")
     
     # Default sort is stars (1)
     sort_options = {
@@ -77,11 +79,46 @@ def search_repos_interactive(ctx: Dict[str, Any]) -> None:
     except Exception as e:
         console.print(f"[danger]Error: {str(e)}[/danger]")
 
-def view_repo_details(ctx: Dict[str, Any], repos: List[Dict[str, Any]]) -> None:
+def ask_catalog_value(console, prompt: str, kind: str) -> str:
+    """Prompt for a language or topic, resolving it against the catalog.
+    
+    Exact names and aliases are used directly; for anything else the
+    closest catalog entries are offered as a numbered list, and pressing
+    Enter keeps the value as typed.
+    """
+    value = console.input(prompt).strip()
+    if not value:
+        return ""
+    
+    catalog = get_catalog()
+    match = catalog.resolve(kind, value)
+    if match is not None:
+        if normalize(match.name) != normalize(value):
+            console.print(f"[info]Using [/info]{escape(match.name)}")
+        return match.name
+    
+    matches = catalog.search(kind, value, limit=5)
+    if not matches:
+        return value
+    console.print(f"[warning]'{escape(value)}' is not a known {kind[:-1]}. Did you mean:[/warning]")
+    for i, candidate in enumerate(matches, 1):
+        console.print(f"  [bold]{i}[/bold]. {escape(candidate.name)}")
+    choice = console.input(f"Enter number, or press Enter to keep '{escape(value)}': ").strip()
+    if choice.isdigit() and 1 <= int(choice) <= len(matches):
+        return matches[int(choice) - 1].name
+    return value
+
+def view_repo_details(ctx: Dict[str, Any], repos: Sequence[Dict[str, Any]]) -> None:
     """Allow user to select and view repository details."""
     console = ctx.get('CONSOLE')
     client = ctx.get('CLIENT')
     
+    # Details for the whole page are fetched in one batched request the first
+    # time any repository is selected; if that fails, repositories are
+    # fetched one at a time from then on
+    details_cache: Dict[str, Dict[str, Any]] = {}
+    batch_attempted = False
+    
     while True:
         choice = console.input(
             "Enter number to view, 'q' to return (Esc also works): "
@@ -99,7 +136,16 @@ def view_repo_details(ctx: Dict[str, Any], repos: List[Dict[str, Any]]) -> None:
                 # Get detailed repo information
                 console.print()
                 console.print(f"[info]Fetching details for: [/info][repo]{selected_repo}[/repo]")
-                repo_details = client.get_repository(selected_repo)
+                if not batch_attempted:
+                    batch_attempted = True
+                    try:
+                        details_cache.update(client.get_repositories([r["fullName"] for r in repos]))
+                    except Exception:
+                        pass
+                repo_details = details_cache.get(selected_repo)
+                if repo_details is None:
+                    repo_details = client.get_repository(selected_repo)
+                    details_cache[selected_repo] = repo_details
                 
                 # Show repo info
                 from gh_explorer.utils.formatting import format_repo_details
@@ -123,9 +169,9 @@ def view_repo_details(ctx: Dict[str, Any], repos: List[Dict[str, Any]]) -> None:
                     client.open_in_browser(selected_repo)
                     console.print("[success]Opened in browser.[/success]")
                 elif action == '2':
-                    console.print(f"[info]Cloning {selected_repo}...[/info]")
-                    result = client.clone_repository(selected_repo)
-                    console.print(f"[success]{result}[/success]")
+                    with console.status(f"[info]Cloning {selected_repo}...[/info]"):
+                        directory = client.clone_repository(selected_repo)
+                    console.print(f"[success]Cloned into {directory}[/success]")
                     return  # Return to main menu after cloning
                 else:
                     # Back to search results
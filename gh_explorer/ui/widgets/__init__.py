@@ -1,5 +1,6 @@
 """UI widgets package."""
 
+from gh_explorer.ui.widgets.code_groups import GroupedCodeView
 from gh_explorer.ui.widgets.repo_browser import RepoBrowser
 
-__all__ = ['RepoBrowser']
\ No newline at end of file
+__all__ = ['GroupedCodeView', 'RepoBrowser']
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Live view of code search results, grouped by repository as they stream in
+"""
+
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+from rich.console import Console, ConsoleOptions, Group, RenderResult
+from rich.live import Live
+from rich.text import Text
+
+from gh_explorer.api.grouping import CodeHitGrouper
+from gh_explorer.utils.formatting import format_code_groups
+
+# Files listed per repository while results are still arriving
+LIVE_FILES_PER_REPO = 3
+
+class GroupedCodeView:
+    """Folds streamed code hits into groups and renders the current state.
+
+    Live redraws from its refresh thread while hits are added from the main
+    thread, so both sides go through a lock.
+    """
+
+    def __init__(self, grouper: Optional[CodeHitGrouper] = None):
+        """Initialize the view around a (possibly new) grouper."""
+        self.grouper = grouper if grouper is not None else CodeHitGrouper()
+        self.done = False
+        self._lock = threading.Lock()
+
+    def add(self, hit: Dict[str, Any]) -> bool:
+        """Add a hit; return True if it was the first one."""
+        with self._lock:
+            first = self.grouper.total == 0
+            self.grouper.add(hit)
+            return first and self.grouper.total > 0
+
+    def status(self) -> Text:
+        """One-line summary: hits, repositories and collapsed duplicates."""
+        grouper = self.grouper
+        text = Text(style="info")
+        text.append("Found " if self.done else "Searching… ")
+        text.append(f"{grouper.total} file{'s' if grouper.total != 1 else ''} in "
+                    f"{len(grouper)} repositor{'ies' if len(grouper) != 1 else 'y'}")
+        if grouper.duplicates:
+            text.append(f", {grouper.duplicates} duplicate{'s' if grouper.duplicates != 1 else ''} collapsed")
+        return text
+
+    def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
+        # Only what fits on screen is built; the rest is printed at the end
+        height = (options.height or console.height) - 2
+        with self._lock:
+            groups = format_code_groups(
+                self.grouper.ordered(),
+                max_files=LIVE_FILES_PER_REPO,
+                max_lines=max(1, height),
+            )
+            yield Group(self.status(), Text(), groups)
+
+    def stream(self, hits: Iterable[Dict[str, Any]], console: Console) -> CodeHitGrouper:
+        """Consume hits while redrawing, then print the final grouping.
+
+        The live view lists repositories in arrival order so nothing jumps
+        around; the final output puts the repositories with the most
+        distinct hits first and lists every file.
+        """
+        with Live(self, console=console, transient=True, refresh_per_second=8,
+                  vertical_overflow="crop") as live:
+            for hit in hits:
+                if self.add(hit):
+                    # Show the first result without waiting for the next tick
+                    live.refresh()
+        self.done = True
+        if self.grouper.total:
+            console.print(format_code_groups(self.grouper.ordered(by_count=True)))
+            console.print()
+        console.print(self.status())
+        return self.grouper
@@ -1,11 +1,19 @@
 #!/usr/bin/env python3
 """
 Interactive repository browser widget
-Written by Claude, I didnt even realize it was here.
+
+RepoBrowser shows a page of repositories with their details, README and
+file tree in a full-screen Rich layout. Details of the rows around the
+selection are prefetched in the background, file trees are fetched when a
+repository is opened, and the screen is redrawn only when a key or a
+finished fetch changes a panel.
 """
-#TODO figure out whether it should be here
-import time
-from typing import Dict, Any, List, Optional
+
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional, Sequence, Tuple
 from rich.console import Console, RenderableType
 from rich.layout import Layout
 from rich.panel import Panel
@@ -14,14 +22,167 @@ from rich.markdown import Markdown
 from rich.syntax import Syntax
 from rich.table import Table
 from rich.live import Live
-from rich.tree import Tree
+
+from gh_explorer.api.models import iter_columns
+from gh_explorer.api.tree import DIR, FILE, SUBMODULE, SYMLINK, RepoTree
+from gh_explorer.ui.widgets.viewport import ListViewport
+from gh_explorer.utils import trace
+from gh_explorer.utils.render_cache import CachedMarkdown
+
+# Rows taken by the header panel and the list panel's borders
+LIST_CHROME_HEIGHT = 5
+
+# Rows taken by the header, the details panel and the files panel's borders
+FILES_CHROME_HEIGHT = 13
+
+# Flattened file rows that stand for "this directory is still loading"
+LOADING_ROW = -2
+
+_FILE_ICONS = {DIR: "📁", FILE: "📄", SYMLINK: "🔗", SUBMODULE: "📦"}
+
+class DetailPrefetcher:
+    """Warms repository details around the selection on a worker pool.
+    
+    The uncached rows of each window are fetched together in one batched
+    request. Fetched details are kept in a per-session LRU, together with
+    the file trees stored for them, which are evicted along with their
+    details. Prefetches for rows that are far from the current selection
+    are cancelled if they have not started yet.
+    """
+    
+    def __init__(self,
+                 fetch: Callable[[List[str]], Dict[str, Dict[str, Any]]],
+                 radius: int = 2,
+                 max_workers: int = 4,
+                 capacity: int = 64,
+                 on_done: Optional[Callable[[str, Optional[Exception]], None]] = None):
+        """Initialize the prefetcher with the function that fetches repos.
+        
+        `fetch(names)` returns details keyed by name, like
+        GitHubClient.get_repositories. `on_done(name, error)` is called
+        from the worker thread for each repository a fetch finishes, so
+        the UI can redraw without polling.
+        """
+        self.fetch = fetch
+        self.on_done = on_done
+        self.radius = radius
+        self.capacity = capacity
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ghx-prefetch")
+        # Re-entrant: cancelling a future runs its done callback immediately
+        self._lock = threading.RLock()
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # File tree per cached repository (None if it could not be fetched)
+        self._trees: Dict[str, Optional[RepoTree]] = {}
+        # Name -> (the batch fetching it, its row); a batch covers several names
+        self._pending: Dict[str, Tuple[Future, int]] = {}
+    
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Return cached details for a repository, marking them recently used."""
+        with self._lock:
+            details = self._cache.get(name)
+            if details is not None:
+                self._cache.move_to_end(name)
+            return details
+    
+    def _store(self, name: str, details: Dict[str, Any]) -> None:
+        """Add details to the LRU, evicting the least recently used entry."""
+        with self._lock:
+            self._cache[name] = details
+            self._cache.move_to_end(name)
+            while len(self._cache) > self.capacity:
+                evicted, _ = self._cache.popitem(last=False)
+                self._trees.pop(evicted, None)
+    
+    def has_tree(self, name: str) -> bool:
+        """Return True if a tree (or a failure to fetch one) is stored for `name`."""
+        with self._lock:
+            return name in self._trees
+    
+    def tree(self, name: str) -> Optional[RepoTree]:
+        """Return the stored file tree of a repository."""
+        with self._lock:
+            return self._trees.get(name)
+    
+    def store_tree(self, name: str, tree: Optional[RepoTree]) -> None:
+        """Keep a repository's tree while its details stay cached."""
+        with self._lock:
+            if name in self._cache:
+                self._trees[name] = tree
+    
+    def _run(self, names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Worker body: fetch a batch of repositories and cache the results."""
+        try:
+            results = self.fetch(names)
+        except Exception as e:
+            if self.on_done:
+                for name in names:
+                    self.on_done(name, e)
+            raise
+        for name in names:
+            details = results.get(name)
+            if details is not None:
+                self._store(name, details)
+            if self.on_done:
+                self.on_done(name, None if details is not None else
+                             RuntimeError(f"repository {name} not found or not accessible"))
+        return results
+    
+    def _done(self, names: List[str], future: Future) -> None:
+        """Forget a finished or cancelled batch."""
+        with self._lock:
+            for name in names:
+                entry = self._pending.get(name)
+                if entry is not None and entry[0] is future:
+                    del self._pending[name]
+    
+    def focus(self, names: List[str], index: int) -> None:
+        """Prefetch the selected row and its neighbours, nearest first."""
+        window = [index]
+        for offset in range(1, self.radius + 1):
+            window.extend([index + offset, index - offset])
+        
+        with self._lock:
+            # Cancel queued batches whose rows the user has all scrolled far away from
+            batches: Dict[Future, List[int]] = {}
+            for future, row in self._pending.values():
+                batches.setdefault(future, []).append(row)
+            for future, rows in batches.items():
+                if all(abs(row - index) > self.radius * 2 for row in rows):
+                    future.cancel()
+            
+            self._submit([(names[row], row) for row in window if 0 <= row < len(names) and names[row]])
+    
+    def request(self, name: str, index: int) -> None:
+        """Schedule a fetch for one repository unless it is cached or in flight."""
+        with self._lock:
+            self._submit([(name, index)])
+    
+    def _submit(self, rows: List[Tuple[str, int]]) -> None:
+        """Fetch the rows not cached or in flight in one batch; call with the lock held."""
+        wanted = {name: row for name, row in rows
+                  if name not in self._cache and name not in self._pending}
+        if not wanted:
+            return
+        names = list(wanted)
+        future = self._executor.submit(self._run, names)
+        for name, row in wanted.items():
+            self._pending[name] = (future, row)
+        future.add_done_callback(lambda f, names=names: self._done(names, f))
+    
+    def shutdown(self) -> None:
+        """Stop the worker pool, dropping queued prefetches."""
+        with self._lock:
+            for future, _ in self._pending.values():
+                future.cancel()
+            self._pending.clear()
+        self._executor.shutdown(wait=False)
 
 class RepoBrowser:
     """Interactive browser for repository results with keyboard navigation."""
     
     def __init__(self, 
                  ctx: Dict[str, Any], 
-                 repos: List[Dict[str, Any]]):
+                 repos: Sequence[Dict[str, Any]]):
         """Initialize the repository browser."""
         self.ctx = ctx
         self.repos = repos
@@ -29,8 +190,40 @@ class RepoBrowser:
         self.client = ctx.get('CLIENT')
         self.selected_index = 0
         self.repo_details: Optional[Dict[str, Any]] = None
+        self.names = [name or "" for (name,) in iter_columns(repos, ("fullName",))]
+        self.viewport = ListViewport(self._list_height())
+        # Keypresses and background fetch completions, consumed by run()
+        self.events: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+        self.prefetcher = DetailPrefetcher(
+            self.client.get_repositories,
+            on_done=lambda name, error: self.events.put(("fetched", (name, error)))
+        )
+        # Repositories whose details the user has opened this session
+        self.opened: set = set()
+        self.load_errors: Dict[str, str] = {}
+        self._dirty = True
+        # Repositories whose file tree is being fetched; trees themselves
+        # live in the prefetcher's LRU next to the details
+        self.loading_trees: set = set()
+        # Files pane state: which pane has the keyboard, expanded directories
+        # per repository, and the cursor over the flattened visible rows
+        self.focus = "repos"
+        self.expanded: Dict[str, set] = {}
+        self.file_cursor = 0
+        self.file_viewport = ListViewport(self._files_height(), margin=0)
+        self._file_rows: Optional[List[Tuple[int, int]]] = None
+        self._files_version = 0
+        self._files_source: Optional[Tuple[Optional[str], Optional[int]]] = None
+        # File trees, and directories of truncated trees, are listed on this pool
+        self._tree_loader = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ghx-tree")
+        self.loading_dirs: set = set()
+        # Clones run in the background; their progress is shown in the header
+        self._cloner = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ghx-clone")
+        self.cloning: set = set()
+        self.status: Optional[Text] = None
+        # Inputs each layout panel was last rendered from
+        self._panel_keys: Dict[str, Any] = {}
         self.layout = self._create_layout()
-        self.tree = None
         
     def _create_layout(self) -> Layout:
         """Create the layout for the browser."""
@@ -51,7 +244,14 @@ class RepoBrowser:
         # Split the content area vertically
         layout["content"].split_column(
             Layout(name="details", size=8),
-            Layout(name="readme")
+            Layout(name="body")
+        )
+        
+        # File tree on the left, README on the right; the tree is hidden
+        # until details are loaded
+        layout["body"].split_row(
+            Layout(name="files", ratio=1, visible=False),
+            Layout(name="readme", ratio=2)
         )
         
         return layout
@@ -59,18 +259,36 @@ class RepoBrowser:
     def _render_header(self) -> Panel:
         """Render the header section."""
         text = Text("GitHub Repository Browser", style="bold")
+        if self.status is not None:
+            text.append("  ")
+            text.append(self.status)
         text.append("\n")
-        text.append("j/k or ↑/↓: Navigate  Enter/Space: Load details  q: Exit  o: Open in browser  c: Clone repo", style="dim")
+        text.append("j/k or ↑/↓: Navigate  Enter/Space: Load details/expand  Tab: Switch pane  "
+                    "h/l: Collapse/expand  q: Exit  o: Open in browser  c: Clone repo", style="dim")
         return Panel(text)
     
+    def _list_height(self) -> int:
+        """Return how many list rows fit on screen."""
+        height = self.console.size.height if self.console else 24
+        return max(1, height - LIST_CHROME_HEIGHT)
+    
+    def _files_height(self) -> int:
+        """Return how many file rows fit in the Files pane."""
+        height = self.console.size.height if self.console else 24
+        return max(1, height - FILES_CHROME_HEIGHT)
+    
     def _render_repo_list(self) -> Panel:
-        """Render the repository list section."""
+        """Render the repository list section.
+        
+        Only the rows inside the viewport window are materialized.
+        """
         table = Table(show_header=False, expand=True, box=None)
         table.add_column("Repositories")
         
-        for idx, repo in enumerate(self.repos):
-            name = repo.get("fullName", "Unknown")
-            stars = repo.get("stargazersCount", 0)
+        window = self.viewport.window(len(self.repos))
+        rows = iter_columns(self.repos, ("fullName", "stargazersCount"), window.start, window.stop)
+        for idx, (name, stars) in zip(window, rows):
+            name = name or "Unknown"
             stars_text = f"★ {stars}" if stars else ""
             
             if idx == self.selected_index:
@@ -87,7 +305,10 @@ class RepoBrowser:
             
             table.add_row(row)
             
-        return Panel(table, title="Repositories")
+        title = "Repositories"
+        if len(self.repos) > self.viewport.height:
+            title += f" ({self.selected_index + 1}/{len(self.repos)})"
+        return Panel(table, title=title)
     
     def _render_repo_details(self) -> Panel:
         """Render the repository details section."""
@@ -128,146 +349,442 @@ class RepoBrowser:
     def _render_readme(self) -> RenderableType:
         """Render the README section."""
         if not self.repo_details:
-            return Panel(
-                Text("Press Enter to load repository details and README"),
-                title="README"
-            )
+            name = self._selected_name()
+            if name in self.load_errors:
+                message = Text(f"Error fetching repository details: {self.load_errors[name]}", style="danger")
+            elif name in self.opened:
+                message = Text("Loading repository details and README...", style="dim")
+            else:
+                message = Text("Press Enter to load repository details and README")
+            return Panel(message, title="README")
         
         readme = self.repo_details.get("readme", {}).get("text", "No README available.")
+        # Laid out once per width; redraws replay the cached lines
+        return Panel(CachedMarkdown(readme, policy="browser"), title="README")
+    
+    def _current_tree(self) -> Tuple[Optional[str], Optional[RepoTree]]:
+        """Return the name and file tree of the repository whose details are shown."""
+        if not self.repo_details:
+            return None, None
+        repo_name = self._selected_name()
+        return repo_name, self.prefetcher.tree(repo_name)
+    
+    def _visible_file_rows(self) -> List[Tuple[int, int]]:
+        """Return the (depth, entry index) rows of the expanded file tree.
         
-        # Create the directory tree
-        self.tree = Tree(f"📁 {self.repo_details.get('nameWithOwner', 'Unknown')}")
-        try:
-            self._populate_tree_with_files()
-        except Exception:
-            pass  # Silently fail on tree population errors
+        Only expanded directories are walked, so a 50k-file tree costs as
+        much as the rows that are actually open. The result is cached until
+        the tree or its expansion changes.
+        """
+        if self._file_rows is not None:
+            return self._file_rows
+        repo_name, tree = self._current_tree()
+        rows: List[Tuple[int, int]] = []
+        if tree is not None and tree.is_loaded(""):
+            expanded = self.expanded.get(repo_name, set())
+            stack = [iter([(0, index) for index in tree.child_indexes("")])]
+            while stack:
+                for depth, index in stack[-1]:
+                    rows.append((depth, index))
+                    if tree.kind(index) != DIR:
+                        continue
+                    path = tree.path_of(index)
+                    if path not in expanded:
+                        continue
+                    if tree.is_loaded(path):
+                        stack.append(iter([(depth + 1, child) for child in tree.child_indexes(path)]))
+                        break
+                    rows.append((depth + 1, LOADING_ROW))
+                else:
+                    stack.pop()
+        self._file_rows = rows
+        return rows
+    
+    def _render_files(self) -> Panel:
+        """Render the visible window of the Files pane."""
+        repo_name, tree = self._current_tree()
+        if tree is None:
+            message = "Loading repository structure..." if not self.prefetcher.has_tree(repo_name) \
+                else "Error loading repository structure"
+            return Panel(Text(message, style="dim"), title="Files")
         
-        # Split into horizontal layout - directory tree on left, readme on right
-        content_layout = Layout()
-        content_layout.split_row(
-            Layout(Panel(self.tree, title="Files"), ratio=1),
-            Layout(Panel(Markdown(readme), title="README"), ratio=2)
-        )
+        rows = self._visible_file_rows()
+        expanded = self.expanded.get(repo_name, set())
+        lines = Text(no_wrap=True, overflow="ellipsis")
+        for row in self.file_viewport.window(len(rows)):
+            depth, index = rows[row]
+            if row > self.file_viewport.offset:
+                lines.append("\n")
+            lines.append("  " * depth)
+            if index == LOADING_ROW:
+                lines.append("Loading...", style="dim")
+                continue
+            kind = tree.kind(index)
+            icon = _FILE_ICONS.get(kind, "📄")
+            if kind == DIR and tree.path_of(index) in expanded:
+                icon = "📂"
+            style = "reverse" if self.focus == "files" and row == self.file_cursor else ""
+            lines.append(f"{icon} {tree.name(index)}", style=style)
+        if not rows:
+            lines.append("Empty repository", style="dim")
         
-        return content_layout
+        title = "Files"
+        if len(rows) > self.file_viewport.height:
+            title += f" ({self.file_cursor + 1}/{len(rows)})"
+        border = "cyan" if self.focus == "files" else "none"
+        return Panel(lines, title=title, border_style=border)
+    
+    def _files_changed(self) -> None:
+        """Invalidate the flattened file rows after the tree or expansion changed."""
+        self._file_rows = None
+        self._files_version += 1
+        rows = self._visible_file_rows()
+        self.file_cursor = max(0, min(self.file_cursor, len(rows) - 1))
+        self.file_viewport.scroll_to(self.file_cursor, len(rows))
     
-    def _populate_tree_with_files(self) -> None:
-        """Populate the tree with repository files and directories."""
-        if not self.tree:
+    def _move_file_cursor(self, delta: int) -> None:
+        """Move the Files pane cursor."""
+        rows = self._visible_file_rows()
+        if not rows:
             return
-            
-        try:
-            repo_name = self.repo_details.get("nameWithOwner", "")
-            if repo_name:
-                # Get repository files using our client method
-                files = self.client.get_repository_files(repo_name)
-                
-                # Add files to tree
-                for file_info in files:
-                    name = file_info.get("name", "")
-                    file_type = file_info.get("type", "")
-                    
-                    if not name:
-                        continue
-                        
-                    if file_type == "dir":
-                        self.tree.add(f"📁 {name}")
-                    else:
-                        self.tree.add(f"📄 {name}")
-                        
-                # If no files were found or error occurred, add placeholder
-                if not files:
-                    raise Exception("No files found")
-        except Exception:
-            # Add some placeholder structure if we can't get the real one
-            self.tree.add("📁 src")
-            self.tree.add("📄 README.md")
-            self.tree.add("📄 LICENSE")
-            self.tree.add("[dim]Error loading repository structure[/dim]")
+        self.file_cursor = max(0, min(len(rows) - 1, self.file_cursor + delta))
+        self.file_viewport.scroll_to(self.file_cursor, len(rows))
     
-    def _fetch_repo_details(self) -> None:
-        """Fetch detailed information for the selected repository."""
-        selected_repo = self.repos[self.selected_index]
-        repo_name = selected_repo.get("fullName", "")
+    def _expand_file(self, toggle: bool = False) -> None:
+        """Expand the directory under the cursor (or collapse it if `toggle`)."""
+        repo_name, tree = self._current_tree()
+        rows = self._visible_file_rows()
+        if tree is None or not rows:
+            return
+        index = rows[self.file_cursor][1]
+        if index == LOADING_ROW or tree.kind(index) != DIR:
+            return
+        path = tree.path_of(index)
+        expanded = self.expanded.setdefault(repo_name, set())
+        if path in expanded:
+            if toggle:
+                expanded.discard(path)
+                self._files_changed()
+            return
+        expanded.add(path)
+        if not tree.is_loaded(path):
+            self._load_directory(repo_name, tree, path)
+        self._files_changed()
+    
+    def _collapse_file(self) -> None:
+        """Collapse the directory under the cursor, or move to its parent."""
+        repo_name, tree = self._current_tree()
+        rows = self._visible_file_rows()
+        if tree is None or not rows:
+            return
+        depth, index = rows[self.file_cursor]
+        expanded = self.expanded.setdefault(repo_name, set())
+        if index != LOADING_ROW and tree.kind(index) == DIR and tree.path_of(index) in expanded:
+            expanded.discard(tree.path_of(index))
+            self._files_changed()
+            return
+        # Jump to the enclosing directory's row
+        for row in range(self.file_cursor - 1, -1, -1):
+            if rows[row][0] < depth:
+                self.file_cursor = row
+                self.file_viewport.scroll_to(row, len(rows))
+                return
+    
+    def _load_directory(self, repo_name: str, tree: RepoTree, path: str) -> None:
+        """List a directory of a truncated tree in the background.
         
-        try:
-            self.repo_details = self.client.get_repository(repo_name)
-        except Exception as e:
-            self.console.print(f"[danger]Error fetching repository details: {str(e)}[/danger]")
-            self.repo_details = None
+        The worker only fetches the listing; it is added to the tree when
+        the event is handled, so the tree is only ever changed on the UI
+        thread.
+        """
+        key = (repo_name, path)
+        if key in self.loading_dirs or tree.is_loaded(path):
+            return
+        sha = tree.dir_sha(path)
+        if sha is None:
+            # Nothing to list it by; collapse it again
+            self.expanded.get(repo_name, set()).discard(path)
+            return
+        self.loading_dirs.add(key)
+        
+        def load():
+            listing, error = None, None
+            try:
+                listing = self.client.get_tree_listing(repo_name, sha)
+            except Exception as e:
+                error = e
+            self.events.put(("tree", (repo_name, tree, path, listing, error)))
+        self._tree_loader.submit(load)
+    
+    def _on_tree_loaded(self, repo_name: str, tree: RepoTree, path: str,
+                        listing: Optional[Dict[str, Any]], error: Optional[Exception]) -> None:
+        """Add a fetched directory listing to its tree."""
+        self.loading_dirs.discard((repo_name, path))
+        if listing is not None:
+            tree.set_listing(path, listing)
+        if error is not None:
+            # Collapse it again so it can be retried
+            self.expanded.get(repo_name, set()).discard(path)
+        if repo_name == self._current_tree()[0]:
+            self._files_changed()
+    
+    def _load_tree(self, repo_name: str) -> None:
+        """Fetch the file tree of an opened repository in the background.
+        
+        Only repositories whose details the user opens get a tree, so
+        prefetching neighbours costs no tree requests.
+        """
+        if repo_name in self.loading_trees or self.prefetcher.has_tree(repo_name):
+            return
+        self.loading_trees.add(repo_name)
+        
+        def load():
+            tree = None
+            try:
+                tree = self.client.get_repository_tree(repo_name)
+            except Exception:
+                pass
+            self.events.put(("repo_tree", (repo_name, tree)))
+        self._tree_loader.submit(load)
+    
+    def _on_repo_tree(self, repo_name: str, tree: Optional[RepoTree]) -> None:
+        """Handle a file tree fetch finishing."""
+        self.loading_trees.discard(repo_name)
+        self.prefetcher.store_tree(repo_name, tree)
+        if repo_name == self._current_tree()[0]:
+            self._files_changed()
+    
+    def _selected_name(self) -> str:
+        """Return the full name of the selected repository."""
+        return self.names[self.selected_index]
+    
+    def _fetch_repo_details(self) -> None:
+        """Show details for the selected repository, fetching them in the background."""
+        repo_name = self._selected_name()
+        self.opened.add(repo_name)
+        self.load_errors.pop(repo_name, None)
+        self.repo_details = self.prefetcher.get(repo_name)
+        if self.repo_details is None:
+            # The completion event will fill in the details when they arrive
+            self.prefetcher.request(repo_name, self.selected_index)
+        else:
+            self._load_tree(repo_name)
+    
+    def _on_fetched(self, repo_name: str, error: Optional[Exception]) -> None:
+        """Handle a background fetch completing."""
+        if error is not None:
+            self.load_errors[repo_name] = str(error)
+        if repo_name == self._selected_name() and repo_name in self.opened:
+            self.repo_details = self.prefetcher.get(repo_name)
+            if self.repo_details is not None:
+                self._load_tree(repo_name)
     
+    def _select(self, index: int) -> None:
+        """Move the selection, reusing details already fetched this session."""
+        self.selected_index = max(0, min(len(self.repos) - 1, index))
+        self.viewport.scroll_to(self.selected_index, len(self.repos))
+        name = self.names[self.selected_index]
+        self.repo_details = self.prefetcher.get(name) if name in self.opened else None
+        if self.repo_details is not None:
+            # Its tree may have been evicted with other entries since
+            self._load_tree(name)
+        self.prefetcher.focus(self.names, self.selected_index)
+    
+    def _update_panel(self, name: str, key: Any, render: Callable[[], RenderableType]) -> bool:
+        """Re-render a layout panel only if its inputs changed since last time."""
+        if name in self._panel_keys and self._panel_keys[name] == key:
+            return False
+        self.layout[name].update(render())
+        self._panel_keys[name] = key
+        self._dirty = True
+        return True
+    
+    @trace.traced("render", "browser.compose")
     def _compose_layout(self) -> Layout:
-        """Compose the full layout with all components."""
-        self.layout["header"].update(self._render_header())
-        self.layout["repos"].update(self._render_repo_list())
-        self.layout["details"].update(self._render_repo_details())
-        self.layout["readme"].update(self._render_readme())
+        """Compose the full layout, re-rendering only the panels that changed."""
+        details_id = id(self.repo_details) if self.repo_details else None
+        repo_name, tree = self._current_tree()
+        selected = self._selected_name()
+        load_state = (selected in self.opened, self.load_errors.get(selected))
+        
+        self._update_panel("header", (str(self.status),), self._render_header)
+        height = self._list_height()
+        if height != self.viewport.height:
+            self.viewport.resize(height)
+            self.viewport.scroll_to(self.selected_index, len(self.repos))
+        self._update_panel("repos", (self.selected_index, self.viewport.offset, height, len(self.repos)),
+                           self._render_repo_list)
+        self._update_panel("details", (self.selected_index, details_id), self._render_repo_details)
+        self._update_panel("readme", (details_id, None if details_id else load_state),
+                           self._render_readme)
+        
+        # Start the Files pane over when another repository (or its tree) is shown
+        files_source = (repo_name, id(tree) if tree is not None else None)
+        if files_source != self._files_source:
+            self._files_source = files_source
+            self.file_cursor = 0
+            self.file_viewport.offset = 0
+            self._files_changed()
+        files_height = self._files_height()
+        if files_height != self.file_viewport.height:
+            self.file_viewport.resize(files_height)
+            self.file_viewport.scroll_to(self.file_cursor, len(self._visible_file_rows()))
+        show_files = details_id is not None
+        if self.layout["files"].visible != show_files:
+            self.layout["files"].visible = show_files
+            self._dirty = True
+        if not show_files and self.focus == "files":
+            self.focus = "repos"
+        if show_files:
+            self._update_panel("files", (files_source, self._files_version, self.file_cursor,
+                                         self.file_viewport.offset, files_height, self.focus),
+                               self._render_files)
         
         return self.layout
     
+    def _read_keys(self, read_key: Callable[[], str], quit_keys: Tuple[str, ...]) -> None:
+        """Input thread: forward keypresses to the event queue until quit."""
+        while True:
+            try:
+                key = read_key()
+            except Exception:
+                self.events.put(("quit", None))
+                return
+            self.events.put(("key", key))
+            if key in quit_keys:
+                return
+    
+    def _handle_key(self, action: Optional[str]) -> bool:
+        """Apply a key action; return False when the browser should exit."""
+        if action == "quit":
+            return False
+        elif action == "focus":
+            # The Files pane only takes focus once there is a tree to browse
+            if self.focus == "files" or not self.repo_details:
+                self.focus = "repos"
+            else:
+                self.focus = "files"
+        elif self.focus == "files" and action in ("up", "down", "details", "expand", "collapse"):
+            if action == "up":
+                self._move_file_cursor(-1)
+            elif action == "down":
+                self._move_file_cursor(1)
+            elif action == "details":
+                self._expand_file(toggle=True)
+            elif action == "expand":
+                self._expand_file()
+            else:
+                self._collapse_file()
+        elif action == "up":
+            self._select(self.selected_index - 1)
+        elif action == "down":
+            self._select(self.selected_index + 1)
+        elif action in ("details", "expand"):
+            if not self.repo_details:
+                self._fetch_repo_details()
+        elif action == "open":
+            self._open_in_browser()
+        elif action == "clone":
+            self._clone_repository()
+        return True
+    
     def run(self) -> None:
-        """Run the interactive browser."""
+        """Run the interactive browser.
+        
+        Keys are read on a background thread and delivered through an event
+        queue together with fetch completions. The screen is redrawn only
+        after events change some panel, and a burst of queued keys (e.g. key
+        repeat) is applied in full before a single redraw.
+        """
         try:
             # Try to use better key handling with external library if available
-            has_readchar = False
             try:
                 import readchar
-                has_readchar = True
             except ImportError:
-                pass
-                
-            with Live(self._compose_layout(), console=self.console, screen=True, refresh_per_second=4) as live:
+                readchar = None
+            
+            if readchar is not None:
+                # readchar provides better cross-platform key handling
+                read_key = readchar.readkey
+                keymap = {
+                    'q': "quit", '\x1b': "quit", readchar.key.ESC: "quit",
+                    readchar.key.UP: "up", 'k': "up",
+                    readchar.key.DOWN: "down", 'j': "down",
+                    readchar.key.ENTER: "details", '\r': "details", ' ': "details",
+                    readchar.key.TAB: "focus",
+                    readchar.key.RIGHT: "expand", 'l': "expand",
+                    readchar.key.LEFT: "collapse", 'h': "collapse",
+                    'o': "open",
+                    'c': "clone",
+                }
+            else:
+                # Fallback to simpler line-based key handling
+                read_key = lambda: self.console.input("")
+                keymap = {
+                    'q': "quit", 'Q': "quit",
+                    'k': "up", 'K': "up",
+                    'j': "down", 'J': "down",
+                    'o': "open", 'O': "open",
+                    'c': "clone", 'C': "clone",
+                    '': "details", ' ': "details", '\r': "details", '\n': "details",
+                    '\t': "focus",
+                    'l': "expand", 'L': "expand",
+                    'h': "collapse", 'H': "collapse",
+                }
+            quit_keys = tuple(key for key, action in keymap.items() if action == "quit")
+            
+            self._select(self.selected_index)
+            with Live(self._compose_layout(), console=self.console, screen=True, auto_refresh=False) as live:
+                self._dirty = False
+                reader = threading.Thread(
+                    target=self._read_keys, args=(read_key, quit_keys), daemon=True
+                )
+                reader.start()
                 running = True
                 
                 while running:
-                    # Handle keys differently based on available libraries
-                    if has_readchar:
-                        # readchar provides better cross-platform key handling
-                        key = readchar.readkey()
-                        
-                        # Map keys to actions
-                        if key in ('q', '\x1b', readchar.key.ESC):  # q or ESC
-                            running = False
-                        elif key in (readchar.key.UP, 'k'):  # Up arrow or k
-                            self.selected_index = max(0, self.selected_index - 1)
-                            self.repo_details = None  # Reset details when changing selection
-                        elif key in (readchar.key.DOWN, 'j'):  # Down arrow or j
-                            self.selected_index = min(len(self.repos) - 1, self.selected_index + 1)
-                            self.repo_details = None  # Reset details when changing selection
-                        elif key == readchar.key.ENTER:  # Enter
-                            if not self.repo_details:
-                                self._fetch_repo_details()
-                        elif key == 'o':  # Open in browser
-                            self._open_in_browser()
-                        elif key == 'c':  # Clone repo
-                            self._clone_repository()
-                    else:
-                        # Fallback to simpler key handling
-                        key = self.console.input("")
-                        
-                        # Handle just the basic keys
-                        if key in ('q', 'Q'):
+                    # Block until something happens, then take everything
+                    # else that is already queued
+                    events = [self.events.get()]
+                    while True:
+                        try:
+                            events.append(self.events.get_nowait())
+                        except queue.Empty:
+                            break
+                    
+                    for kind, payload in events:
+                        if kind == "quit":
                             running = False
-                        elif key in ('k', 'K'):
-                            self.selected_index = max(0, self.selected_index - 1)
-                            self.repo_details = None
-                        elif key in ('j', 'J'):
-                            self.selected_index = min(len(self.repos) - 1, self.selected_index + 1)
-                            self.repo_details = None
-                        elif key in ('o', 'O'):
-                            self._open_in_browser()
-                        elif key in ('c', 'C'):
-                            self._clone_repository()
-                        elif key in ('', ' ', '\r', '\n'):
-                            if not self.repo_details:
-                                self._fetch_repo_details()
+                        elif kind == "key":
+                            running = self._handle_key(keymap.get(payload))
+                        elif kind == "fetched":
+                            self._on_fetched(*payload)
+                        elif kind == "tree":
+                            self._on_tree_loaded(*payload)
+                        elif kind == "repo_tree":
+                            self._on_repo_tree(*payload)
+                        elif kind == "cloned":
+                            self._on_cloned(*payload)
+                        if not running:
+                            break
                     
-                    # Update the display
-                    live.update(self._compose_layout())
-                    time.sleep(0.1)  # Small delay to prevent CPU usage
+                    # Update the display only if a panel changed
+                    if running:
+                        self._compose_layout()
+                        if self._dirty:
+                            with trace.span("live.update", "render"):
+                                live.update(self.layout, refresh=True)
+                            self._dirty = False
                     
         except Exception as e:
             self.console.print(f"[danger]Error in interactive browser: {str(e)}[/danger]")
+        finally:
+            self.prefetcher.shutdown()
+            self._tree_loader.shutdown(wait=False)
+            if self.cloning:
+                self.console.print(f"[info]Finishing {len(self.cloning)} clone(s)...[/info]")
+            # Clones already started are finished rather than left half-written
+            self._cloner.shutdown(wait=True)
             
     def _open_in_browser(self) -> None:
         """Open the selected repository in the browser."""
@@ -279,17 +796,31 @@ class RepoBrowser:
             self.console.print(message)
     
     def _clone_repository(self) -> None:
-        """Clone the selected repository."""
-        selected_repo = self.repos[self.selected_index]
-        repo_name = selected_repo.get("fullName", "")
-        if repo_name:
+        """Clone the selected repository in the background."""
+        repo_name = self._selected_name()
+        if not repo_name or repo_name in self.cloning:
+            return
+        self.cloning.add(repo_name)
+        self._show_clone_status()
+        
+        def clone():
+            error = path = None
             try:
-                result = self.client.clone_repository(repo_name)
-                message = Text("Repository cloned successfully", style="success")
-                self.console.print(message)
-                # Pause briefly to show message
-                time.sleep(1.5)
+                path = self.client.clone_repository(repo_name)
             except Exception as e:
-                message = Text(f"Error cloning repository: {str(e)}", style="danger")
-                self.console.print(message)
-                time.sleep(1.5)
+                error = e
+            self.events.put(("cloned", (repo_name, path, error)))
+        self._cloner.submit(clone)
+    
+    def _on_cloned(self, repo_name: str, path: Optional[str], error: Optional[Exception]) -> None:
+        """Handle a background clone finishing."""
+        self.cloning.discard(repo_name)
+        if error is not None:
+            self.status = Text(f"Error cloning {repo_name}: {error}", style="danger")
+        elif self.cloning:
+            self._show_clone_status()
+        else:
+            self.status = Text(f"Cloned {repo_name} into {path}", style="success")
+    
+    def _show_clone_status(self) -> None:
+        self.status = Text(f"Cloning {', '.join(sorted(self.cloning))}...", style="info")
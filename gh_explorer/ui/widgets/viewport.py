@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Scroll tracking for lists that only render their visible rows
+"""
+
+class ListViewport:
+    """Tracks the visible window of a long list.
+
+    Renderers materialize rows for `window()` only, so drawing a frame costs
+    the same for 20 rows as for 100k.
+    """
+
+    def __init__(self, height: int = 20, margin: int = 2):
+        """Initialize a viewport showing `height` rows."""
+        self.offset = 0
+        self.height = max(1, height)
+        self.margin = margin
+
+    def resize(self, height: int) -> None:
+        """Change the number of visible rows."""
+        self.height = max(1, height)
+
+    def scroll_to(self, index: int, total: int) -> None:
+        """Move the window the minimum amount needed to show `index`."""
+        if index < self.offset:
+            self.offset = index
+        elif index >= self.offset + self.height:
+            self.offset = index - self.height + 1
+        # Never leave empty space at the bottom when the list is long enough
+        self.offset = max(0, min(self.offset, total - self.height))
+
+    def window(self, total: int) -> range:
+        """Return the row indexes to materialize: the visible rows plus a margin."""
+        start = self.offset
+        return range(start, min(total, start + self.height + self.margin))
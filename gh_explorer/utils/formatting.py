@@ -4,14 +4,20 @@ Formatting utilities for GitHub Explorer
 """
 
 import re
-from typing import Dict, List, Any
+from typing import TYPE_CHECKING, Dict, List, Any, Optional, Sequence
 from datetime import datetime
-from rich.console import Console
+from rich.console import Console, Group, RenderableType
 from rich.table import Table
-from rich.panel import Panel
 from rich.markdown import Markdown
 from rich.text import Text
 
+from gh_explorer.api.models import iter_columns
+from gh_explorer.utils.render_cache import CachedMarkdown
+from gh_explorer.utils.trace import traced
+
+if TYPE_CHECKING:
+    from gh_explorer.api.grouping import RepoGroup
+
 def format_date(date_str: str) -> str:
     """Format a GitHub date string to a human-readable format."""
     try:
@@ -38,8 +44,17 @@ def format_date(date_str: str) -> str:
     except Exception:
         return date_str
 
-def format_repo_list(repos: List[Dict[str, Any]]) -> Table:
-    """Format a list of repositories as a Rich Table with a compact single-row format."""
+@traced("format")
+def format_repo_list(
+    repos: Sequence[Dict[str, Any]], 
+    offset: int = 0, 
+    height: Optional[int] = None
+) -> Table:
+    """Format a list of repositories as a Rich Table with a compact single-row format.
+    
+    Only rows `offset` to `offset + height` are materialized, so a pager can
+    show a window of a very large result set at constant cost.
+    """
     import shutil
     from rich.text import Text
     
@@ -71,12 +86,16 @@ def format_repo_list(repos: List[Dict[str, Any]]) -> Table:
     table.add_column("Forks", style="forks", justify="right", width=forks_width, no_wrap=True)
     table.add_column("Description", width=desc_width, no_wrap=True)
     
-    # Process each repository
-    for repo in repos:
-        name = repo.get("fullName", "Unknown")
-        stars = str(repo.get("stargazersCount", 0))
-        forks = str(repo.get("forksCount", 0))
-        description = repo.get("description", "") or ""
+    # Process each repository in the requested window, reading the columns
+    # directly rather than building a record per row
+    end = None if height is None else offset + height
+    rows = iter_columns(repos, ("fullName", "stargazersCount", "forksCount", "description"),
+                        offset, end)
+    for name, stars, forks, description in rows:
+        name = name or "Unknown"
+        stars = str(stars or 0)
+        forks = str(forks or 0)
+        description = description or ""
         
         # Truncate repo name if needed
         if len(name) > repo_width:
@@ -91,8 +110,53 @@ def format_repo_list(repos: List[Dict[str, Any]]) -> Table:
     
     return table
 
-def format_repo_details(repo: Dict[str, Any]) -> Panel:
-    """Format repository details as a Rich Panel with markdown content."""
+# README characters shown in the detail view
+README_DISPLAY_LIMIT = 5000
+
+def prepare_readme(readme: str, narrow: bool) -> str:
+    """Truncate a README and simplify wide tables for narrow terminals."""
+    # Truncate extremely long README files
+    if len(readme) > README_DISPLAY_LIMIT:
+        readme = readme[:README_DISPLAY_LIMIT] + "\n\n... [README truncated for better display] ..."
+    
+    # Try to add some width constraints to tables and code blocks
+    lines = readme.split("\n")
+    formatted_lines = []
+    in_code_block = False
+    in_table = False
+    
+    for line in lines:
+        # Handle code blocks
+        if line.startswith("```"):
+            in_code_block = not in_code_block
+        
+        # Handle tables
+        if line.startswith("|") and not in_code_block:
+            in_table = True
+        elif in_table and not line.startswith("|"):
+            in_table = False
+        
+        # Add the line with potential modifications
+        if in_table and narrow:
+            # Simplify wide tables for narrow terminals
+            if "|" in line:
+                cols = line.split("|")
+                if len(cols) > 4:  # If table has many columns
+                    # Keep first few columns only
+                    simplified = "|".join(cols[:3]) + "|...|"
+                    formatted_lines.append(simplified)
+                else:
+                    formatted_lines.append(line)
+            else:
+                formatted_lines.append(line)
+        else:
+            formatted_lines.append(line)
+    
+    return "## README\n\n" + "\n".join(formatted_lines)
+
+@traced("format")
+def format_repo_details(repo: Dict[str, Any]) -> RenderableType:
+    """Format repository details as Markdown, with the README rendered through a cache."""
     import shutil
     
     # Get terminal width for formatting
@@ -116,57 +180,46 @@ def format_repo_details(repo: Dict[str, Any]) -> Panel:
     header_text += f"Languages: [language]{lang_text}[/language]\n\n"
     header_text += f"Description: {description}\n\n"
     
-    # Process README if available to improve formatting
+    # The README is prepared, parsed and laid out once per width and then
+    # replayed from the render cache
     readme = repo.get("readme", {}).get("text", "")
     if readme:
-        # Format README for better terminal display
-        from rich.markdown import Markdown
-        
-        # Truncate extremely long README files
-        if len(readme) > 5000:
-            readme = readme[:5000] + "\n\n... [README truncated for better display] ..."
-        
-        # Try to add some width constraints to tables and code blocks
-        lines = readme.split("\n")
-        formatted_lines = []
-        in_code_block = False
-        in_table = False
-        
-        for line in lines:
-            # Handle code blocks
-            if line.startswith("```"):
-                in_code_block = not in_code_block
-            
-            # Handle tables
-            if line.startswith("|") and not in_code_block:
-                in_table = True
-            elif in_table and not line.startswith("|"):
-                in_table = False
-            
-            # Add the line with potential modifications
-            if in_table and terminal_width < 100:
-                # Simplify wide tables for narrow terminals
-                if "|" in line:
-                    cols = line.split("|")
-                    if len(cols) > 4:  # If table has many columns
-                        # Keep first few columns only
-                        simplified = "|".join(cols[:3]) + "|...|"
-                        formatted_lines.append(simplified)
-                    else:
-                        formatted_lines.append(line)
-                else:
-                    formatted_lines.append(line)
-            else:
-                formatted_lines.append(line)
-        
-        readme = "\n".join(formatted_lines)
-        content = header_text + "## README\n\n" + readme
-    else:
-        content = header_text + "No README available."
+        narrow = terminal_width < 100
+        return Group(
+            Markdown(header_text),
+            Text(),  # the blank line Markdown puts between blocks
+            CachedMarkdown(readme, policy=("details", narrow),
+                           prepare=lambda text: prepare_readme(text, narrow))
+        )
     
-    return Markdown(content)
+    return Markdown(header_text + "No README available.")
+
+def truncate_path(path: str, width: int) -> str:
+    """Shorten a file path to `width` characters, keeping the file name if possible."""
+    if len(path) <= width:
+        return path
+    if "/" not in path:
+        return path[:width-3] + "..."
+    parts = path.split("/")
+    filename = parts[-1]
+    if len(filename) > width - 3:
+        # If filename itself is too long
+        return "..." + filename[-(width-3):]
+    # Try to keep part of the path before the filename
+    remaining = width - len(filename) - 3
+    if remaining <= 0:
+        return "..." + filename
+    path_prefix = "/".join(parts[:-1])
+    if len(path_prefix) > remaining:
+        path_prefix = "..." + path_prefix[-remaining:]
+    return f"{path_prefix}/{filename}"
 
-def format_code_results(results: List[Dict[str, Any]]) -> Table:
+def clean_fragment(fragment: str) -> str:
+    """Collapse a code fragment's newlines and runs of whitespace to single spaces."""
+    return re.sub(r'\s+', ' ', fragment).strip()
+
+@traced("format")
+def format_code_results(results: Sequence[Dict[str, Any]]) -> Table:
     """Format code search results as a Rich Table with compact single-row format."""
     import shutil
     from rich.text import Text
@@ -201,43 +254,20 @@ def format_code_results(results: List[Dict[str, Any]]) -> Table:
     table.add_column("File", style="bold", width=path_width, no_wrap=True)
     table.add_column("Match", style="cyan", width=match_width, no_wrap=True)
     
-    for result in results:
-        repo = result.get("repository", {}).get("nameWithOwner", "Unknown")
-        path = result.get("path", "Unknown")
+    for repository, path, matches in iter_columns(results, ("repository", "path", "textMatches")):
+        repo = (repository or {}).get("nameWithOwner", "Unknown")
+        path = path or "Unknown"
         
         # Truncate repo name if needed
         if len(repo) > repo_width:
             repo = repo[:repo_width-3] + "..."
             
-        # Truncate path if needed
-        if len(path) > path_width:
-            # Try to keep the filename part
-            if "/" in path:
-                parts = path.split("/")
-                filename = parts[-1]
-                if len(filename) > path_width - 3:
-                    # If filename itself is too long
-                    path = "..." + filename[-(path_width-3):]
-                else:
-                    # Try to keep part of the path before the filename
-                    remaining = path_width - len(filename) - 3
-                    if remaining > 0:
-                        path_prefix = "/".join(parts[:-1])
-                        if len(path_prefix) > remaining:
-                            path_prefix = "..." + path_prefix[-remaining:]
-                        path = f"{path_prefix}/{filename}"
-                    else:
-                        path = "..." + filename
-            else:
-                path = path[:path_width-3] + "..."
+        path = truncate_path(path, path_width)
         
         # Extract and clean up the text match
-        matches = result.get("textMatches", [])
         match_text = ""
         if matches:
-            match_text = matches[0].get("fragment", "")
-            # Clean up - remove newlines and extra spaces
-            match_text = re.sub(r'\s+', ' ', match_text).strip()
+            match_text = clean_fragment(matches[0].get("fragment", ""))
             # Truncate if needed
             if len(match_text) > match_width:
                 match_text = match_text[:match_width-3] + "..."
@@ -245,4 +275,51 @@ def format_code_results(results: List[Dict[str, Any]]) -> Table:
         # Add a row with all the information
         table.add_row(repo, path, match_text)
     
-    return table
\ No newline at end of file
+    return table
+
+@traced("format")
+def format_code_groups(groups: Sequence["RepoGroup"],
+                       max_files: Optional[int] = None,
+                       max_lines: Optional[int] = None) -> Group:
+    """Format grouped code search hits: a heading per repository, a line per file.
+
+    Copies of content already listed are shown as a pointer to the first
+    copy instead of repeating the fragment. `max_files` caps the files shown
+    per repository and `max_lines` the total, for views redrawn while
+    results are still arriving.
+    """
+    lines: List[Text] = []
+    for group in groups:
+        if max_lines is not None and len(lines) >= max_lines:
+            break
+        heading = Text.assemble(
+            (group.repo, "repo"),
+            f"  {group.count} hit{'s' if group.count != 1 else ''}",
+            style="bold",
+        )
+        if group.duplicates:
+            heading.append(f"  ({group.duplicates} duplicate{'s' if group.duplicates != 1 else ''})", style="dim")
+        lines.append(heading)
+
+        shown = group.hits if max_files is None else group.hits[:max_files]
+        for hit in shown:
+            if max_lines is not None and len(lines) >= max_lines:
+                break
+            line = Text("  ")
+            line.append(hit.path, style="bold")
+            if hit.duplicate_of:
+                repo, path = hit.duplicate_of
+                where = path if repo == group.repo else f"{repo}:{path}"
+                line.append(f"  same as {where}", style="dim")
+            else:
+                if hit.copies:
+                    line.append(f" (+{len(hit.copies)} cop{'ies' if len(hit.copies) != 1 else 'y'})", style="dim")
+                # Only the start of a fragment can be shown on one line
+                line.append("  " + clean_fragment(hit.fragment.lstrip()[:1000]), style="cyan")
+            line.no_wrap = True
+            line.overflow = "ellipsis"
+            lines.append(line)
+        hidden = group.count - len(shown)
+        if hidden > 0 and (max_lines is None or len(lines) < max_lines):
+            lines.append(Text(f"  … {hidden} more", style="dim"))
+    return Group(*lines)
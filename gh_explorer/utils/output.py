@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Machine-readable output that bypasses Rich
+"""
+
+import json
+import os
+import sys
+from typing import Any, Iterable, TextIO, Optional
+
+def _stream(stream: Optional[TextIO]) -> TextIO:
+    return stream if stream is not None else sys.stdout
+
+def json_default(value: Any) -> Any:
+    """Convert result sets and their records, which json cannot encode."""
+    if hasattr(value, "to_dicts"):
+        return value.to_dicts()
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _handle_broken_pipe() -> None:
+    """Exit quietly when the reader (e.g. `head`) closed the pipe."""
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+    sys.exit(1)
+
+def write_json(data: Any, stream: Optional[TextIO] = None) -> None:
+    """Write a single JSON document straight to stdout."""
+    out = _stream(stream)
+    try:
+        out.write(json.dumps(data, default=json_default))
+        out.write("\n")
+        out.flush()
+    except BrokenPipeError:
+        _handle_broken_pipe()
+
+def write_ndjson(records: Iterable[Any], stream: Optional[TextIO] = None) -> int:
+    """Write one compact JSON record per line, flushing as each is produced.
+
+    Returns the number of records written.
+    """
+    out = _stream(stream)
+    count = 0
+    try:
+        for record in records:
+            out.write(json.dumps(record, separators=(",", ":"), ensure_ascii=False, default=json_default))
+            out.write("\n")
+            out.flush()
+            count += 1
+    except BrokenPipeError:
+        _handle_broken_pipe()
+    return count
+
+def write_lines(lines: Iterable[str], stream: Optional[TextIO] = None) -> int:
+    """Write plain text lines (e.g. names for fzf); returns how many were written."""
+    out = _stream(stream)
+    count = 0
+    try:
+        for line in lines:
+            out.write(line)
+            out.write("\n")
+            count += 1
+        out.flush()
+    except BrokenPipeError:
+        _handle_broken_pipe()
+    return count
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Filesystem locations used by GitHub Explorer
+"""
+
+import os
+from pathlib import Path
+
+APP_NAME = "gh-explorer"
+
+def cache_dir(*parts: str) -> Path:
+    """Return (and create) a directory under the user cache location."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(Path.home(), ".cache")
+    path = Path(base, APP_NAME, *parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+def data_dir(*parts: str) -> Path:
+    """Return (and create) a directory under the user data location."""
+    base = os.environ.get("XDG_DATA_HOME") or os.path.join(Path.home(), ".local", "share")
+    path = Path(base, APP_NAME, *parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
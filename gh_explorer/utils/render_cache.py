@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Cache of rendered Markdown, keyed by content, policy and width
+
+Parsing and laying out a README is by far the most expensive part of drawing
+a repository. CachedMarkdown renders through Rich once per (README, policy,
+width) and replays the stored lines on every later draw.
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Callable, Hashable, List, Optional, Tuple
+
+from rich.console import Console, ConsoleOptions, RenderResult
+from rich.markdown import Markdown
+from rich.segment import Segment
+
+from gh_explorer.utils.trace import traced
+
+# Upper bound on cached lines across all entries (roughly 100 bytes each)
+DEFAULT_MAX_LINES = 50_000
+
+Lines = List[List[Segment]]
+
+class RenderCache:
+    """LRU of rendered lines, bounded by the total number of lines held."""
+
+    def __init__(self, max_lines: int = DEFAULT_MAX_LINES):
+        """Initialize an empty cache holding at most `max_lines` lines."""
+        self.max_lines = max_lines
+        self._entries: "OrderedDict[Hashable, Lines]" = OrderedDict()
+        self._lines = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Lines]:
+        """Return the lines stored for a key, marking them recently used."""
+        lines = self._entries.get(key)
+        if lines is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return lines
+
+    def put(self, key: Hashable, lines: Lines) -> None:
+        """Store rendered lines, evicting the least recently used entries."""
+        if len(lines) > self.max_lines:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._lines -= len(old)
+        self._entries[key] = lines
+        self._lines += len(lines)
+        while self._lines > self.max_lines:
+            _, evicted = self._entries.popitem(last=False)
+            self._lines -= len(evicted)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._lines = 0
+
+# Shared by the detail view and the browser, so both reuse each other's work
+README_CACHE = RenderCache()
+
+def content_digest(text: str) -> str:
+    """Return a short, stable digest identifying a text."""
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+class CachedMarkdown:
+    """A Markdown renderable that lays out each (text, policy, width) once.
+
+    `prepare`, if given, transforms the text before parsing (e.g. truncating
+    it); `policy` must name that transformation, since it is part of the key.
+    When rendered into a fixed height (a Layout region or a Panel in one),
+    only the lines that fit are replayed.
+    """
+
+    def __init__(self,
+                 text: str,
+                 policy: Hashable = "",
+                 prepare: Optional[Callable[[str], str]] = None,
+                 cache: Optional[RenderCache] = None,
+                 **markdown_options):
+        """Initialize the renderable; nothing is parsed until it is drawn."""
+        self.text = text
+        self.policy = policy
+        self.prepare = prepare
+        self.cache = cache if cache is not None else README_CACHE
+        self.markdown_options = markdown_options
+        self._digest: Optional[str] = None
+
+    def _key(self, console: Console, options: ConsoleOptions) -> Tuple[Hashable, ...]:
+        if self._digest is None:
+            self._digest = content_digest(self.text)
+        # Styles are resolved against the console's theme, so lines rendered
+        # for one console are not reused by another
+        return (self._digest, self.policy, options.max_width, id(console),
+                tuple(sorted(self.markdown_options.items())))
+
+    @traced("render", "markdown.render")
+    def _render(self, console: Console, options: ConsoleOptions) -> Lines:
+        source = self.prepare(self.text) if self.prepare else self.text
+        markdown = Markdown(source, **self.markdown_options)
+        return console.render_lines(markdown, options.update(height=None), pad=False, new_lines=False)
+
+    def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
+        key = self._key(console, options)
+        lines = self.cache.get(key)
+        if lines is None:
+            lines = self._render(console, options)
+            self.cache.put(key, lines)
+        if options.height is not None:
+            lines = lines[:options.height]
+        new_line = Segment.line()
+        for line in lines:
+            yield from line
+            yield new_line
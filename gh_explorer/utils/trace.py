@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Tracing of backend requests, JSON decoding and rendering
+
+With `ghx --trace FILE` (or GHX_TRACE=FILE) every backend request, JSON
+decode and format/render call is recorded as a span, written on exit as
+Chrome trace-event JSON (open it in chrome://tracing or ui.perfetto.dev)
+and summarized in a table on stderr.
+
+Tracing is off unless enabled, and a disabled span costs one global
+lookup, so instrumentation can stay in hot paths.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Longest argument string kept in an event (commands can carry whole queries)
+MAX_ARG_LENGTH = 200
+
+_tracer: Optional["Tracer"] = None
+
+class Tracer:
+    """Collects complete ("X") trace events in memory until written."""
+
+    def __init__(self, path: str):
+        """Start a trace that will be written to `path`."""
+        self.path = path
+        self.pid = os.getpid()
+        self.started = time.perf_counter_ns()
+        self.events: List[Dict[str, Any]] = []
+        self._threads: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def now(self) -> int:
+        """Nanoseconds since the trace started."""
+        return time.perf_counter_ns() - self.started
+
+    def add(self, name: str, category: str, start: int, end: int, args: Dict[str, Any]) -> None:
+        """Record a finished span; `start` and `end` come from now()."""
+        tid = threading.get_ident()
+        event = {
+            "name": name, "cat": category, "ph": "X", "pid": self.pid, "tid": tid,
+            # Trace-event timestamps are microseconds
+            "ts": start / 1000, "dur": (end - start) / 1000,
+            "args": {key: _arg(value) for key, value in args.items() if value is not None},
+        }
+        with self._lock:
+            if tid not in self._threads:
+                self._threads[tid] = threading.current_thread().name
+            self.events.append(event)
+
+    def to_json(self) -> Dict[str, Any]:
+        """The trace in Chrome trace-event format, with thread names."""
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+            for tid, name in self._threads.items()
+        ]
+        return {"traceEvents": metadata + self.events, "displayTimeUnit": "ms"}
+
+    def write(self) -> None:
+        """Write the trace file (replacing any earlier one)."""
+        tmp = f"{self.path}.{self.pid}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_json(), f, separators=(",", ":"))
+        os.replace(tmp, self.path)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per (category, name) count, total and max duration in ms, slowest first."""
+        rows: Dict[tuple, Dict[str, Any]] = {}
+        for event in self.events:
+            row = rows.setdefault((event["cat"], event["name"]), {
+                "category": event["cat"], "name": event["name"],
+                "count": 0, "total_ms": 0.0, "max_ms": 0.0, "bytes": 0, "cache": {},
+            })
+            duration = event["dur"] / 1000
+            row["count"] += 1
+            row["total_ms"] += duration
+            row["max_ms"] = max(row["max_ms"], duration)
+            row["bytes"] += event["args"].get("bytes", 0)
+            cache = event["args"].get("cache")
+            if cache:
+                row["cache"][cache] = row["cache"].get(cache, 0) + 1
+        return sorted(rows.values(), key=lambda row: row["total_ms"], reverse=True)
+
+def _arg(value: Any) -> Any:
+    """Make a span argument JSON-safe and bounded."""
+    if isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, (list, tuple)):
+        value = " ".join(str(item) for item in value)
+    value = str(value)
+    return value if len(value) <= MAX_ARG_LENGTH else value[:MAX_ARG_LENGTH - 1] + "…"
+
+def enable(path: str) -> Tracer:
+    """Start tracing to `path`; returns the active tracer."""
+    global _tracer
+    _tracer = Tracer(path)
+    return _tracer
+
+def disable() -> Optional[Tracer]:
+    """Stop tracing; returns the tracer that was active, if any."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+def active() -> Optional[Tracer]:
+    """The active tracer, or None when tracing is off."""
+    return _tracer
+
+class Span:
+    """A span being timed; add arguments learned along the way with set()."""
+
+    __slots__ = ("tracer", "name", "category", "args", "start")
+
+    def __init__(self, tracer: Tracer, name: str, category: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0
+
+    def set(self, **args: Any) -> None:
+        self.args.update(args)
+
+    def __enter__(self) -> "Span":
+        self.start = self.tracer.now()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.add(self.name, self.category, self.start, self.tracer.now(), self.args)
+
+class _NoSpan:
+    """Stand-in returned by span() while tracing is off."""
+
+    __slots__ = ()
+
+    def set(self, **args: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+_NO_SPAN = _NoSpan()
+
+def span(name: str, category: str, **args: Any) -> Any:
+    """Context manager timing a block as a span (a no-op when tracing is off)."""
+    tracer = _tracer
+    if tracer is None:
+        return _NO_SPAN
+    return Span(tracer, name, category, args)
+
+def traced(category: str, name: Optional[str] = None) -> Callable[[F], F]:
+    """Decorator recording every call of a function as a span."""
+    def decorate(func: F) -> F:
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with Span(_tracer, span_name, category, {}):
+                return func(*args, **kwargs)
+        return wrapper  # type: ignore[return-value]
+    return decorate
+
+def decode_json(text: str) -> Any:
+    """json.loads, recorded as a parse span with the size decoded."""
+    if _tracer is None:
+        return json.loads(text)
+    with Span(_tracer, "json.decode", "parse", {"bytes": len(text)}):
+        return json.loads(text)
+
+def format_summary(tracer: Tracer, wall_ms: Optional[float] = None) -> Any:
+    """A Rich table of where the traced time went, in milliseconds."""
+    from rich.table import Table
+
+    if wall_ms is None:
+        wall_ms = tracer.now() / 1e6
+    table = Table(title=f"ghx trace: {wall_ms:.0f} ms total, written to {tracer.path}",
+                  title_justify="left", box=None, header_style="bold")
+    table.add_column("Span", no_wrap=True)
+    table.add_column("Calls", justify="right")
+    table.add_column("Total ms", justify="right")
+    table.add_column("Mean", justify="right")
+    table.add_column("Max", justify="right")
+    table.add_column("Wall", justify="right")
+    table.add_column("Notes")
+    for row in tracer.summary():
+        notes = []
+        if row["bytes"]:
+            notes.append(f"{row['bytes'] / 1024:.1f} KiB")
+        if row["cache"]:
+            notes.append(", ".join(f"{count} {state}" for state, count in sorted(row["cache"].items())))
+        table.add_row(
+            row["name"], str(row["count"]),
+            f"{row['total_ms']:.1f}", f"{row['total_ms'] / row['count']:.1f}", f"{row['max_ms']:.1f}",
+            # Spans nest and run in threads, so shares can add up past 100%
+            f"{100 * row['total_ms'] / wall_ms:.0f}%" if wall_ms else "",
+            "; ".join(notes),
+        )
+    return table
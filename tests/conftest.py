@@ -0,0 +1,46 @@
+"""Shared fixtures: a scripted backend and a client wired to it."""
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pytest
+
+from gh_explorer.api.backends import Response
+from gh_explorer.api.cache import ResponseCache
+from gh_explorer.api.client import GitHubClient
+from gh_explorer.api.ratelimit import RateLimitScheduler
+
+class FakeBackend:
+    """Answers gh commands from a handler and records every request."""
+
+    name = "fake"
+
+    def __init__(self, handler: Callable[[List[str], Dict[str, str]], Response]):
+        self.handler = handler
+        self.requests: List[Tuple[List[str], Dict[str, str]]] = []
+
+    def execute(self, args: List[str], headers: Optional[Dict[str, str]] = None) -> Response:
+        self.requests.append((list(args), dict(headers or {})))
+        return self.handler(args, headers or {})
+
+    def close(self) -> None:
+        pass
+
+@pytest.fixture(autouse=True)
+def isolated_dirs(tmp_path, monkeypatch):
+    """Keep caches, data and the gh probe out of the user's directories."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "data"))
+    for name in ("GHX_NO_CACHE", "GHX_CACHE_TTL", "GHX_INDEX_PATH", "GHX_BACKEND"):
+        monkeypatch.delenv(name, raising=False)
+
+@pytest.fixture
+def make_client(tmp_path, monkeypatch):
+    """Build a GitHubClient on a FakeBackend, without needing gh installed."""
+    monkeypatch.setattr(GitHubClient, "_check_gh_installed", lambda self: None)
+
+    def make(handler, ttl: int = 300, **kwargs) -> GitHubClient:
+        kwargs.setdefault("cache", ResponseCache(tmp_path / "responses", ttl=ttl))
+        kwargs.setdefault("use_index", False)
+        kwargs.setdefault("scheduler", RateLimitScheduler(sleep=lambda seconds: None))
+        return GitHubClient(backend=FakeBackend(handler), **kwargs)
+    return make
@@ -0,0 +1,104 @@
+"""Tests for HTTPBackend against a local stand-in for the GitHub API."""
+
+import gzip
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from gh_explorer.api.backends import HTTPBackend
+from gh_explorer.api.cache import cache_key
+
+class FakeAPI(BaseHTTPRequestHandler):
+    """Answers a few endpoints over keep-alive HTTP/1.1 connections."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=b"", headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.client_address[1], dict(self.headers)))
+        if self.path == "/repos/o/r":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self._send(304, headers={"ETag": '"v1"'})
+            else:
+                self._send(200, json.dumps({"full_name": "o/r"}).encode(), {"ETag": '"v1"'})
+        elif self.path == "/gzipped":
+            self._send(200, gzip.compress(b'{"zipped": true}'), {"Content-Encoding": "gzip"})
+        elif self.path == "/hang-up":
+            # Answer, then drop the connection without announcing it, like a
+            # server closing an idle keep-alive connection
+            self._send(200, b"{}")
+            self.close_connection = True
+        else:
+            self._send(404, b'{"message": "Not Found"}')
+
+@pytest.fixture
+def api():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeAPI)
+    server.daemon_threads = True
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def _backend(server):
+    host, port = server.server_address
+    return HTTPBackend(token="secret", base_url=f"http://{host}:{port}")
+
+def test_connections_are_kept_alive(api):
+    backend = _backend(api)
+    for _ in range(3):
+        assert backend.request("GET", "/repos/o/r").status == 200
+    assert len({port for _, port, _ in api.requests}) == 1
+    assert api.requests[0][2]["Authorization"] == "token secret"
+    backend.close()
+    assert backend._pool.empty()
+
+def test_a_dropped_connection_is_retried_once(api):
+    backend = _backend(api)
+    backend.request("GET", "/hang-up")
+    assert backend.request("GET", "/repos/o/r").status == 200
+    assert len({port for _, port, _ in api.requests}) == 2
+
+def test_gzip_bodies_are_decoded(api):
+    response = _backend(api).request("GET", "/gzipped")
+    assert json.loads(response.body) == {"zipped": True}
+    assert api.requests[0][2]["Accept-Encoding"] == "gzip"
+
+def test_unreachable_api_raises_runtime_error():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    backend = HTTPBackend(token="secret", base_url=f"http://127.0.0.1:{port}")
+    with pytest.raises(RuntimeError, match="GitHub API request failed"):
+        backend.request("GET", "/repos/o/r")
+
+def test_error_statuses_raise_like_gh(api):
+    with pytest.raises(RuntimeError, match=r"Not Found \(HTTP 404\)"):
+        _backend(api).execute(["api", "repos/o/missing"])
+
+def test_etag_revalidation_over_http(api, make_client):
+    client = make_client(None, ttl=0)
+    client.backend = _backend(api)
+    assert json.loads(client.run_command(["api", "repos/o/r"])) == {"full_name": "o/r"}
+    assert json.loads(client.run_command(["api", "repos/o/r"])) == {"full_name": "o/r"}
+
+    assert "If-None-Match" not in api.requests[0][2]
+    assert api.requests[1][2]["If-None-Match"] == '"v1"'
+    assert client.cache.get(cache_key(["api", "repos/o/r"]))["etag"] == '"v1"'
+    client.close()
+    assert client.backend._pool.empty()
@@ -0,0 +1,63 @@
+"""Tests for the content-addressed README store."""
+
+import base64
+import json
+
+from gh_explorer.api.backends import Response
+from gh_explorer.data.blobs import BlobStore
+
+SHA = "a" * 40
+README = "# Hello\n\nworld"
+
+def _objects(store):
+    return sorted(p.name for p in (store.directory / "objects").rglob("*.z"))
+
+def test_blobs_round_trip_compressed(tmp_path):
+    store = BlobStore(tmp_path)
+    assert store.get(SHA) is None and not store.has(SHA)
+    store.put(SHA, README)
+    assert store.has(SHA)
+    assert store.get(SHA) == README
+    assert _objects(store) == [f"{SHA}.z"]
+    assert (tmp_path / "objects" / "aa" / f"{SHA}.z").read_bytes() != README.encode("utf-8")
+
+def test_identical_readmes_are_stored_once(tmp_path):
+    store = BlobStore(tmp_path)
+    store.put(SHA, README)
+    # Blobs never change, so a second copy under the same SHA is ignored
+    store.put(SHA, "something else")
+    store.set_ref("o/r", SHA, "README.md")
+    store.set_ref("Fork/R", SHA, "docs/README.md")
+    assert _objects(store) == [f"{SHA}.z"]
+    assert store.get(SHA) == README
+    assert store.ref("o/r") == (SHA, "README.md")
+    assert store.ref("fork/r") == (SHA, "docs/README.md")
+
+def test_malformed_shas_are_ignored(tmp_path):
+    store = BlobStore(tmp_path)
+    store.put("../escape", README)
+    store.set_ref("o/r", "not-a-sha", "README.md")
+    assert not (tmp_path / "objects").exists()
+    assert store.get("../escape") is None and store.ref("o/r") is None
+
+def test_a_stored_readme_is_served_without_downloading_it(tmp_path, make_client):
+    def handler(args, headers):
+        if args[:2] == ["repo", "view"]:
+            return Response(200, json.dumps({"nameWithOwner": args[2]}), {})
+        if args[:2] == ["api", "graphql"]:
+            return Response(200, json.dumps({"data": {"repository": {"c0": {"oid": SHA}}}}), {})
+        if args[1].endswith("/readme"):
+            content = base64.b64encode(README.encode("utf-8")).decode("ascii")
+            return Response(200, json.dumps({"sha": SHA, "path": "README.md", "content": content}), {})
+        return Response(404, "", {})
+    store = BlobStore(tmp_path / "readmes")
+    client = make_client(handler, readmes=store)
+
+    assert client.get_repository("o/r")["readme"] == {"text": README}
+    assert store.ref("o/r") == (SHA, "README.md")
+
+    # A fork with the same README, once its ref is known, only looks up the SHA
+    store.set_ref("fork/r", SHA, "README.md")
+    client.backend.requests.clear()
+    assert client.get_repository("fork/r")["readme"] == {"text": README}
+    assert [args[:2] for args, _ in client.backend.requests] == [["repo", "view"], ["api", "graphql"]]
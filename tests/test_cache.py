@@ -0,0 +1,84 @@
+"""Tests for the response cache and its use by GitHubClient.run_command."""
+
+from gh_explorer.api.backends import Response
+from gh_explorer.api.cache import ResponseCache, cache_key, is_cacheable, normalize_args
+
+def test_normalize_args_ignores_option_order():
+    first = ["search", "repos", "cli", "--limit", "10", "--language", "go"]
+    second = ["search", "repos", "--language", "go", "cli", "--limit", "10"]
+    assert normalize_args(first) == normalize_args(second)
+    assert cache_key(first) == cache_key(second)
+
+def test_normalize_args_sorts_json_fields():
+    assert normalize_args(["repo", "view", "a/b", "--json", "url, name,description"]) == \
+        ["repo", "view", "a/b", "--json", "description,name,url"]
+
+def test_normalize_args_drops_output_only_flags():
+    assert normalize_args(["api", "repos/a/b", "--include"]) == ["api", "repos/a/b"]
+
+def test_normalize_args_keeps_distinct_values_apart():
+    assert cache_key(["search", "repos", "x", "--limit", "10"]) != \
+        cache_key(["search", "repos", "x", "--limit", "20"])
+
+def test_is_cacheable_read_only_queries():
+    assert is_cacheable(["search", "repos", "cli"])
+    assert is_cacheable(["repo", "view", "a/b", "--json", "name"])
+    assert is_cacheable(["api", "repos/a/b/readme"])
+    assert is_cacheable(["api", "repos/a/b", "-X", "GET"])
+    assert is_cacheable(["api", "graphql", "-f", "query=query { viewer { login } }"])
+
+def test_is_cacheable_rejects_writes_and_side_effects():
+    assert not is_cacheable([])
+    assert not is_cacheable(["repo", "view", "a/b", "--web"])
+    assert not is_cacheable(["repo", "clone", "a/b"])
+    assert not is_cacheable(["gist", "create", "file.py"])
+    assert not is_cacheable(["api", "repos/a/b/forks", "-X", "POST"])
+    assert not is_cacheable(["api", "repos/a/b/issues", "-f", "title=x"])
+    assert not is_cacheable(["api", "graphql", "-f", "query=mutation { addStar }"])
+
+def test_entries_expire_after_ttl(tmp_path):
+    cache = ResponseCache(tmp_path, ttl=60)
+    entry = cache.put("k" * 64, "body", {"ETag": '"v1"', "Last-Modified": "yesterday"})
+    assert cache.get("k" * 64)["body"] == "body"
+    assert cache.is_fresh(entry)
+    entry["fetched_at"] -= 61
+    assert not cache.is_fresh(entry)
+    assert cache.validators(entry) == {"If-None-Match": '"v1"', "If-Modified-Since": "yesterday"}
+
+def test_fresh_entry_is_served_without_a_request(make_client):
+    client = make_client(lambda args, headers: Response(200, "[1]", {"etag": '"v1"'}))
+    assert client.run_command(["api", "repos/a/b"]) == "[1]"
+    assert client.run_command(["api", "repos/a/b"]) == "[1]"
+    assert len(client.backend.requests) == 1
+
+def test_stale_entry_is_revalidated_with_its_etag(make_client):
+    def handler(args, headers):
+        if headers.get("If-None-Match") == '"v1"':
+            return Response(304, "", {})
+        return Response(200, "[1]", {"etag": '"v1"'})
+    client = make_client(handler, ttl=0)
+
+    assert client.run_command(["api", "repos/a/b"]) == "[1]"
+    assert client.run_command(["api", "repos/a/b"]) == "[1]"
+    (_, first), (_, second) = client.backend.requests
+    assert "If-None-Match" not in first
+    assert second["If-None-Match"] == '"v1"'
+
+def test_changed_response_replaces_the_entry(make_client):
+    bodies = iter([("[1]", '"v1"'), ("[2]", '"v2"')])
+
+    def handler(args, headers):
+        body, etag = next(bodies)
+        return Response(200, body, {"etag": etag})
+    client = make_client(handler, ttl=0)
+
+    assert client.run_command(["api", "repos/a/b"]) == "[1]"
+    assert client.run_command(["api", "repos/a/b"]) == "[2]"
+    entry = client.cache.get(cache_key(["api", "repos/a/b"]))
+    assert entry["body"] == "[2]" and entry["etag"] == '"v2"'
+
+def test_uncacheable_commands_bypass_the_cache(make_client):
+    client = make_client(lambda args, headers: Response(200, "ok", {}))
+    client.run_command(["api", "repos/a/b/forks", "-X", "POST"])
+    client.run_command(["api", "repos/a/b/forks", "-X", "POST"])
+    assert len(client.backend.requests) == 2
@@ -0,0 +1,90 @@
+"""Tests for catalog lookups and the --language/--topic option callback."""
+
+import click
+from click.testing import CliRunner
+
+from gh_explorer.cli import catalog_callback
+from gh_explorer.data.catalog import Catalog, Entry, FuzzyIndex, edit_distance, normalize
+
+LANGUAGES = FuzzyIndex([
+    Entry("Python", 9000, ("py", "python3")),
+    Entry("Go", 5000, ("golang",)),
+    Entry("Vim Script", 300, ("vimscript", "viml")),
+    Entry("Pony", 10, ()),
+])
+
+TOPICS = FuzzyIndex([
+    Entry("vue", 800, ("vuejs",)),
+    Entry("machine-learning", 700, ("ml",)),
+])
+
+def test_normalize_ignores_case_and_separators():
+    assert normalize("Vim script") == normalize("vim-script") == normalize("VIM_SCRIPT")
+
+def test_edit_distance_counts_transpositions_once():
+    assert edit_distance("pyhton", "python", 2) == 1
+    assert edit_distance("abc", "xyz", 1) == 2
+
+def test_resolve_accepts_names_and_aliases():
+    assert LANGUAGES.resolve("python").name == "Python"
+    assert LANGUAGES.resolve("golang").name == "Go"
+    assert LANGUAGES.resolve("vim_script").name == "Vim Script"
+    assert TOPICS.resolve("Machine_Learning").name == "machine-learning"
+
+def test_resolve_never_applies_fuzzy_matches():
+    assert LANGUAGES.resolve("pyhton") is None
+    assert TOPICS.resolve("vue3") is None
+    assert LANGUAGES.resolve("") is None
+
+def test_suggest_offers_clear_close_matches():
+    assert LANGUAGES.suggest("pyhton").name == "Python"
+    assert TOPICS.suggest("machin-lerning").name == "machine-learning"
+
+def test_suggest_stays_quiet_for_exact_short_or_distant_input():
+    assert LANGUAGES.suggest("golang") is None
+    assert LANGUAGES.suggest("pz") is None
+    assert LANGUAGES.suggest("haskell") is None
+
+def test_search_ranks_prefixes_by_popularity():
+    assert [match.name for match in LANGUAGES.search("p", limit=2)] == ["Python", "Pony"]
+
+def test_overlay_adds_weights_and_aliases(tmp_path):
+    bundled = tmp_path / "bundled.json"
+    bundled.write_text('{"topics": [["vue", 800, ["vuejs"]]]}', encoding="utf-8")
+    catalog = Catalog(bundled, tmp_path / "overlay.json")
+    catalog.update("topics", "vue", weight=900, aliases=["vue-js"])
+    catalog.update("topics", "htmx", weight=50)
+    catalog.save()
+
+    reloaded = Catalog(bundled, tmp_path / "overlay.json")
+    assert reloaded.entries("topics") == [Entry("vue", 900, ("vuejs", "vue-js")), Entry("htmx", 50, ())]
+    assert reloaded.resolve("topics", "VUE_JS").name == "vue"
+
+def test_callback_replaces_aliases_and_keeps_other_values(monkeypatch):
+    from gh_explorer.data import catalog as catalog_module
+    catalog = Catalog(overlay=None)
+    catalog._indexes["topics"] = TOPICS
+    monkeypatch.setattr(catalog_module, "_catalog", catalog)
+
+    def run(value, obj=None):
+        @click.command()
+        @click.option("--topic", callback=catalog_callback("topics"))
+        def command(topic):
+            click.echo(f"topic={topic}")
+        return CliRunner().invoke(command, ["--topic", value], obj=obj or {})
+
+    result = run("vuejs")
+    assert "topic=vue" in result.stdout
+    assert "Using --topic vue for 'vuejs'" in result.stderr
+
+    result = run("vue3")
+    assert "topic=vue3" in result.stdout
+    assert "did you mean --topic vue? Searching for 'vue3' as given." in result.stderr
+
+    result = run("htmx")
+    assert "topic=htmx" in result.stdout
+    assert result.stderr == ""
+
+    result = run("vuejs", {"NO_FUZZY": True})
+    assert "topic=vuejs" in result.stdout
+    assert result.stderr == ""
@@ -0,0 +1,96 @@
+"""Tests for the ghx daemon and the DaemonClient that forwards to it."""
+
+import json
+import socket
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+from gh_explorer.api.backends import Response
+from gh_explorer.api.daemon import DaemonClient, daemon_status, serve, stop_daemon
+
+INFO = {"nameWithOwner": "o/r", "description": "A repository", "stargazerCount": 3}
+
+def handler(args, headers):
+    if args[:2] == ["repo", "view"]:
+        return Response(200, json.dumps(INFO), {})
+    return Response(404, '{"message": "Not Found"}', {})
+
+@pytest.fixture
+def socket_dir():
+    # Unix socket paths are limited to about 100 bytes, which pytest's
+    # tmp_path can exceed
+    with tempfile.TemporaryDirectory(prefix="ghx-") as directory:
+        yield Path(directory)
+
+@pytest.fixture
+def daemon(socket_dir, make_client):
+    """Run `serve` in a thread and return its socket path and client."""
+    path = socket_dir / "daemon.sock"
+    client = make_client(handler)
+    thread = threading.Thread(target=serve, args=(client, path), kwargs={"log": lambda message: None}, daemon=True)
+    thread.start()
+    for _ in range(500):
+        if daemon_status(path) is not None:
+            break
+        threading.Event().wait(0.01)
+    yield path, client
+    stop_daemon(path)
+    thread.join(5)
+
+def _no_local():
+    raise AssertionError("the query should have been answered by the daemon")
+
+def test_queries_round_trip_through_the_daemon(daemon):
+    path, client = daemon
+    remote = DaemonClient(_no_local, path=path)
+    assert remote.get_repository("o/r") == INFO
+    assert remote.available
+    assert [args[:2] for args, _ in client.backend.requests] == [["repo", "view"], ["api", "repos/o/r/readme"]]
+
+def test_missing_daemon_falls_back_to_a_local_client(socket_dir, make_client):
+    local = make_client(handler)
+    remote = DaemonClient(lambda: local, path=socket_dir / "missing.sock")
+    assert remote.get_repository("o/r") == INFO
+    assert not remote.available
+    assert remote.local is local
+
+def test_status_and_shutdown(daemon):
+    path, _ = daemon
+    DaemonClient(_no_local, path=path).get_repository("o/r")
+    status = daemon_status(path)
+    assert status["socket"] == str(path)
+    assert status["requests"] >= 2 and status["errors"] == 0
+
+    assert stop_daemon(path)
+    for _ in range(500):
+        if not path.exists():
+            break
+        threading.Event().wait(0.01)
+    assert not path.exists()
+    assert daemon_status(path) is None and not stop_daemon(path)
+
+def test_a_stream_cut_off_midway_is_not_rerun_locally(socket_dir):
+    path = socket_dir / "daemon.sock"
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(str(path))
+    listener.listen(1)
+
+    def answer_once():
+        # Stream one item, then hang up without the closing "done" line
+        connection, _ = listener.accept()
+        with connection, connection.makefile("r", encoding="utf-8") as reader:
+            reader.readline()
+            connection.sendall(b'{"item": {"fullName": "o/r"}}\n')
+    thread = threading.Thread(target=answer_once, daemon=True)
+    thread.start()
+    try:
+        items = DaemonClient(_no_local, path=path).iter_search_repositories("cli")
+        assert next(items) == {"fullName": "o/r"}
+        with pytest.raises(RuntimeError, match="stopped while streaming"):
+            next(items)
+    finally:
+        thread.join(5)
+        listener.close()
@@ -0,0 +1,73 @@
+"""Tests for the columnar result sets."""
+
+import json
+
+from gh_explorer.api.models import CodeResultSet, RepoResultSet, TextColumn, iter_columns
+from gh_explorer.utils.output import json_default
+
+REPOS = [
+    {"fullName": "a/one", "description": "First, with ünïcode ✓", "stargazersCount": 30,
+     "forksCount": 2, "updatedAt": "2024-01-01", "url": "https://github.com/a/one", "language": "Go"},
+    {"fullName": "b/two", "description": None, "stargazersCount": 10,
+     "forksCount": 0, "updatedAt": "2024-01-01", "url": "https://github.com/b/two", "language": None},
+    {"fullName": "c/three", "description": "", "stargazersCount": 20,
+     "forksCount": 5, "updatedAt": "2023-06-30", "url": "https://github.com/c/three", "language": "Go"},
+]
+
+def test_repo_result_set_round_trips():
+    repos = RepoResultSet.from_dicts(REPOS)
+    assert len(repos) == 3
+    assert repos.to_dicts() == REPOS
+    assert repos == REPOS
+
+def test_round_trip_through_json():
+    repos = RepoResultSet.from_dicts(REPOS)
+    decoded = json.loads(json.dumps(repos, default=json_default))
+    assert RepoResultSet.from_dicts(decoded).to_dicts() == REPOS
+
+def test_records_read_like_dicts():
+    record = RepoResultSet.from_dicts(REPOS)[-1]
+    assert record["fullName"] == "c/three"
+    assert record.get("missing", "default") == "default"
+    assert "language" in record
+    assert record.to_dict() == REPOS[2]
+    assert dict(record.items()) == REPOS[2]
+
+def test_missing_fields_and_counts():
+    repos = RepoResultSet.from_dicts([{"fullName": "x/y"}])
+    assert repos.to_dicts() == [{
+        "fullName": "x/y", "description": None, "stargazersCount": 0, "forksCount": 0,
+        "updatedAt": None, "url": None, "language": None,
+    }]
+
+def test_slicing_taking_and_sorting_keep_rows_intact():
+    repos = RepoResultSet.from_dicts(REPOS)
+    assert repos[1:].to_dicts() == REPOS[1:]
+    assert repos.take([2, 0]).to_dicts() == [REPOS[2], REPOS[0]]
+    by_stars = repos.sort_by("stargazersCount", reverse=True)
+    assert [r["fullName"] for r in by_stars] == ["a/one", "c/three", "b/two"]
+    # Missing values sort last either way
+    assert [r["fullName"] for r in repos.sort_by("language")][-1] == "b/two"
+
+def test_text_column_keeps_none_and_empty_apart():
+    column = TextColumn(["a", None, "", "ß"])
+    assert list(column) == ["a", None, "", "ß"]
+    assert column[-1] == "ß"
+    assert list(column[1:3]) == [None, ""]
+
+def test_code_results_share_repository_objects():
+    repository = {"nameWithOwner": "a/one", "url": "u"}
+    hits = [
+        {"repository": dict(repository), "path": "x.py", "textMatches": []},
+        {"repository": dict(repository), "path": "y.py", "textMatches": [{"fragment": "f"}]},
+    ]
+    results = CodeResultSet.from_dicts(hits)
+    assert results.to_dicts() == hits
+    assert results[0]["repository"] is results[1]["repository"]
+
+def test_iter_columns_reads_sets_and_dicts_alike():
+    repos = RepoResultSet.from_dicts(REPOS)
+    fields = ("fullName", "stargazersCount")
+    expected = [("b/two", 10), ("c/three", 20)]
+    assert list(iter_columns(repos, fields, 1)) == expected
+    assert list(iter_columns(REPOS, fields, 1)) == expected
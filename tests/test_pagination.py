@@ -0,0 +1,74 @@
+"""Tests for search slicing and the paginating search iterators."""
+
+import json
+from urllib.parse import parse_qs, urlsplit
+
+from gh_explorer.api import pagination
+from gh_explorer.api.backends import Response
+from gh_explorer.api.pagination import Dimension
+
+STARS = Dimension("stars", 0, 100)
+SIZE = Dimension("size", 0, 1)
+
+def test_split_slice_halves_the_first_splittable_dimension():
+    left, right = pagination.split_slice({}, [STARS])
+    assert left == {"stars": (0, 50)}
+    assert right == {"stars": (51, 100)}
+
+def test_split_slice_moves_on_when_a_dimension_is_exhausted():
+    halves = pagination.split_slice({"size": (1, 1)}, [SIZE, STARS])
+    assert halves == [{"size": (1, 1), "stars": (0, 50)}, {"size": (1, 1), "stars": (51, 100)}]
+    assert pagination.split_slice({"stars": (7, 7)}, [STARS]) is None
+
+def test_slice_query_appends_range_qualifiers():
+    created = pagination.repository_dimensions()[0]
+    low = created.low
+    query = pagination.slice_query("cli", [created, STARS], {"created": (low, low + 1), "stars": (3, 9)})
+    assert query.startswith("cli created:2007-10-01..2007-10-02")
+    assert query.endswith(" stars:3..9")
+
+def test_usable_dimensions_skip_qualifiers_in_the_query():
+    dims = pagination.repository_dimensions()
+    assert [d.qualifier for d in pagination.usable_dimensions("cli stars:>10", dims)] == ["created"]
+
+def _repo(number):
+    return {"full_name": f"o/r{number}", "stargazers_count": number, "forks_count": 0,
+            "html_url": "", "language": None, "description": None, "updated_at": ""}
+
+def _search_handler(pages_seen, total_for):
+    """Serve search pages; `total_for(query)` gives each slice's total count."""
+    def handler(args, headers):
+        params = parse_qs(urlsplit(args[1]).query)
+        query, page, per_page = params["q"][0], int(params["page"][0]), int(params["per_page"][0])
+        pages_seen.append((query, page, per_page))
+        total = total_for(query)
+        start = (page - 1) * per_page
+        count = max(0, min(per_page, min(total, pagination.SEARCH_CAP) - start))
+        items = [_repo(start + i) for i in range(count)]
+        return Response(200, json.dumps({"total_count": total, "items": items}), {})
+    return handler
+
+def test_overflowing_search_is_split_into_slices(make_client):
+    pages = []
+    # The whole query overflows the cap; any slice of it holds 150 results
+    client = make_client(_search_handler(pages, lambda q: 5000 if "created:" not in q else 150))
+    repos = list(client.iter_search_repositories("cli", limit=None))
+
+    assert len(repos) == 300
+    assert pages[0] == ("cli", 1, 100)
+    sliced = [query for query, page, _ in pages[1:] if page == 1]
+    assert len(sliced) == 2 and all("created:" in query for query in sliced)
+    assert sliced[0] != sliced[1]
+
+def test_limited_search_does_not_split(make_client):
+    pages = []
+    client = make_client(_search_handler(pages, lambda q: 5000))
+    repos = list(client.iter_search_repositories("cli", limit=250))
+    assert len(repos) == 250
+    assert [page for _, page, _ in pages] == [1, 2, 3]
+
+def test_per_page_follows_the_limit(make_client):
+    pages = []
+    client = make_client(_search_handler(pages, lambda q: 5000))
+    assert len(list(client.iter_search_repositories("cli", limit=7))) == 7
+    assert pages == [("cli", 1, 7)]
@@ -0,0 +1,71 @@
+"""Tests for the token buckets and the rate-limit scheduler."""
+
+import time
+
+import pytest
+
+from gh_explorer.api.ratelimit import RateLimitScheduler, TokenBucket
+
+def test_bucket_refills_at_its_rate():
+    bucket = TokenBucket(10, 60.0)
+    start = bucket.updated
+    for _ in range(10):
+        assert bucket.reserve(start) == 0
+    # Empty: the next token arrives after one refill interval (6 seconds)
+    assert bucket.wait_time(start) == pytest.approx(6.0)
+    assert bucket.wait_time(start + 3.0) == pytest.approx(3.0)
+    assert bucket.wait_time(start + 6.0) == 0
+
+def test_bucket_refill_is_capped_at_capacity():
+    bucket = TokenBucket(10, 60.0)
+    bucket.reserve(bucket.updated)
+    bucket.wait_time(bucket.updated + 3600.0)
+    assert bucket.tokens == 10
+
+def test_reservations_queue_behind_each_other():
+    bucket = TokenBucket(1, 10.0)
+    start = bucket.updated
+    assert bucket.reserve(start) == 0
+    assert bucket.reserve(start) == pytest.approx(10.0)
+    assert bucket.reserve(start) == pytest.approx(20.0)
+
+def test_exhausted_server_quota_waits_for_reset():
+    bucket = TokenBucket(10, 60.0)
+    bucket.remaining = 0
+    bucket.reset_at = time.time() + 30
+    assert bucket.wait_time(bucket.updated) == pytest.approx(30, abs=1)
+
+def test_acquire_sleeps_for_the_wait():
+    waits = []
+    scheduler = RateLimitScheduler({"search": (1, 60.0)}, sleep=waits.append)
+    assert scheduler.acquire("search") == 0
+    assert scheduler.acquire("search") == pytest.approx(60.0, abs=0.1)
+    assert waits == [pytest.approx(60.0, abs=0.1)]
+
+def test_refund_returns_a_token():
+    scheduler = RateLimitScheduler({"core": (1, 60.0)}, sleep=lambda seconds: None)
+    scheduler.acquire("core")
+    scheduler.refund("core")
+    assert scheduler.acquire("core") == 0
+
+def test_headers_correct_the_bucket():
+    scheduler = RateLimitScheduler(sleep=lambda seconds: None)
+    scheduler.update("core", {
+        "x-ratelimit-limit": "60", "x-ratelimit-remaining": "5",
+        "x-ratelimit-reset": str(int(time.time()) + 600), "x-ratelimit-resource": "core",
+    })
+    bucket = scheduler.buckets["core"]
+    assert bucket.capacity == 60
+    assert bucket.rate == pytest.approx(60 / 3600.0)
+    assert bucket.remaining == 5
+    assert bucket.tokens == 5
+
+def test_classify_charges_the_right_resource():
+    classify = RateLimitScheduler.classify
+    assert classify(["search", "repos", "x"]) == "search"
+    assert classify(["search", "code", "x"]) == "code_search"
+    assert classify(["api", "search/code?q=x"]) == "code_search"
+    assert classify(["api", "graphql", "-f", "query=..."]) == "graphql"
+    assert classify(["repo", "view", "a/b"]) == "core"
+    assert classify(["repo", "clone", "a/b"]) is None
+    assert classify(["--version"]) is None
@@ -0,0 +1,142 @@
+"""Tests for the browser's detail prefetcher and its tree cache."""
+
+import queue
+
+from gh_explorer.api.tree import RepoTree
+from gh_explorer.ui.widgets.repo_browser import DetailPrefetcher
+
+def _prefetcher(fetch, **kwargs):
+    """Return a prefetcher and a queue of the (name, error) pairs it finishes."""
+    done = queue.Queue()
+    prefetcher = DetailPrefetcher(fetch, on_done=lambda name, error: done.put((name, error)), **kwargs)
+    return prefetcher, done
+
+def _request(prefetcher, done, name):
+    """Request one repository and wait until its fetch has finished."""
+    prefetcher.request(name, 0)
+    assert done.get(timeout=5) == (name, None)
+
+def test_trees_share_the_details_lru():
+    fetched = []
+
+    def fetch(names):
+        fetched.extend(names)
+        return {name: {"nameWithOwner": name} for name in names}
+    prefetcher, done = _prefetcher(fetch, capacity=2)
+    try:
+        tree = RepoTree.from_api({"sha": "t", "tree": []})
+        # No tree is kept for a repository whose details are not cached
+        prefetcher.store_tree("a/one", tree)
+        assert not prefetcher.has_tree("a/one")
+
+        _request(prefetcher, done, "a/one")
+        prefetcher.store_tree("a/one", tree)
+        assert prefetcher.tree("a/one") is tree
+
+        _request(prefetcher, done, "b/two")
+        _request(prefetcher, done, "c/three")
+        assert prefetcher.get("a/one") is None
+        assert not prefetcher.has_tree("a/one")
+        assert fetched == ["a/one", "b/two", "c/three"]
+    finally:
+        prefetcher.shutdown()
+
+def test_failed_tree_is_remembered():
+    prefetcher, done = _prefetcher(lambda names: {name: {"nameWithOwner": name} for name in names})
+    try:
+        _request(prefetcher, done, "a/one")
+        prefetcher.store_tree("a/one", None)
+        assert prefetcher.has_tree("a/one") and prefetcher.tree("a/one") is None
+    finally:
+        prefetcher.shutdown()
+
+def test_a_window_is_fetched_in_one_batch():
+    import threading
+    batches = []
+    done = []
+    finished = threading.Event()
+
+    def fetch(names):
+        batches.append(list(names))
+        return {name: {"nameWithOwner": name} for name in names if name != "r/3"}
+
+    def on_done(name, error):
+        done.append((name, error is None))
+        if len(done) == 5:
+            finished.set()
+    prefetcher = DetailPrefetcher(fetch, radius=2, on_done=on_done)
+    names = [f"r/{i}" for i in range(10)]
+    try:
+        prefetcher.focus(names, 2)
+        assert finished.wait(5)
+        assert batches == [["r/2", "r/3", "r/1", "r/4", "r/0"]]
+        assert ("r/3", False) in done and prefetcher.get("r/3") is None
+        assert prefetcher.get("r/4") == {"nameWithOwner": "r/4"}
+
+        # Moving down one row only fetches the row that came into view
+        finished.clear()
+        prefetcher.focus(names, 3)
+        for _ in range(100):
+            if len(batches) == 2 and len(done) == 7:
+                break
+            threading.Event().wait(0.01)
+        assert batches[1] == ["r/3", "r/5"]
+    finally:
+        prefetcher.shutdown()
+
+def test_directory_listings_are_applied_on_the_ui_thread():
+    import io
+    from rich.console import Console
+    from gh_explorer.ui.widgets.repo_browser import RepoBrowser
+
+    class Client:
+        def get_repositories(self, names):
+            return {name: {"nameWithOwner": name} for name in names}
+
+        def get_tree_listing(self, repo_name, sha):
+            assert sha == "s1"
+            return {"tree": [{"path": "main.py", "type": "blob", "size": 5}]}
+
+    tree = RepoTree.from_api({"sha": "t", "truncated": True,
+                              "tree": [{"path": "src", "type": "tree", "sha": "s1"}]})
+    browser = RepoBrowser({"CONSOLE": Console(file=io.StringIO()), "CLIENT": Client()},
+                          [{"fullName": "a/one"}])
+    try:
+        browser._load_directory("a/one", tree, "src")
+        kind, payload = browser.events.get(timeout=5)
+        assert kind == "tree"
+        # The worker fetched the listing but left the tree alone
+        assert not tree.is_loaded("src")
+        browser._on_tree_loaded(*payload)
+        assert [entry["path"] for entry in tree.listdir("src")] == ["src/main.py"]
+        assert not browser.loading_dirs
+    finally:
+        browser.prefetcher.shutdown()
+        browser._tree_loader.shutdown(wait=False)
+        browser._cloner.shutdown(wait=False)
+
+def test_browser_rendering_is_traced(tmp_path):
+    import io
+    from rich.console import Console
+    from gh_explorer.ui.widgets.repo_browser import RepoBrowser
+    from gh_explorer.utils import trace
+
+    class Client:
+        def get_repositories(self, names):
+            return {}
+
+    console = Console(file=io.StringIO(), width=100, height=40)
+    browser = RepoBrowser({"CONSOLE": console, "CLIENT": Client()}, [{"fullName": "a/one"}])
+    browser.prefetcher._store("a/one", {"nameWithOwner": "a/one", "readme": {"text": "# Title\n\nBody"}})
+    browser.opened.add("a/one")
+    browser._select(0)
+    tracer = trace.enable(str(tmp_path / "trace.json"))
+    try:
+        console.print(browser._compose_layout())
+    finally:
+        trace.disable()
+        browser.prefetcher.shutdown()
+        browser._tree_loader.shutdown(wait=False)
+        browser._cloner.shutdown(wait=False)
+    names = {event["name"] for event in tracer.events if event["cat"] == "render"}
+    assert {"browser.compose", "markdown.render"} <= names
@@ -0,0 +1,91 @@
+"""Tests for repository file trees and their on-demand expansion."""
+
+import json
+
+import pytest
+
+from gh_explorer.api.backends import Response
+from gh_explorer.api.tree import DIR, FILE, SUBMODULE, SYMLINK, RepoTree
+
+COMPLETE = {
+    "sha": "root",
+    "truncated": False,
+    "tree": [
+        {"path": "README.md", "type": "blob", "size": 10},
+        {"path": "src", "type": "tree", "sha": "s1"},
+        {"path": "src/b.py", "type": "blob", "size": 2},
+        {"path": "src/A.py", "type": "blob", "size": 1},
+        {"path": "src/pkg", "type": "tree", "sha": "s2"},
+        {"path": "src/pkg/mod.py", "type": "blob", "size": 3},
+        {"path": "empty", "type": "tree", "sha": "s3"},
+        {"path": "link", "type": "blob", "mode": "120000"},
+        {"path": "vendor", "type": "commit"},
+    ],
+}
+
+TRUNCATED = {
+    "sha": "root",
+    "truncated": True,
+    "tree": [
+        {"path": "src", "type": "tree", "sha": "s1"},
+        {"path": "setup.py", "type": "blob", "size": 4},
+        # Deeper entries of a truncated listing may be incomplete
+        {"path": "src/partial.py", "type": "blob", "size": 1},
+    ],
+}
+
+def test_complete_tree_lists_every_directory():
+    tree = RepoTree.from_api(COMPLETE)
+    assert len(tree) == 9
+    assert [e["name"] for e in tree.listdir()] == ["empty", "src", "link", "README.md", "vendor"]
+    assert [e["path"] for e in tree.listdir("src")] == ["src/pkg", "src/A.py", "src/b.py"]
+    assert tree.listdir("src/pkg") == [{"name": "mod.py", "path": "src/pkg/mod.py", "type": FILE, "size": 3}]
+    assert tree.listdir("empty") == []
+    assert tree.is_loaded("src/pkg") and tree.dir_sha("src/pkg") is None
+
+def test_entry_kinds():
+    tree = RepoTree.from_api(COMPLETE)
+    kinds = {e["name"]: e["type"] for e in tree.listdir()}
+    assert kinds == {"empty": DIR, "src": DIR, "link": SYMLINK, "README.md": FILE, "vendor": SUBMODULE}
+
+def test_truncated_tree_keeps_only_the_root():
+    tree = RepoTree.from_api(TRUNCATED)
+    assert tree.truncated
+    assert [e["name"] for e in tree.listdir()] == ["src", "setup.py"]
+    assert tree.is_dir("src") and not tree.is_loaded("src")
+    assert tree.dir_sha("src") == "s1"
+    with pytest.raises(KeyError):
+        tree.listdir("src")
+
+def test_set_listing_expands_a_directory_once():
+    tree = RepoTree.from_api(TRUNCATED)
+    tree.set_listing("src", {"tree": [
+        {"path": "z.py", "type": "blob", "size": 1},
+        {"path": "inner", "type": "tree", "sha": "s4"},
+    ]})
+    assert [e["path"] for e in tree.listdir("src")] == ["src/inner", "src/z.py"]
+    assert tree.dir_sha("src") is None
+    assert tree.dir_sha("src/inner") == "s4" and not tree.is_loaded("src/inner")
+
+    size = len(tree)
+    tree.set_listing("src", {"tree": [{"path": "again.py", "type": "blob"}]})
+    assert len(tree) == size
+    assert [e["name"] for e in tree.listdir("src")] == ["inner", "z.py"]
+
+def test_client_expands_truncated_directories_on_demand(make_client):
+    def handler(args, headers):
+        endpoint = args[1]
+        if endpoint.endswith("?recursive=1"):
+            return Response(200, json.dumps(TRUNCATED), {})
+        if endpoint.endswith("/git/trees/s1"):
+            return Response(200, json.dumps({"tree": [{"path": "main.py", "type": "blob", "size": 5}]}), {})
+        return Response(404, "", {})
+    client = make_client(handler)
+
+    tree = client.get_repository_tree("o/r")
+    client.load_tree_directory("o/r", tree, "src")
+    client.load_tree_directory("o/r", tree, "src")
+    assert tree.listdir("src") == [{"name": "main.py", "path": "src/main.py", "type": FILE, "size": 5}]
+    assert [args[1] for args, _ in client.backend.requests] == [
+        "repos/o/r/git/trees/HEAD?recursive=1", "repos/o/r/git/trees/s1",
+    ]